@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.backtest.engine import rolling_backtest
+from portfolio_bl.backtest.metrics import summarize_strategy
+from portfolio_bl.data.prices import load_prices_csv, monthly_rebalance_dates, to_return_matrix
+from portfolio_bl.data.synthetic import write_synthetic_dataset
+from portfolio_bl.models.black_litterman import black_litterman_posterior, diagonal_omega_from_confidence
+from portfolio_bl.models.mean_variance import estimate_mean_cov, long_only_markowitz_weights
+
+
+# (tickers, business days) per size.
+SIZES = {
+    "small": (50, 500),
+    "medium": (200, 1500),
+    "large": (1000, 2500),
+}
+
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {"min": min(timings), "median": statistics.median(timings), "repeat": repeat}
+
+
+
+def _mvo_weights(train: pd.DataFrame, _date: pd.Timestamp) -> pd.Series:
+    mu, cov = estimate_mean_cov(train)
+    return long_only_markowitz_weights(mu, cov)
+
+
+
+def run_size(size: str, repeat: int, workdir: Path) -> dict[str, dict[str, float]]:
+    n_tickers, n_days = SIZES[size]
+    _, prices_path = write_synthetic_dataset(workdir / size, n_tickers=n_tickers, n_days=n_days, seed=0)
+
+    prices = load_prices_csv(prices_path)
+    returns = to_return_matrix(prices)
+    rebalance_dates = monthly_rebalance_dates(returns.index)
+    mu, cov = estimate_mean_cov(returns.iloc[-252:])
+    sigma = cov.to_numpy()
+    pi = 2.5 * sigma @ np.full(n_tickers, 1.0 / n_tickers)
+    # The pipeline's BL call: absolute views on every asset (P = None), diagonal Omega, Cholesky solver.
+    omega = diagonal_omega_from_confidence(sigma, None, tau=0.05, confidence=0.65, as_vector=True)
+    strategy_returns = returns.mean(axis=1)
+    weight_history = pd.DataFrame(np.full((len(rebalance_dates), n_tickers), 1.0 / n_tickers))
+
+    cases = {
+        "load_prices_csv": lambda: load_prices_csv(prices_path),
+        "to_return_matrix": lambda: to_return_matrix(prices),
+        "rolling_backtest": lambda: rolling_backtest(returns, rebalance_dates, 252, _mvo_weights),
+        "black_litterman_posterior": lambda: black_litterman_posterior(
+            pi, sigma, None, mu.to_numpy(), 0.05, omega, solver="cholesky"
+        ),
+        "long_only_markowitz_weights": lambda: long_only_markowitz_weights(mu, cov),
+        "summarize_strategy": lambda: summarize_strategy(strategy_returns, weight_history, 252),
+    }
+    return {f"{name}[{size}]": _time(fn, repeat) for name, fn in cases.items()}
+
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for key, stats in current["results"].items():
+        if key not in baseline["results"]:
+            continue
+        before = baseline["results"][key]["median"]
+        ratio = stats["median"] / before if before > 0 else float("inf")
+        flag = "REGRESSION" if ratio > 1.0 + tolerance else ""
+        print(f"{key:45s} {before * 1e3:10.2f} ms -> {stats['median'] * 1e3:10.2f} ms  x{ratio:5.2f} {flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the pipeline hot paths on synthetic data.")
+    parser.add_argument("--sizes", default="small,medium", help=f"Comma-separated sizes from {', '.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per benchmark")
+    parser.add_argument("--output", default=None, help="Write results as JSON (e.g. a new baseline)")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed median slowdown before a benchmark is flagged (0.25 = 25%%)",
+    )
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        raise ValueError(f"Unknown size(s) {', '.join(unknown)}. Available: {', '.join(SIZES)}")
+
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            results.update(run_size(size, args.repeat, Path(tmp)))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved benchmark results to: {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}.")
+            sys.exit(1)
+    else:
+        for key, stats in results.items():
+            print(f"{key:45s} {stats['median'] * 1e3:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
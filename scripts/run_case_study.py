@@ -2,12 +2,21 @@
 from __future__ import annotations
 
 import argparse
+import json
+import pickle
 from pathlib import Path
 
 import pandas as pd
 
+from portfolio_bl.backtest.bootstrap import bootstrap_summary
+from portfolio_bl.backtest.engine import BacktestState
+from portfolio_bl.backtest.metrics import infer_periods_per_year
 from portfolio_bl.config import load_config
-from portfolio_bl.pipeline import run_case_study
+from portfolio_bl.parallel import resolve_person_keys, run_case_studies
+from portfolio_bl.pipeline import CaseStudyResult
+from portfolio_bl.store import RESULT_FILE, save_case_study
+
+STATE_FILE = "backtest_state.pkl"
 
 
 
@@ -27,30 +36,36 @@ def _format_summary(summary: pd.DataFrame) -> pd.DataFrame:
 
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Run a Black-Litterman public portfolio case study.")
-    parser.add_argument("--person", required=True, help="Case-study key from configs/case_studies.yaml")
-    parser.add_argument(
-        "--config",
-        default="configs/case_studies.yaml",
-        help="Path to configuration YAML",
-    )
-    parser.add_argument(
-        "--output-dir",
-        default="reports/output",
-        help="Directory for generated outputs",
-    )
-    args = parser.parse_args()
+def _strategy_returns(result: CaseStudyResult) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            name: strategy.returns
+            for name, strategy in result.strategy_results.items()
+        }
+    ).sort_index()
 
-    root = Path(__file__).resolve().parents[1]
-    config_path = (root / args.config).resolve()
 
-    app_config = load_config(config_path)
-    result = run_case_study(app_config, person_key=args.person)
 
-    output_dir = (root / args.output_dir / args.person).resolve()
-    output_dir.mkdir(parents=True, exist_ok=True)
+def _load_state(path: Path) -> BacktestState | None:
+    # A missing or unreadable state just means a full recompute.
+    try:
+        with path.open("rb") as f:
+            state = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    return state if isinstance(state, BacktestState) else None
+
+
 
+def _save_state(state: BacktestState, path: Path) -> None:
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(path)
+
+
+
+def _write_csv_outputs(result: CaseStudyResult, output_dir: Path) -> None:
     result.summary.to_csv(output_dir / "summary.csv")
 
     nav_df = pd.DataFrame(
@@ -61,12 +76,7 @@ def main() -> None:
     ).sort_index()
     nav_df.to_csv(output_dir / "equity_curve.csv")
 
-    ret_df = pd.DataFrame(
-        {
-            name: strategy.returns
-            for name, strategy in result.strategy_results.items()
-        }
-    ).sort_index()
+    ret_df = _strategy_returns(result)
     ret_df.to_csv(output_dir / "strategy_returns.csv")
 
     for name, strategy in result.strategy_results.items():
@@ -82,9 +92,95 @@ def main() -> None:
     )
     metadata.to_csv(output_dir / "metadata.csv", header=["value"])
 
-    print(f"Saved outputs to: {output_dir}")
-    print()
-    print(_format_summary(result.summary).to_string())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a Black-Litterman public portfolio case study.")
+    parser.add_argument(
+        "--person",
+        required=True,
+        nargs="+",
+        help="Case-study key(s) from configs/case_studies.yaml, comma-separated or 'all'",
+    )
+    parser.add_argument(
+        "--config",
+        default="configs/case_studies.yaml",
+        help="Path to configuration YAML",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="reports/output",
+        help="Directory for generated outputs",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes when running several case studies",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record stage timings, solve counts and peak memory to profile.json",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=0,
+        help="Stationary-bootstrap resamples for metric confidence intervals (0 disables)",
+    )
+    parser.add_argument(
+        "--csv",
+        action="store_true",
+        help=f"Also write the summary, curves, weights and metadata as CSV files next to {RESULT_FILE}",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help=f"Ignore any saved {STATE_FILE} and recompute the full history",
+    )
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parents[1]
+    config_path = (root / args.config).resolve()
+
+    app_config = load_config(config_path)
+    person_keys = resolve_person_keys(app_config, args.person)
+    output_dirs = {key: (root / args.output_dir / key).resolve() for key in person_keys}
+
+    # A state saved by the previous run lets appended price rows cost only the new periods.
+    states = {}
+    if not args.fresh:
+        states = {key: _load_state(output_dirs[key] / STATE_FILE) for key in person_keys}
+        states = {key: state for key, state in states.items() if state is not None}
+    results = run_case_studies(app_config, person_keys, workers=args.workers, profile=args.profile, states=states)
+
+    for person_key, result in results.items():
+        output_dir = output_dirs[person_key]
+        save_case_study(result, output_dir / RESULT_FILE)
+        if args.csv:
+            _write_csv_outputs(result, output_dir)
+        if result.backtest_state is not None:
+            _save_state(result.backtest_state, output_dir / STATE_FILE)
+
+        if result.profile is not None:
+            (output_dir / "profile.json").write_text(json.dumps(result.profile, indent=2), encoding="utf-8")
+
+        if args.bootstrap > 0:
+            returns = _strategy_returns(result)
+            intervals = bootstrap_summary(
+                returns,
+                infer_periods_per_year(returns.index),
+                n_resamples=args.bootstrap,
+                baseline="disclosed",
+                workers=args.workers,
+            )
+            intervals.to_csv(output_dir / "bootstrap.csv")
+
+        print(f"Saved outputs to: {output_dir}")
+        print()
+        print(_format_summary(result.summary).to_string())
+        print()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from portfolio_bl.config import load_config
+from portfolio_bl.tuning import config_grid, parse_search_space, sample_configs, walk_forward_search
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Walk-forward search over backtest parameters.")
+    parser.add_argument("--person", required=True, help="Case-study key from configs/case_studies.yaml")
+    parser.add_argument(
+        "--config",
+        default="configs/case_studies.yaml",
+        help="Path to configuration YAML",
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        help="Search values as FIELD=v1,v2,... (repeatable), e.g. tau=0.025,0.05",
+    )
+    parser.add_argument("--samples", type=int, default=0, help="Random sample size from the grid (0 = full grid)")
+    parser.add_argument("--folds", type=int, default=4, help="Number of walk-forward folds")
+    parser.add_argument("--objective", default="sharpe", help="Summary metric to maximize")
+    parser.add_argument("--prune-margin", type=float, default=None, help="Drop configs trailing the leader by more")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument(
+        "--output-dir",
+        default="reports/output",
+        help="Directory for generated outputs",
+    )
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parents[1]
+    app_config = load_config((root / args.config).resolve())
+
+    space = parse_search_space(args.param)
+    if args.samples > 0:
+        configs = sample_configs(app_config.backtest, space, args.samples)
+    else:
+        configs = config_grid(app_config.backtest, space)
+
+    tuned = walk_forward_search(
+        app_config,
+        args.person,
+        configs,
+        n_folds=args.folds,
+        objective=args.objective,
+        prune_margin=args.prune_margin,
+        workers=args.workers,
+    )
+
+    output_dir = (root / args.output_dir / args.person).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tuned.results.to_csv(output_dir / "tuning_results.csv", index=False)
+    tuned.best.to_csv(output_dir / "tuning_best.csv")
+
+    print(f"Saved outputs to: {output_dir}")
+    print()
+    print(tuned.best.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class AttributionResult:
+    betas: pd.Series
+    fitted: pd.Series
+    residual: pd.Series
+    attribution_table: pd.DataFrame
+    summary: pd.Series
+
+
+
+def align_benchmarks(
+    returns: pd.Series | pd.DataFrame,
+    benchmarks: pd.DataFrame,
+    min_observations: int = 6,
+) -> tuple[pd.Series | pd.DataFrame, pd.DataFrame]:
+    # Strategy rows must be complete; a missing benchmark return counts as zero, as in notebook 04.
+    returns = returns.dropna(how="any").sort_index()
+    common_idx = returns.index.intersection(benchmarks.index)
+    if len(common_idx) < min_observations:
+        raise ValueError(
+            f"Need at least {min_observations} overlapping observations for attribution, got {len(common_idx)}."
+        )
+    return returns.loc[common_idx], benchmarks.loc[common_idx].fillna(0.0)
+
+
+
+def _design(benchmarks: pd.DataFrame) -> np.ndarray:
+    return np.column_stack([np.ones(len(benchmarks)), benchmarks.to_numpy(dtype=np.float64)])
+
+
+
+def ols_attribution(returns: pd.Series, benchmarks: pd.DataFrame, periods_per_year: int) -> AttributionResult:
+    y, x = align_benchmarks(returns, benchmarks)
+    x_design = _design(x)
+    coef = np.linalg.lstsq(x_design, y.to_numpy(dtype=np.float64), rcond=None)[0]
+
+    alpha = float(coef[0])
+    betas = pd.Series(coef[1:], index=x.columns, name="beta")
+
+    fitted = pd.Series(x_design @ coef, index=y.index, name="fitted")
+    resid = y - fitted
+
+    y_var = float(y.var(ddof=0))
+    resid_var = float(resid.var(ddof=0))
+    r2 = float("nan") if y_var <= 0 else 1.0 - resid_var / y_var
+
+    # Arithmetic annualized contribution decomposition.
+    factor_contrib = (betas * x.mean()) * periods_per_year
+    alpha_contrib = alpha * periods_per_year
+    strategy_mean_ann = float(y.mean() * periods_per_year)
+    unexplained = strategy_mean_ann - alpha_contrib - float(factor_contrib.sum())
+
+    attribution_table = pd.DataFrame(
+        {
+            "beta": betas,
+            "mean_factor_return": x.mean(),
+            "annual_contribution": factor_contrib,
+        }
+    ).sort_values("annual_contribution", ascending=False)
+
+    summary = pd.Series(
+        {
+            "alpha_per_period": alpha,
+            "alpha_annual_arithmetic": alpha_contrib,
+            "strategy_mean_annual_arithmetic": strategy_mean_ann,
+            "explained_annual_arithmetic": float(factor_contrib.sum()),
+            "residual_annual_arithmetic": unexplained,
+            "r2": r2,
+        }
+    )
+
+    return AttributionResult(
+        betas=betas,
+        fitted=fitted,
+        residual=resid,
+        attribution_table=attribution_table,
+        summary=summary,
+    )
+
+
+
+def attribution_summary(returns: pd.DataFrame, benchmarks: pd.DataFrame, periods_per_year: int) -> pd.DataFrame:
+    # Every strategy shares the benchmark design, so one least-squares call fits them all.
+    y, x = align_benchmarks(returns, benchmarks)
+    x_design = _design(x)
+    y_values = y.to_numpy(dtype=np.float64)
+    coef = np.linalg.lstsq(x_design, y_values, rcond=None)[0]
+
+    resid = y_values - x_design @ coef
+    y_var = y_values.var(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(y_var > 0, 1.0 - resid.var(axis=0) / y_var, np.nan)
+
+    mean_factor = x.to_numpy(dtype=np.float64).mean(axis=0)
+    explained = (coef[1:] * mean_factor[:, None]).sum(axis=0) * periods_per_year
+    strategy_mean = y_values.mean(axis=0) * periods_per_year
+
+    summary = pd.DataFrame(
+        {
+            "alpha_per_period": coef[0],
+            "alpha_annual_arithmetic": coef[0] * periods_per_year,
+            "strategy_mean_annual_arithmetic": strategy_mean,
+            "explained_annual_arithmetic": explained,
+            "residual_annual_arithmetic": strategy_mean - coef[0] * periods_per_year - explained,
+            "r2": r2,
+        },
+        index=y.columns,
+    )
+    for k, name in enumerate(x.columns):
+        summary[f"beta_{name}"] = coef[k + 1]
+    summary.index.name = "strategy"
+    return summary
+
+
+
+def rolling_alpha_beta(
+    returns: pd.Series | pd.DataFrame,
+    benchmarks: pd.DataFrame,
+    window: int = 12,
+) -> pd.DataFrame:
+    y, x = align_benchmarks(returns, benchmarks, min_observations=window)
+    n_coef = x.shape[1] + 1
+    if window < n_coef + 1:
+        raise ValueError(f"window must exceed the {n_coef} regression coefficients, got {window}.")
+
+    # Demeaning by the full-sample mean keeps the running sums small; only alpha needs shifting back.
+    x_values = x.to_numpy(dtype=np.float64)
+    x_mean = x_values.mean(axis=0)
+    x_design = np.column_stack([np.ones(len(x)), x_values - x_mean])
+    y_values = y.to_numpy(dtype=np.float64).reshape(len(y), -1)
+
+    # Windowed X'X and X'y are differences of cumulative sums, so the cost is linear in the series length.
+    xtx = np.cumsum(x_design[:, :, None] * x_design[:, None, :], axis=0)
+    xty = np.cumsum(x_design[:, :, None] * y_values[:, None, :], axis=0)
+    xtx = np.concatenate([np.zeros((1, n_coef, n_coef)), xtx])
+    xty = np.concatenate([np.zeros((1, n_coef, y_values.shape[1])), xty])
+    window_xtx = xtx[window:] - xtx[:-window]
+    window_xty = xty[window:] - xty[:-window]
+
+    # The pseudo-inverse gives the minimum-norm fit, like lstsq, when a window is degenerate.
+    coef = np.linalg.pinv(window_xtx, hermitian=True) @ window_xty
+    coef[:, 0] -= np.einsum("k,wks->ws", x_mean, coef[:, 1:])
+
+    terms = ["alpha", *x.columns]
+    index = pd.Index(y.index[window - 1 :], name="date")
+    if isinstance(y, pd.Series):
+        return pd.DataFrame(coef[:, :, 0], index=index, columns=terms)
+
+    columns = pd.MultiIndex.from_product([y.columns, terms], names=["strategy", "coefficient"])
+    return pd.DataFrame(coef.transpose(0, 2, 1).reshape(len(index), -1), index=index, columns=columns)
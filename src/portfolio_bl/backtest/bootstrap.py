@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.backtest.metrics import return_metrics
+
+
+RETURN_METRICS = ["annual_return", "annual_volatility", "sharpe", "sortino", "max_drawdown"]
+
+
+
+def stationary_bootstrap_indices(
+    n_obs: int,
+    n_resamples: int,
+    mean_block_length: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    # Politis-Romano stationary bootstrap: blocks start at random rows and have
+    # geometric lengths, wrapping around the end of the sample.
+    if n_obs < 1:
+        raise ValueError("Cannot resample an empty return series.")
+    if mean_block_length < 1:
+        raise ValueError(f"mean_block_length must be at least 1, got {mean_block_length}.")
+
+    starts = rng.integers(0, n_obs, size=(n_resamples, n_obs))
+    new_block = rng.random((n_resamples, n_obs)) < 1.0 / mean_block_length
+    new_block[:, 0] = True
+
+    positions = np.arange(n_obs)
+    block_start = np.maximum.accumulate(np.where(new_block, positions, 0), axis=1)
+    first_row = np.take_along_axis(starts, block_start, axis=1)
+    return (first_row + positions - block_start) % n_obs
+
+
+
+def _evaluate_batch(
+    values: np.ndarray,
+    periods_per_year: int,
+    n_resamples: int,
+    mean_block_length: float,
+    seed: np.random.SeedSequence,
+) -> np.ndarray:
+    indices = stationary_bootstrap_indices(len(values), n_resamples, mean_block_length, np.random.default_rng(seed))
+    # Every strategy is resampled on the same rows so that differences stay paired.
+    resampled = values[indices.T]
+    metrics = return_metrics(resampled, periods_per_year)
+    return np.stack([metrics[name] for name in RETURN_METRICS])
+
+
+
+def bootstrap_metric_samples(
+    returns: pd.DataFrame,
+    periods_per_year: int,
+    n_resamples: int = 10_000,
+    mean_block_length: float | None = None,
+    batch_size: int = 500,
+    workers: int = 1,
+    seed: int = 0,
+) -> dict[str, pd.DataFrame]:
+    values = returns.dropna(how="any").to_numpy(dtype=np.float64)
+    if mean_block_length is None:
+        mean_block_length = max(1.0, len(values) ** (1.0 / 3.0))
+
+    sizes = [min(batch_size, n_resamples - start) for start in range(0, n_resamples, batch_size)]
+    # One child seed per batch keeps the draws identical whatever the number of workers.
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers <= 1 or len(sizes) <= 1:
+        batches = [
+            _evaluate_batch(values, periods_per_year, size, mean_block_length, child)
+            for size, child in zip(sizes, seeds)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+            futures = [
+                pool.submit(_evaluate_batch, values, periods_per_year, size, mean_block_length, child)
+                for size, child in zip(sizes, seeds)
+            ]
+            batches = [future.result() for future in futures]
+
+    stacked = np.concatenate(batches, axis=1)
+    return {
+        name: pd.DataFrame(stacked[i], columns=returns.columns)
+        for i, name in enumerate(RETURN_METRICS)
+    }
+
+
+
+def bootstrap_summary(
+    returns: pd.DataFrame,
+    periods_per_year: int,
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    baseline: str | None = None,
+    mean_block_length: float | None = None,
+    batch_size: int = 500,
+    workers: int = 1,
+    seed: int = 0,
+) -> pd.DataFrame:
+    if not 0.0 < confidence < 1.0:
+        raise ValueError(f"confidence must be in (0, 1), got {confidence}.")
+    if baseline is not None and baseline not in returns.columns:
+        raise ValueError(f"Unknown baseline strategy '{baseline}'.")
+
+    aligned = returns.dropna(how="any")
+    point = return_metrics(aligned.to_numpy(dtype=np.float64), periods_per_year)
+    samples = bootstrap_metric_samples(
+        aligned,
+        periods_per_year,
+        n_resamples=n_resamples,
+        mean_block_length=mean_block_length,
+        batch_size=batch_size,
+        workers=workers,
+        seed=seed,
+    )
+    tails = [50.0 * (1.0 - confidence), 50.0 * (1.0 + confidence)]
+
+    rows = []
+    for metric in RETURN_METRICS:
+        draws = samples[metric].to_numpy()
+        lower, upper = np.nanpercentile(draws, tails, axis=0)
+        for j, strategy in enumerate(returns.columns):
+            row = {
+                "strategy": strategy,
+                "metric": metric,
+                "estimate": point[metric][j],
+                "lower": lower[j],
+                "upper": upper[j],
+            }
+            if baseline is not None:
+                base = returns.columns.get_loc(baseline)
+                with np.errstate(invalid="ignore"):
+                    diff = draws[:, j] - draws[:, base]
+                    row["diff_estimate"] = point[metric][j] - point[metric][base]
+                diff_lower, diff_upper = (
+                    np.nanpercentile(diff, tails) if np.isfinite(diff).any() else (np.nan, np.nan)
+                )
+                row["diff_lower"] = diff_lower
+                row["diff_upper"] = diff_upper
+                # One-sided: share of resamples where the metric is not above the baseline's.
+                row["p_value"] = float(np.mean(diff[~np.isnan(diff)] <= 0.0)) if j != base else np.nan
+            rows.append(row)
+
+    table = pd.DataFrame(rows).set_index(["strategy", "metric"])
+    return table.reindex(pd.MultiIndex.from_product([returns.columns, RETURN_METRICS], names=["strategy", "metric"]))
@@ -1,31 +1,73 @@
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
-from typing import Callable
+from typing import Any, Callable, Mapping
 
 import numpy as np
 import pandas as pd
 
+from portfolio_bl.data.prices import matrix_dtype
+from portfolio_bl.profiling import NULL_PROFILER, NullProfiler, Profiler
+
+WeightFn = Callable[[pd.DataFrame, pd.Timestamp], pd.Series]
+StrategyFn = Callable[[pd.DataFrame, pd.Timestamp, Any], pd.Series]
+
+
+@dataclass(frozen=True)
+class TransactionCosts:
+    # proportional: fraction of traded notional; fixed: fraction of NAV per rebalance that trades.
+    proportional: float = 0.0
+    fixed: float = 0.0
+
+
+@dataclass
+class BacktestState:
+    """Everything needed to extend a vectorized backtest when rows are appended to the returns.
+
+    A later run reuses the rebalance decisions this state shares with its own schedule,
+    provided the first ``n_rows`` return rows are unchanged (checked by fingerprint)
+    and the strategies, columns and settings match. ``key`` lets callers tie the state
+    to anything else that shapes the weights, such as a config fingerprint.
+    """
+
+    key: str
+    names: list[str]
+    columns: pd.Index
+    lookback_periods: int
+    initial_nav: float
+    costs: TransactionCosts | None
+    n_rows: int
+    history_fingerprint: str
+    rebalances: list[pd.Timestamp]
+    weights: np.ndarray
+    turnover: np.ndarray
+    charges: np.ndarray
+    period_returns: np.ndarray
+
 
 @dataclass
 class BacktestResult:
     returns: pd.Series
     nav: pd.Series
     weight_history: pd.DataFrame
+    turnover: pd.Series | None = None
+    costs: pd.Series | None = None
+    state: BacktestState | None = None
 
 
 
-def rolling_backtest(
+def _prepare_schedule(
     returns: pd.DataFrame,
     rebalance_dates: pd.DatetimeIndex,
     lookback_periods: int,
-    weight_fn: Callable[[pd.DataFrame, pd.Timestamp], pd.Series],
-    initial_nav: float = 1.0,
-) -> BacktestResult:
+) -> tuple[pd.DataFrame, list[pd.Timestamp]]:
     if returns.empty:
         raise ValueError("Returns matrix is empty.")
 
-    returns = returns.sort_index().copy()
+    # The engine never writes to the matrix, so a sorted input is used as is.
+    if not returns.index.is_monotonic_increasing:
+        returns = returns.sort_index()
     all_dates = returns.index
 
     rebalance_dates = pd.DatetimeIndex(sorted(set(pd.to_datetime(rebalance_dates))))
@@ -37,6 +79,239 @@ def rolling_backtest(
     if not eligible_rebalances:
         raise ValueError("No rebalance date has enough lookback observations.")
 
+    return returns, eligible_rebalances
+
+
+
+def _normalize_weights(weights: pd.Series, columns: pd.Index) -> pd.Series:
+    weights = weights.reindex(columns).fillna(0.0)
+    if weights.sum() <= 0:
+        return pd.Series(1.0 / len(columns), index=columns)
+    return weights / weights.sum()
+
+
+
+def _weight_history_frame(rows: np.ndarray, dates: list[pd.Timestamp], columns: pd.Index) -> pd.DataFrame:
+    # One row per rebalance in the column order of the return matrix, backed by a single array.
+    return pd.DataFrame(rows, index=pd.DatetimeIndex(dates, name="rebalance_date"), columns=columns, copy=False)
+
+
+
+def _history_fingerprint(values: np.ndarray, index: pd.DatetimeIndex, chunk_rows: int = 4096) -> str:
+    # Hashed in row chunks so a large matrix is never copied whole.
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(index.asi8).tobytes())
+    for start in range(0, len(values), chunk_rows):
+        digest.update(np.ascontiguousarray(values[start : start + chunk_rows]).tobytes())
+    return digest.hexdigest()
+
+
+
+def _reusable_rebalances(
+    state: BacktestState | None,
+    state_key: str,
+    names: list[str],
+    returns: pd.DataFrame,
+    values: np.ndarray,
+    eligible_rebalances: list[pd.Timestamp],
+    lookback_periods: int,
+    initial_nav: float,
+    costs: TransactionCosts | None,
+) -> int:
+    # Number of leading rebalance decisions that can be taken from the state as they are.
+    if state is None or state.key != state_key or state.names != names:
+        return 0
+    if (
+        not state.columns.equals(returns.columns)
+        or state.lookback_periods != lookback_periods
+        or state.initial_nav != initial_nav
+        or state.costs != costs
+        or state.n_rows > len(returns)
+    ):
+        return 0
+    if _history_fingerprint(values[: state.n_rows], returns.index[: state.n_rows]) != state.history_fingerprint:
+        return 0
+
+    shared = 0
+    for old, new in zip(state.rebalances, eligible_rebalances):
+        if old != new:
+            break
+        shared += 1
+    return shared
+
+
+
+def _holding_period_bounds(positions: list[int], n_dates: int) -> list[tuple[int, int]]:
+    # Weights set at rebalance i apply from the next period through the next rebalance (inclusive).
+    bounds = []
+    for i, reb_idx in enumerate(positions):
+        end_idx = positions[i + 1] + 1 if i + 1 < len(positions) else n_dates
+        bounds.append((reb_idx + 1, end_idx))
+    return bounds
+
+
+
+def rolling_backtest(
+    returns: pd.DataFrame,
+    rebalance_dates: pd.DatetimeIndex,
+    lookback_periods: int,
+    weight_fn: WeightFn,
+    initial_nav: float = 1.0,
+    vectorized: bool = True,
+    costs: TransactionCosts | None = None,
+    state: BacktestState | None = None,
+) -> BacktestResult:
+    if not vectorized:
+        if costs is not None or state is not None:
+            raise ValueError("Transaction costs and resuming require the vectorized engine.")
+        returns, eligible_rebalances = _prepare_schedule(returns, rebalance_dates, lookback_periods)
+        return _rolling_backtest_loop(returns, eligible_rebalances, lookback_periods, weight_fn, initial_nav)
+
+    results = multi_strategy_backtest(
+        returns,
+        rebalance_dates,
+        lookback_periods,
+        strategies={"strategy": lambda train, date, _stats: weight_fn(train, date)},
+        initial_nav=initial_nav,
+        costs=costs,
+        state=state,
+    )
+    return results["strategy"]
+
+
+
+def multi_strategy_backtest(
+    returns: pd.DataFrame,
+    rebalance_dates: pd.DatetimeIndex,
+    lookback_periods: int,
+    strategies: Mapping[str, StrategyFn],
+    window_stats_fn: Callable[[pd.DataFrame], Any] | None = None,
+    initial_nav: float = 1.0,
+    costs: TransactionCosts | None = None,
+    profiler: Profiler | NullProfiler = NULL_PROFILER,
+    state: BacktestState | None = None,
+    state_key: str = "",
+) -> dict[str, BacktestResult]:
+    if not strategies:
+        raise ValueError("At least one strategy is required.")
+
+    returns, eligible_rebalances = _prepare_schedule(returns, rebalance_dates, lookback_periods)
+    all_dates = returns.index
+    positions = [all_dates.get_loc(d) for d in eligible_rebalances]
+    names = list(strategies)
+    span_names = [f"strategy/{name}" for name in names]
+
+    # A view of the matrix in its own dtype (float32 in compact mode); missing returns are zeroed
+    # per holding block, so the full matrix is never copied. Portfolio returns stay float64.
+    dtype = matrix_dtype(returns)
+    values = returns.to_numpy(dtype=dtype)
+
+    first_idx = positions[0] + 1
+    period_returns = np.empty((len(all_dates) - first_idx, len(names)), dtype=np.float64)
+    weight_rows = np.zeros((len(names), len(positions), len(returns.columns)), dtype=dtype)
+    # With costs, holdings drift between rebalances and trades are measured against the drifted weights.
+    drifted: np.ndarray | None = None
+    turnover = np.zeros((len(positions), len(names)), dtype=np.float64)
+    charges = np.zeros((len(positions), len(names)), dtype=np.float64)
+
+    # Decisions shared with a saved state are reused. The holding block of the last reused
+    # rebalance is replayed, since new rows or a moved next rebalance may extend it.
+    reused = _reusable_rebalances(
+        state, state_key, names, returns, values, eligible_rebalances, lookback_periods, initial_nav, costs
+    )
+    if reused:
+        weight_rows[:, :reused] = state.weights[:, :reused]
+        turnover[:reused] = state.turnover[:reused]
+        charges[:reused] = state.charges[:reused]
+        kept = positions[reused - 1] + 1 - first_idx
+        period_returns[:kept] = state.period_returns[:kept]
+
+    bounds = _holding_period_bounds(positions, len(all_dates))
+    for i in range(max(reused - 1, 0), len(positions)):
+        reb_date, reb_idx = eligible_rebalances[i], positions[i]
+        start_idx, end_idx = bounds[i]
+
+        if i < reused:
+            weight_matrix = weight_rows[:, i].T.astype(np.float64)
+        else:
+            # Each training window is sliced and summarized once and shared by every strategy.
+            profiler.count("rebalances")
+            with profiler.span("backtest/window_slice"):
+                train = returns.iloc[reb_idx - lookback_periods : reb_idx]
+            with profiler.span("backtest/window_stats"):
+                stats = window_stats_fn(train) if window_stats_fn is not None else None
+
+            weight_matrix = np.empty((len(returns.columns), len(names)), dtype=np.float64)
+            for j, name in enumerate(names):
+                with profiler.span(span_names[j]):
+                    weights = _normalize_weights(strategies[name](train, reb_date, stats), returns.columns)
+                weight_matrix[:, j] = weights.to_numpy(dtype=np.float64)
+            weight_rows[:, i] = weight_matrix.T
+
+        block = np.nan_to_num(values[start_idx:end_idx], nan=0.0)
+        if costs is None:
+            period_returns[start_idx - first_idx : end_idx - first_idx] = block @ weight_matrix
+            continue
+
+        if drifted is not None and i >= reused:
+            traded = np.abs(weight_matrix - drifted).sum(axis=0)
+            turnover[i] = traded / 2.0
+            charges[i] = costs.proportional * traded + costs.fixed * (traded > 1e-12)
+
+        # Growth of each position since the rebalance, then of each portfolio.
+        growth = np.cumprod(1.0 + block, axis=0)
+        value = growth @ weight_matrix
+        block_returns = value / np.vstack([np.ones((1, len(names))), value[:-1]]) - 1.0
+        if len(block):
+            block_returns[0] = (1.0 - charges[i]) * (1.0 + block_returns[0]) - 1.0
+            drifted = weight_matrix * growth[-1][:, None] / value[-1]
+        else:
+            drifted = weight_matrix
+        period_returns[start_idx - first_idx : end_idx - first_idx] = block_returns
+
+    period_index = pd.DatetimeIndex(all_dates[first_idx:], freq=None, name=None)
+    navs = initial_nav * np.cumprod(1.0 + period_returns, axis=0)
+    rebalance_index = pd.DatetimeIndex(eligible_rebalances, name="rebalance_date")
+    new_state = BacktestState(
+        key=state_key,
+        names=names,
+        columns=returns.columns,
+        lookback_periods=lookback_periods,
+        initial_nav=initial_nav,
+        costs=costs,
+        n_rows=len(all_dates),
+        history_fingerprint=_history_fingerprint(values, all_dates),
+        rebalances=list(eligible_rebalances),
+        weights=weight_rows,
+        turnover=turnover,
+        charges=charges,
+        period_returns=period_returns,
+    )
+
+    return {
+        name: BacktestResult(
+            returns=pd.Series(period_returns[:, j], index=period_index, name="portfolio_return"),
+            nav=pd.Series(navs[:, j], index=period_index, name="nav"),
+            weight_history=_weight_history_frame(weight_rows[j], eligible_rebalances, returns.columns),
+            # The first rebalance sets up the portfolio; realized turnover starts with the second.
+            turnover=None if costs is None else pd.Series(turnover[1:, j], index=rebalance_index[1:], name="turnover"),
+            costs=None if costs is None else pd.Series(charges[:, j], index=rebalance_index, name="cost"),
+            state=new_state,
+        )
+        for j, name in enumerate(names)
+    }
+
+
+
+def _rolling_backtest_loop(
+    returns: pd.DataFrame,
+    eligible_rebalances: list[pd.Timestamp],
+    lookback_periods: int,
+    weight_fn: WeightFn,
+    initial_nav: float,
+) -> BacktestResult:
+    all_dates = returns.index
+
     weights_by_date: dict[pd.Timestamp, pd.Series] = {}
     portfolio_returns: list[tuple[pd.Timestamp, float]] = []
     nav_points: list[tuple[pd.Timestamp, float]] = []
@@ -46,12 +321,7 @@ def rolling_backtest(
         reb_idx = all_dates.get_loc(reb_date)
         train = returns.iloc[reb_idx - lookback_periods : reb_idx]
 
-        weights = weight_fn(train, reb_date).reindex(returns.columns).fillna(0.0)
-        if weights.sum() <= 0:
-            weights = pd.Series(1.0 / len(returns.columns), index=returns.columns)
-        else:
-            weights = weights / weights.sum()
-
+        weights = _normalize_weights(weight_fn(train, reb_date), returns.columns)
         weights_by_date[reb_date] = weights
 
         next_reb_date = eligible_rebalances[i + 1] if i + 1 < len(eligible_rebalances) else None
@@ -80,14 +350,13 @@ def rolling_backtest(
         index=pd.DatetimeIndex([d for d, _ in nav_points]),
         name="nav",
     )
-    weight_history = pd.DataFrame(weights_by_date).T
-    weight_history.index.name = "rebalance_date"
-
-    # Preserve consistent column ordering.
-    weight_history = weight_history.reindex(columns=returns.columns).fillna(0.0)
 
     return BacktestResult(
         returns=returns_series,
         nav=nav_series,
-        weight_history=weight_history,
+        weight_history=_weight_history_frame(
+            np.vstack([w.to_numpy() for w in weights_by_date.values()]),
+            list(weights_by_date),
+            returns.columns,
+        ),
     )
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.backtest.engine import StrategyFn
+
+
+
+def window_fingerprint(window: pd.DataFrame) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(window.index, index=False).to_numpy().tobytes())
+    digest.update(pd.util.hash_pandas_object(window.columns.to_series(), index=False).to_numpy().tobytes())
+    digest.update(np.ascontiguousarray(window.to_numpy(dtype=np.float64, na_value=np.nan)).tobytes())
+    return digest.hexdigest()
+
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        usage = value.memory_usage(index=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+
+class WeightMemo:
+    """Bounded in-memory LRU, optionally backed by a pickle directory shared across runs."""
+
+    def __init__(self, max_bytes: int = 256 * 2**20, disk_dir: str | Path | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._last_window: pd.DataFrame | None = None
+        self._last_fingerprint = ""
+
+    def fingerprint(self, window: pd.DataFrame) -> str:
+        # Strategies of one rebalance receive the same window object; hash it once.
+        # Holding a reference keeps the identity check safe.
+        if window is not self._last_window:
+            self._last_window = window
+            self._last_fingerprint = window_fingerprint(window)
+        return self._last_fingerprint
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=20).hexdigest()
+
+        if digest in self._entries:
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return self._entries[digest][0]
+
+        value = self._read_disk(digest)
+        if value is None:
+            self.misses += 1
+            value = compute()
+            self._write_disk(digest, value)
+        else:
+            self.hits += 1
+
+        self._remember(digest, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remember(self, digest: str, value: Any) -> None:
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        self._entries[digest] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def _read_disk(self, digest: str) -> Any:
+        if self.disk_dir is None:
+            return None
+        path = self.disk_dir / digest[:2] / f"{digest}.pkl"
+        if not path.exists():
+            return None
+        with path.open("rb") as f:
+            return pickle.load(f)
+
+    def _write_disk(self, digest: str, value: Any) -> None:
+        if self.disk_dir is None:
+            return
+        directory = self.disk_dir / digest[:2]
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, directory / f"{digest}.pkl")
+
+
+
+def memoize_strategy(fn: StrategyFn, strategy_id: str, params: Hashable, memo: WeightMemo) -> StrategyFn:
+    def _fn(train: pd.DataFrame, date: pd.Timestamp, stats: Any) -> pd.Series:
+        key = ("strategy", strategy_id, params, pd.Timestamp(date).isoformat(), memo.fingerprint(train))
+        return memo.get_or_compute(key, lambda: fn(train, date, stats))
+
+    return _fn
+
+
+
+def memoize_window_stats(
+    fn: Callable[[pd.DataFrame], Any],
+    stats_id: str,
+    memo: WeightMemo,
+) -> Callable[[pd.DataFrame], Any]:
+    def _fn(train: pd.DataFrame) -> Any:
+        return memo.get_or_compute(("window_stats", stats_id, memo.fingerprint(train)), lambda: fn(train))
+
+    return _fn
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Mapping
+
 import numpy as np
 import pandas as pd
 
@@ -96,10 +98,19 @@ def average_turnover(weight_history: pd.DataFrame) -> float:
 
 
 
+def _realized_turnover(weight_history: pd.DataFrame, turnover: pd.Series | None) -> float:
+    # Realized turnover from a drift-aware backtest replaces the target-weight estimate.
+    if turnover is None:
+        return average_turnover(weight_history)
+    return float(turnover.mean()) if len(turnover) else 0.0
+
+
+
 def summarize_strategy(
     returns: pd.Series,
     weight_history: pd.DataFrame,
     periods_per_year: int,
+    turnover: pd.Series | None = None,
 ) -> dict[str, float]:
     return {
         "annual_return": annualized_return(returns, periods_per_year),
@@ -108,5 +119,106 @@ def summarize_strategy(
         "sortino": sortino_ratio(returns, periods_per_year),
         "max_drawdown": max_drawdown(returns),
         "hhi": concentration_hhi(weight_history),
-        "avg_turnover": average_turnover(weight_history),
+        "avg_turnover": _realized_turnover(weight_history, turnover),
+    }
+
+
+
+def return_metrics(values: np.ndarray, periods_per_year: int) -> dict[str, np.ndarray]:
+    # Vectorized counterparts of the single-series metrics, reduced along axis 0.
+    # NaN marks a missing observation and is skipped, as pandas does.
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    n = valid.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.prod(1.0 + filled, axis=0)
+        ann_ret = np.where(n > 0, growth ** (periods_per_year / n) - 1.0, np.nan)
+
+        mean = filled.sum(axis=0) / n
+        var = np.where(valid, filled - mean, 0.0)
+        var = (var**2).sum(axis=0) / (n - 1)
+        ann_vol = np.where(n > 1, np.sqrt(var * periods_per_year), np.nan)
+        ann_vol = np.where(n > 0, ann_vol, np.nan)
+
+        sharpe = np.where(np.isfinite(ann_vol) & (ann_vol > 0), ann_ret / ann_vol, np.nan)
+
+        downside = valid & (filled < 0)
+        n_down = downside.sum(axis=0)
+        down_filled = np.where(downside, filled, 0.0)
+        down_mean = down_filled.sum(axis=0) / n_down
+        down_var = (np.where(downside, filled - down_mean, 0.0) ** 2).sum(axis=0) / (n_down - 1)
+        down_vol = np.where(n_down > 1, np.sqrt(down_var * periods_per_year), np.nan)
+        sortino = np.where(np.isfinite(down_vol) & (down_vol > 0), ann_ret / down_vol, np.nan)
+        sortino = np.where(n_down == 0, np.inf, sortino)
+        sortino = np.where(n > 0, sortino, np.nan)
+
+        nav = np.cumprod(1.0 + filled, axis=0)
+        drawdown = nav / np.maximum.accumulate(nav, axis=0) - 1.0
+        mdd = np.where(n > 0, drawdown.min(axis=0, initial=0.0), np.nan)
+
+    return {
+        "annual_return": ann_ret,
+        "annual_volatility": ann_vol,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown": mdd,
     }
+
+
+
+def weight_metrics(weights: np.ndarray) -> dict[str, np.ndarray]:
+    # Vectorized concentration_hhi and average_turnover over a (strategy, rebalance, asset)
+    # stack of weight histories. NaN weights are skipped, as pandas does.
+    weights = np.asarray(weights, dtype=np.float64)
+    n_rows = weights.shape[1]
+    if n_rows == 0:
+        return {"hhi": np.full(len(weights), np.nan), "avg_turnover": np.zeros(len(weights))}
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = weights / np.nansum(weights, axis=2, keepdims=True)
+    normalized = np.where(np.isnan(normalized), 0.0, normalized)
+    hhi = (normalized**2).sum(axis=2).mean(axis=1)
+
+    if n_rows == 1:
+        return {"hhi": hhi, "avg_turnover": np.zeros(len(weights))}
+    turnover = np.nansum(np.abs(np.diff(weights, axis=1)), axis=2).mean(axis=1) / 2.0
+    return {"hhi": hhi, "avg_turnover": turnover}
+
+
+
+def summarize_strategies(
+    returns: pd.DataFrame,
+    weight_histories: Mapping[str, pd.DataFrame],
+    periods_per_year: int,
+    turnovers: Mapping[str, pd.Series | None] | None = None,
+) -> pd.DataFrame:
+    metrics = return_metrics(returns.to_numpy(dtype=np.float64, na_value=np.nan), periods_per_year)
+    summary = pd.DataFrame(metrics, index=returns.columns)
+
+    # Histories on the same rebalance dates and assets (every strategy of one backtest) are
+    # stacked into one (strategy, rebalance, asset) array and reduced together.
+    groups: list[tuple[pd.DataFrame, list[str]]] = []
+    for name in returns.columns:
+        history = weight_histories[name]
+        for first, names in groups:
+            if history.index.equals(first.index) and history.columns.equals(first.columns):
+                names.append(name)
+                break
+        else:
+            groups.append((history, [name]))
+    summary["hhi"] = np.nan
+    summary["avg_turnover"] = np.nan
+    for _, names in groups:
+        stacked = np.stack([weight_histories[name].to_numpy(dtype=np.float64, na_value=np.nan) for name in names])
+        group_metrics = weight_metrics(stacked)
+        summary.loc[names, "hhi"] = group_metrics["hhi"]
+        summary.loc[names, "avg_turnover"] = group_metrics["avg_turnover"]
+
+    # Realized turnover from a drift-aware backtest replaces the target-weight estimate.
+    for name, turnover in (turnovers or {}).items():
+        if turnover is not None and name in summary.index:
+            summary.loc[name, "avg_turnover"] = float(turnover.mean()) if len(turnover) else 0.0
+    summary.index.name = "strategy"
+    return summary
@@ -12,6 +12,16 @@ class BacktestConfig:
     rebalance_frequency: str = "ME"
     risk_aversion: float = 2.5
     tau: float = 0.05
+    markowitz_solver: str = "clip"
+    max_weight: float = 1.0
+    proportional_cost: float = 0.0
+    fixed_cost: float = 0.0
+    track_drift: bool = False
+    covariance_estimator: str = "sample"
+    ewma_halflife: float = 6.0
+    n_factors: int = 3
+    equilibrium_weights: str = "latest"
+    compact: bool = False
 
 
 @dataclass(frozen=True)
@@ -27,6 +37,8 @@ class AppConfig:
     prices_path: Path
     backtest: BacktestConfig
     case_studies: dict[str, CaseStudyConfig]
+    cache_dir: Path | None = None
+    price_chunksize: int | None = None
 
 
 
@@ -44,6 +56,16 @@ def load_config(path: str | Path) -> AppConfig:
         rebalance_frequency=str(bt_cfg.get("rebalance_frequency", "ME")),
         risk_aversion=float(bt_cfg.get("risk_aversion", 2.5)),
         tau=float(bt_cfg.get("tau", 0.05)),
+        markowitz_solver=str(bt_cfg.get("markowitz_solver", "clip")),
+        max_weight=float(bt_cfg.get("max_weight", 1.0)),
+        proportional_cost=float(bt_cfg.get("proportional_cost", 0.0)),
+        fixed_cost=float(bt_cfg.get("fixed_cost", 0.0)),
+        track_drift=bool(bt_cfg.get("track_drift", False)),
+        covariance_estimator=str(bt_cfg.get("covariance_estimator", "sample")),
+        ewma_halflife=float(bt_cfg.get("ewma_halflife", 6.0)),
+        n_factors=int(bt_cfg.get("n_factors", 3)),
+        equilibrium_weights=str(bt_cfg.get("equilibrium_weights", "latest")),
+        compact=bool(bt_cfg.get("compact", False)),
     )
 
     case_studies: dict[str, CaseStudyConfig] = {}
@@ -61,10 +83,17 @@ def load_config(path: str | Path) -> AppConfig:
     root = config_path.parent.parent
     disclosures_path = (root / data_cfg.get("disclosures_path", "data/raw/disclosures/disclosures.csv")).resolve()
     prices_path = (root / data_cfg.get("prices_path", "data/raw/prices/prices.csv")).resolve()
+    cache_dir = data_cfg.get("cache_dir")
+    price_chunksize = data_cfg.get("price_chunksize")
+    if cache_dir and price_chunksize:
+        # The cache is built from a full in-memory parse, which chunked streaming exists to avoid.
+        raise ValueError("data.cache_dir and data.price_chunksize are alternative price loaders; set only one.")
 
     return AppConfig(
         disclosures_path=disclosures_path,
         prices_path=prices_path,
         backtest=backtest,
         case_studies=case_studies,
+        cache_dir=(root / cache_dir).resolve() if cache_dir else None,
+        price_chunksize=int(price_chunksize) if price_chunksize else None,
     )
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.data.prices import load_prices_csv, to_return_matrix
+
+
+CACHE_FORMAT_VERSION = 1
+
+
+
+def file_digest(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+
+def _write_frame(frame: pd.DataFrame, directory: Path) -> dict:
+    directory.mkdir(parents=True, exist_ok=True)
+    columns = []
+    for i, name in enumerate(frame.columns):
+        column = frame[name]
+        spec = {"name": name, "dtype": str(column.dtype), "file": f"col_{i}.npy"}
+        if column.dtype.kind in "biufcmM":
+            np.save(directory / spec["file"], np.ascontiguousarray(column.to_numpy()))
+        else:
+            # Text columns are stored dictionary-encoded: integer codes plus the category labels.
+            codes, categories = pd.factorize(column, use_na_sentinel=True)
+            np.save(directory / spec["file"], codes.astype(np.int32))
+            np.save(directory / f"cats_{i}.npy", np.asarray(categories, dtype=str))
+            spec["categories"] = f"cats_{i}.npy"
+        columns.append(spec)
+    return {"columns": columns, "n_rows": len(frame)}
+
+
+
+def _read_frame(directory: Path, layout: dict) -> pd.DataFrame:
+    data = {}
+    for spec in layout["columns"]:
+        values = np.load(directory / spec["file"], mmap_mode="r")
+        if "categories" in spec:
+            categories = np.load(directory / spec["categories"])
+            data[spec["name"]] = pd.Series(
+                pd.Categorical.from_codes(values, categories=categories), copy=False
+            ).astype(spec["dtype"])
+        else:
+            data[spec["name"]] = pd.Series(values, copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+
+def _write_matrix(frame: pd.DataFrame, directory: Path) -> dict:
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "values.npy", np.ascontiguousarray(frame.to_numpy(dtype=np.float64)))
+    np.save(directory / "index.npy", frame.index.to_numpy())
+    np.save(directory / "columns.npy", np.asarray(frame.columns, dtype=str))
+    return {"index_name": frame.index.name, "columns_name": frame.columns.name}
+
+
+
+def _read_matrix(directory: Path, layout: dict) -> pd.DataFrame:
+    values = np.load(directory / "values.npy", mmap_mode="r")
+    index = pd.DatetimeIndex(np.load(directory / "index.npy"), name=layout["index_name"])
+    columns = pd.Index(np.load(directory / "columns.npy").tolist(), name=layout["columns_name"])
+    return pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+
+
+class PriceCache:
+    """Binary cache of cleaned prices and the wide return matrix.
+
+    Entries live under ``cache_dir`` as memory-mapped ``.npy`` columns keyed by the
+    source path. An entry is reused while the source size and mtime are unchanged;
+    if only the mtime moved, the content hash decides.
+    """
+
+    def __init__(self, cache_dir: str | Path) -> None:
+        self.cache_dir = Path(cache_dir)
+
+    def load_prices(self, path: str | Path) -> pd.DataFrame:
+        source = Path(path).resolve()
+        entry, manifest = self._open(source)
+        if "prices" in manifest:
+            return _read_frame(entry / "prices", manifest["prices"])
+
+        prices = load_prices_csv(source)
+        self._store(entry, manifest, "prices", lambda d: _write_frame(prices, d))
+        return prices
+
+    def load_return_matrix(self, path: str | Path) -> pd.DataFrame:
+        source = Path(path).resolve()
+        entry, manifest = self._open(source)
+        if "returns" in manifest:
+            return _read_matrix(entry / "returns", manifest["returns"])
+
+        returns = to_return_matrix(self.load_prices(source))
+        entry, manifest = self._open(source)
+        self._store(entry, manifest, "returns", lambda d: _write_matrix(returns, d))
+        return returns
+
+    def _open(self, source: Path) -> tuple[Path, dict]:
+        key = hashlib.sha256(str(source).encode("utf-8")).hexdigest()[:16]
+        entry = self.cache_dir / f"{source.stem}-{key}"
+        stat = source.stat()
+
+        manifest_path = entry / "manifest.json"
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("version") == CACHE_FORMAT_VERSION and manifest["size"] == stat.st_size:
+                if manifest["mtime_ns"] == stat.st_mtime_ns:
+                    return entry, manifest
+                if manifest["sha256"] == file_digest(source):
+                    manifest["mtime_ns"] = stat.st_mtime_ns
+                    self._write_manifest(entry, manifest)
+                    return entry, manifest
+            shutil.rmtree(entry, ignore_errors=True)
+
+        return entry, {
+            "version": CACHE_FORMAT_VERSION,
+            "source": str(source),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_digest(source),
+        }
+
+    def _store(self, entry: Path, manifest: dict, name: str, writer: Callable[[Path], dict]) -> None:
+        # Write into a scratch directory first so readers never see a half-written entry.
+        entry.mkdir(parents=True, exist_ok=True)
+        scratch = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=entry))
+        layout = writer(scratch)
+        target = entry / name
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(scratch, target)
+
+        manifest[name] = layout
+        self._write_manifest(entry, manifest)
+
+    def _write_manifest(self, entry: Path, manifest: dict) -> None:
+        tmp_path = entry / "manifest.json.tmp"
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp_path, entry / "manifest.json")
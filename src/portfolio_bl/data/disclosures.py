@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from portfolio_bl.data.labels import normalize_labels
+
 
 REQUIRED_DISCLOSURE_COLUMNS = {"person", "as_of_date", "ticker", "value_usd"}
 
@@ -17,8 +20,8 @@ def load_disclosures_csv(path: str | Path) -> pd.DataFrame:
         raise ValueError(f"Missing required disclosure columns: {missing_str}")
 
     out = disclosures.copy()
-    out["person_norm"] = out["person"].astype(str).str.strip().str.lower()
-    out["ticker"] = out["ticker"].astype(str).str.strip().str.upper()
+    out["person_norm"] = normalize_labels(out["person"], upper=False)
+    out["ticker"] = normalize_labels(out["ticker"])
     out["as_of_date"] = pd.to_datetime(out["as_of_date"], errors="coerce")
     out["value_usd"] = pd.to_numeric(out["value_usd"], errors="coerce")
 
@@ -50,3 +53,104 @@ def latest_portfolio_for_aliases(
     latest = latest[["ticker", "value_usd", "weight"]].sort_values("ticker").reset_index(drop=True)
 
     return latest, as_of_date
+
+
+
+class DisclosureIndex:
+    """Point-in-time lookups of disclosed holdings, built once from ``load_disclosures_csv``.
+
+    Rows are grouped by person and sorted by filing date. An alias set is merged
+    on first use and cached, and lookups binary-search its filing dates.
+    """
+
+    def __init__(self, disclosures: pd.DataFrame) -> None:
+        ordered = disclosures.sort_values(["person_norm", "as_of_date", "ticker"], kind="stable")
+        codes, tickers = pd.factorize(ordered["ticker"])
+        self.tickers = pd.Index(tickers)
+
+        persons = ordered["person_norm"].to_numpy()
+        bounds = np.flatnonzero(persons[1:] != persons[:-1]) + 1
+        starts = np.concatenate([[0], bounds])
+        stops = np.concatenate([bounds, [len(persons)]])
+
+        dates = ordered["as_of_date"].to_numpy(dtype="datetime64[ns]")
+        values = ordered["value_usd"].to_numpy(dtype=np.float64)
+        self._rows = {
+            persons[a]: (dates[a:b], codes[a:b], values[a:b])
+            for a, b in zip(starts, stops)
+        }
+        self._groups: dict[frozenset[str], tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    @property
+    def persons(self) -> list[str]:
+        return list(self._rows)
+
+    def _group(self, aliases: tuple[str, ...] | list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        alias_set = frozenset(a.strip().lower() for a in aliases)
+        if alias_set not in self._groups:
+            parts = [self._rows[a] for a in sorted(alias_set) if a in self._rows]
+            if not parts:
+                alias_str = ", ".join(sorted(alias_set))
+                raise ValueError(f"No disclosure rows found for aliases: {alias_str}")
+
+            dates = np.concatenate([p[0] for p in parts])
+            order = np.argsort(dates, kind="stable")
+            dates = dates[order]
+            codes = np.concatenate([p[1] for p in parts])[order]
+            values = np.concatenate([p[2] for p in parts])[order]
+
+            # Filing f owns rows offsets[f]:offsets[f + 1].
+            filing_dates, offsets = np.unique(dates, return_index=True)
+            offsets = np.append(offsets, len(dates))
+            self._groups[alias_set] = (filing_dates, offsets, codes, values)
+        return self._groups[alias_set]
+
+    def filing_dates(self, aliases: tuple[str, ...] | list[str]) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self._group(aliases)[0])
+
+    def portfolio_as_of(
+        self,
+        aliases: tuple[str, ...] | list[str],
+        date: pd.Timestamp | str,
+    ) -> tuple[pd.DataFrame, pd.Timestamp] | None:
+        # Same layout as latest_portfolio_for_aliases, for the last filing on or before date.
+        filing_dates, offsets, codes, values = self._group(aliases)
+        f = int(np.searchsorted(filing_dates, np.datetime64(pd.Timestamp(date), "ns"), side="right")) - 1
+        if f < 0:
+            return None
+
+        rows = slice(offsets[f], offsets[f + 1])
+        holdings = pd.DataFrame({"ticker": self.tickers[codes[rows]], "value_usd": values[rows]})
+        holdings["weight"] = holdings["value_usd"] / holdings["value_usd"].sum()
+        holdings = holdings.sort_values("ticker").reset_index(drop=True)
+        return holdings, pd.Timestamp(filing_dates[f])
+
+    def weight_schedule(
+        self,
+        aliases: tuple[str, ...] | list[str],
+        dates: pd.DatetimeIndex | list[pd.Timestamp],
+        columns: pd.Index | list[str],
+    ) -> tuple[np.ndarray, pd.DatetimeIndex]:
+        # Weights known at each date, aligned to columns and renormalized over them. Dates
+        # before the first filing get zero rows and NaT as their filing date.
+        filing_dates, offsets, codes, values = self._group(aliases)
+        columns = pd.Index(columns)
+
+        # One dense row per filing: map tickers to column positions and scatter-add the values.
+        positions = columns.get_indexer(self.tickers)[codes]
+        filing_of_row = np.repeat(np.arange(len(filing_dates)), np.diff(offsets))
+        keep = positions >= 0
+        per_filing = np.zeros((len(filing_dates), len(columns)), dtype=np.float64)
+        np.add.at(per_filing, (filing_of_row[keep], positions[keep]), values[keep])
+        totals = per_filing.sum(axis=1, keepdims=True)
+        per_filing = np.divide(per_filing, totals, out=np.zeros_like(per_filing), where=totals > 0)
+
+        lookup = np.asarray(pd.DatetimeIndex(dates), dtype="datetime64[ns]")
+        which = np.searchsorted(filing_dates, lookup, side="right") - 1
+        known = which >= 0
+
+        weights = np.zeros((len(lookup), len(columns)), dtype=np.float64)
+        weights[known] = per_filing[which[known]]
+        as_of = np.full(len(lookup), np.datetime64("NaT"), dtype="datetime64[ns]")
+        as_of[known] = filing_dates[which[known]]
+        return weights, pd.DatetimeIndex(as_of)
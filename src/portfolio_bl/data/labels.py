@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import pandas as pd
+
+
+
+def normalize_labels(values: pd.Series, upper: bool = True) -> pd.Series:
+    # Labels repeat heavily (tickers, people), so strip and re-case each distinct value once
+    # and map back by code. Besides the speed-up, this keeps the per-row Python string work,
+    # which holds the GIL, out of loaders that run on parallel threads.
+    codes, uniques = pd.factorize(values.astype(str), use_na_sentinel=False)
+    stripped = pd.Index(uniques).str.strip()
+    cased = stripped.str.upper() if upper else stripped.str.lower()
+    return pd.Series(cased.take(codes), index=values.index, name=values.name)
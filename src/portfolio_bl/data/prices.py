@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from concurrent.futures import Future
 from pathlib import Path
+from typing import Iterable
 
+import numpy as np
 import pandas as pd
 
+from portfolio_bl.data.labels import normalize_labels
+
 
 REQUIRED_PRICE_COLUMNS = {"date", "ticker", "close"}
 
@@ -16,14 +21,7 @@ def load_prices_csv(path: str | Path) -> pd.DataFrame:
         missing_str = ", ".join(sorted(missing))
         raise ValueError(f"Missing required price columns: {missing_str}")
 
-    out = prices.copy()
-    out["date"] = pd.to_datetime(out["date"], errors="coerce")
-    out["ticker"] = out["ticker"].astype(str).str.strip().str.upper()
-    out["close"] = pd.to_numeric(out["close"], errors="coerce")
-
-    out = out.dropna(subset=["date", "ticker", "close"])
-    out = out[out["close"] > 0].copy()
-
+    out = _clean_prices(prices)
     if out.empty:
         raise ValueError("Price dataset is empty after cleaning.")
 
@@ -31,20 +29,125 @@ def load_prices_csv(path: str | Path) -> pd.DataFrame:
 
 
 
-def to_return_matrix(prices: pd.DataFrame) -> pd.DataFrame:
-    matrix = (
-        prices.pivot_table(index="date", columns="ticker", values="close", aggfunc="last")
-        .sort_index()
-        .sort_index(axis=1)
+def _clean_prices(prices: pd.DataFrame) -> pd.DataFrame:
+    prices["date"] = pd.to_datetime(prices["date"], errors="coerce")
+    prices["ticker"] = normalize_labels(prices["ticker"])
+    prices["close"] = pd.to_numeric(prices["close"], errors="coerce")
+
+    prices = prices.dropna(subset=["date", "ticker", "close"])
+    return prices[prices["close"] > 0].copy()
+
+
+
+def _ticker_set(tickers: Iterable[str] | None) -> set[str] | None:
+    return None if tickers is None else {str(t).strip().upper() for t in tickers}
+
+
+
+def load_close_matrix_chunked(
+    path: str | Path,
+    tickers: Iterable[str] | Future | None = None,
+    chunksize: int = 1_000_000,
+) -> pd.DataFrame:
+    header = pd.read_csv(path, nrows=0)
+    missing = REQUIRED_PRICE_COLUMNS.difference(header.columns)
+    if missing:
+        missing_str = ", ".join(sorted(missing))
+        raise ValueError(f"Missing required price columns: {missing_str}")
+
+    # The ticker filter may still be computing (a Future); chunks read before it resolves
+    # are pivoted unfiltered and trimmed once it does.
+    pending = tickers if isinstance(tickers, Future) else None
+    wanted = None if pending is not None else _ticker_set(tickers)
+
+    # Only the filtered, per-chunk pivots are kept; raw rows are dropped as soon as they are read.
+    # Every cleaned date is remembered, filtered or not, so a day only other tickers traded still
+    # splits the returns around it, as in the full pivot.
+    partials: list[pd.DataFrame] = []
+    calendar: list[np.ndarray] = []
+    reader = pd.read_csv(
+        path,
+        usecols=["date", "ticker", "close"],
+        dtype={"date": str, "ticker": str},
+        chunksize=chunksize,
     )
+    with reader:
+        for chunk in reader:
+            if pending is not None and pending.done():
+                wanted, pending = _ticker_set(pending.result()), None
+                partials = _keep_tickers(partials, wanted)
+            chunk = _clean_prices(chunk)
+            calendar.append(chunk["date"].unique())
+            if wanted is not None:
+                chunk = chunk[chunk["ticker"].isin(wanted)]
+            if chunk.empty:
+                continue
+            partials.append(
+                chunk.drop_duplicates(["date", "ticker"], keep="last").pivot(
+                    index="date", columns="ticker", values="close"
+                )
+            )
+
+    if pending is not None:
+        partials = _keep_tickers(partials, _ticker_set(pending.result()))
+    if not partials:
+        raise ValueError("Price dataset is empty after cleaning.")
+
+    # A date may straddle chunk boundaries; later rows win, as with aggfunc="last".
+    matrix = pd.concat(partials).groupby(level=0).last()
+    matrix = matrix.reindex(pd.Index(np.concatenate(calendar), name=matrix.index.name).unique())
+    return matrix.sort_index().sort_index(axis=1)
+
+
+
+def _keep_tickers(partials: list[pd.DataFrame], wanted: set[str] | None) -> list[pd.DataFrame]:
+    if wanted is None:
+        return partials
+    # Only columns are dropped; the rows stay so the partials still cover every date read.
+    kept = [p.loc[:, p.columns.isin(wanted)] for p in partials]
+    return [p for p in kept if len(p.columns)]
+
+
+
+def to_return_matrix(
+    prices: pd.DataFrame,
+    dtype: np.dtype | type = np.float64,
+    tickers: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    if tickers is None:
+        matrix = prices.pivot_table(index="date", columns="ticker", values="close", aggfunc="last")
+        return close_matrix_to_returns(matrix, dtype=dtype)
+
+    # Only the wanted tickers are pivoted, but on every date of the file, so a day they
+    # skipped still splits their returns as in the full pivot.
+    calendar = pd.Index(prices["date"].unique(), name="date")
+    kept = prices[prices["ticker"].isin(_ticker_set(tickers))]
+    matrix = kept.pivot_table(index="date", columns="ticker", values="close", aggfunc="last")
+    return close_matrix_to_returns(matrix.reindex(calendar), dtype=dtype)
+
+
+
+def close_matrix_to_returns(matrix: pd.DataFrame, dtype: np.dtype | type = np.float64) -> pd.DataFrame:
+    matrix = matrix.sort_index().sort_index(axis=1)
     returns = matrix.pct_change().dropna(how="all")
     if returns.empty:
         raise ValueError("Return matrix is empty; not enough observations in prices.")
 
+    # Returns are computed in float64; the compact float32 copy is one contiguous block.
+    if (returns.dtypes != dtype).any():
+        returns = returns.astype(dtype)
     return returns
 
 
 
+def matrix_dtype(returns: pd.DataFrame) -> type:
+    # Compact (all-float32) return matrices stay float32 downstream; anything else is widened.
+    if len(returns.columns) and (returns.dtypes == np.float32).all():
+        return np.float32
+    return np.float64
+
+
+
 def monthly_rebalance_dates(index: pd.DatetimeIndex, frequency: str = "ME") -> pd.DatetimeIndex:
     series = pd.Series(index=index, data=index)
     grouped = series.groupby(pd.Grouper(freq=frequency)).last().dropna()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+
+def synthetic_tickers(n_tickers: int) -> list[str]:
+    width = max(4, len(str(n_tickers - 1)))
+    return [f"T{i:0{width}d}" for i in range(n_tickers)]
+
+
+
+def synthetic_prices(
+    n_tickers: int,
+    n_days: int,
+    seed: int = 0,
+    start: str = "2015-01-02",
+) -> pd.DataFrame:
+    # One market factor plus idiosyncratic noise, compounded into business-day closes.
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=n_days)
+    betas = rng.uniform(0.5, 1.5, size=n_tickers)
+    market = rng.normal(0.0003, 0.01, size=(n_days, 1))
+    returns = market * betas + rng.normal(0.0, 0.015, size=(n_days, n_tickers))
+    closes = rng.uniform(20.0, 200.0, size=n_tickers) * np.cumprod(1.0 + returns, axis=0)
+
+    return pd.DataFrame(
+        {
+            "date": np.repeat(dates.to_numpy(), n_tickers),
+            "ticker": np.tile(synthetic_tickers(n_tickers), n_days),
+            "close": closes.ravel(),
+        }
+    )
+
+
+
+def synthetic_disclosures(
+    tickers: list[str],
+    n_people: int,
+    start: str,
+    end: str,
+    holdings_per_filing: int = 20,
+    seed: int = 0,
+) -> pd.DataFrame:
+    # Quarterly filings per person; each drifts from the previous one by swapping a few names.
+    rng = np.random.default_rng(seed)
+    filing_dates = pd.date_range(start, end, freq="QE")
+    if filing_dates.empty:
+        filing_dates = pd.DatetimeIndex([pd.Timestamp(end)])
+    size = min(holdings_per_filing, len(tickers))
+
+    frames = []
+    for p in range(n_people):
+        held = rng.choice(len(tickers), size=size, replace=False)
+        for date in filing_dates:
+            swaps = rng.integers(0, max(size // 5, 1) + 1)
+            if swaps:
+                outside = np.setdiff1d(np.arange(len(tickers)), held)
+                if len(outside):
+                    slots = rng.choice(size, size=min(swaps, len(outside)), replace=False)
+                    held = held.copy()
+                    held[slots] = rng.choice(outside, size=len(slots), replace=False)
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "person": f"Person {p}",
+                        "as_of_date": date.strftime("%Y-%m-%d"),
+                        "ticker": [tickers[i] for i in held],
+                        "value_usd": np.round(rng.lognormal(13.0, 1.0, size=size), 2),
+                        "source": "synthetic",
+                    }
+                )
+            )
+    return pd.concat(frames, ignore_index=True)
+
+
+
+def write_synthetic_dataset(
+    directory: str | Path,
+    n_tickers: int,
+    n_days: int,
+    n_people: int = 1,
+    holdings_per_filing: int = 20,
+    seed: int = 0,
+) -> tuple[Path, Path]:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    prices = synthetic_prices(n_tickers, n_days, seed=seed)
+    dates = pd.DatetimeIndex(prices["date"].iloc[[0, -1]])
+    disclosures = synthetic_disclosures(
+        synthetic_tickers(n_tickers),
+        n_people,
+        start=dates[0].strftime("%Y-%m-%d"),
+        end=dates[1].strftime("%Y-%m-%d"),
+        holdings_per_filing=holdings_per_filing,
+        seed=seed + 1,
+    )
+
+    disclosures_path = directory / "disclosures.csv"
+    prices_path = directory / "prices.csv"
+    disclosures.to_csv(disclosures_path, index=False)
+    prices.assign(date=prices["date"].dt.strftime("%Y-%m-%d")).to_csv(prices_path, index=False)
+    return disclosures_path, prices_path
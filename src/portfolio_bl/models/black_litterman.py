@@ -1,57 +1,148 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 import numpy as np
 import pandas as pd
 
+from portfolio_bl.models.covariance import FactorCovariance
+from portfolio_bl.models.linalg import cholesky_inverse, cholesky_solve
+from portfolio_bl.models.mean_variance import long_only_markowitz_weights_batch
+
+
+@dataclass
+class BlackLittermanBatch:
+    params: pd.DataFrame
+    posterior_means: np.ndarray
+    posterior_covariances: np.ndarray | None = None
+    weights: np.ndarray | None = None
+
 
 
 def implied_equilibrium_returns(
-    covariance: pd.DataFrame,
+    covariance: pd.DataFrame | FactorCovariance,
     market_weights: pd.Series,
     risk_aversion: float,
 ) -> np.ndarray:
     tickers = list(covariance.columns)
+    if isinstance(covariance, FactorCovariance):
+        w_mkt = market_weights.reindex(tickers).fillna(0.0).to_numpy(dtype=float)
+        return risk_aversion * covariance.matvec(w_mkt)
     sigma = covariance.loc[tickers, tickers].to_numpy(dtype=float)
     w_mkt = market_weights.reindex(tickers).fillna(0.0).to_numpy(dtype=float)
     return risk_aversion * sigma @ w_mkt
 
 
 
+class EquilibriumCache:
+    """Implied equilibrium returns ``risk_aversion * Sigma w`` with incremental updates.
+
+    The last covariance and weights are remembered. A call with the same covariance
+    object reuses the cached product and only adds the columns of Sigma whose weights
+    changed; a new covariance triggers a full product.
+    """
+
+    def __init__(self, risk_aversion: float) -> None:
+        self.risk_aversion = risk_aversion
+        self.full_updates = 0
+        self.partial_updates = 0
+        self._covariance: pd.DataFrame | FactorCovariance | None = None
+        self._sigma: np.ndarray | None = None
+        self._weights: np.ndarray | None = None
+        self._sigma_w: np.ndarray | None = None
+
+    def __call__(self, covariance: pd.DataFrame | FactorCovariance, weights: np.ndarray) -> np.ndarray:
+        weights = np.asarray(weights, dtype=float)
+
+        if covariance is not self._covariance or self._weights is None or len(weights) != len(self._weights):
+            self._covariance = covariance
+            if isinstance(covariance, FactorCovariance):
+                self._sigma = None
+                self._sigma_w = covariance.matvec(weights)
+            else:
+                self._sigma = covariance.to_numpy(dtype=float)
+                self._sigma_w = self._sigma @ weights
+            self._weights = weights.copy()
+            self.full_updates += 1
+            return self.risk_aversion * self._sigma_w
+
+        delta = weights - self._weights
+        changed = np.flatnonzero(delta)
+        if len(changed):
+            if isinstance(covariance, FactorCovariance):
+                update = covariance.loadings @ (covariance.loadings[changed].T @ delta[changed])
+                update[changed] += covariance.specific[changed] * delta[changed]
+            else:
+                update = self._sigma[:, changed] @ delta[changed]
+            self._sigma_w = self._sigma_w + update
+            self._weights = weights.copy()
+            self.partial_updates += 1
+        return self.risk_aversion * self._sigma_w
+
+
+
 def diagonal_omega_from_confidence(
-    covariance: np.ndarray,
-    p_matrix: np.ndarray,
+    covariance: np.ndarray | FactorCovariance,
+    p_matrix: np.ndarray | None,
     tau: float,
     confidence: float,
+    as_vector: bool = False,
 ) -> np.ndarray:
+    # p_matrix=None stands for one absolute view per asset (P = I) without building the matrix.
     confidence = float(np.clip(confidence, 1e-3, 1.0))
-    projected = p_matrix @ (tau * covariance) @ p_matrix.T
-    diag = np.diag(projected)
+    if isinstance(covariance, FactorCovariance):
+        if p_matrix is None:
+            diag = tau * covariance.diagonal()
+        else:
+            diag = tau * np.einsum("ij,j,ij->i", p_matrix, covariance.specific, p_matrix)
+            diag = diag + tau * ((p_matrix @ covariance.loadings) ** 2).sum(axis=1)
+    elif p_matrix is None or np.array_equal(p_matrix, np.eye(*np.shape(p_matrix))):
+        diag = tau * np.diag(covariance)
+    else:
+        diag = np.einsum("ij,jk,ik->i", p_matrix, tau * covariance, p_matrix)
     diag = np.where(diag <= 0, 1e-8, diag)
 
     # Higher confidence -> lower view uncertainty.
     scale = (1.0 - confidence) / confidence
+    if as_vector:
+        return diag * scale
     return np.diag(diag * scale)
 
 
 
 def black_litterman_posterior(
     pi: np.ndarray,
-    covariance: np.ndarray,
-    p_matrix: np.ndarray,
+    covariance: np.ndarray | FactorCovariance,
+    p_matrix: np.ndarray | None,
     q_views: np.ndarray,
     tau: float,
     omega: np.ndarray | None = None,
     ridge: float = 1e-6,
-) -> tuple[np.ndarray, np.ndarray]:
+    solver: str = "pinv",
+) -> tuple[np.ndarray, np.ndarray | FactorCovariance]:
+    if isinstance(covariance, FactorCovariance):
+        return _black_litterman_posterior_factor(pi, covariance, p_matrix, q_views, tau, omega, ridge)
+
     sigma = np.asarray(covariance, dtype=float)
-    p = np.asarray(p_matrix, dtype=float)
+    p = None if p_matrix is None else np.asarray(p_matrix, dtype=float)
     q = np.asarray(q_views, dtype=float)
 
     sigma = sigma + np.eye(sigma.shape[0]) * ridge
 
     if omega is None:
-        omega = np.diag(np.diag(p @ (tau * sigma) @ p.T))
-    omega = np.asarray(omega, dtype=float) + np.eye(omega.shape[0]) * ridge
+        omega = tau * np.diag(sigma) if p is None else np.diag(p @ (tau * sigma) @ p.T)
+    omega = np.asarray(omega, dtype=float)
+
+    if solver == "cholesky":
+        return _black_litterman_posterior_cholesky(pi, sigma, p, q, tau, omega, ridge)
+    if solver != "pinv":
+        raise ValueError(f"Unknown Black-Litterman solver '{solver}'. Use 'pinv' or 'cholesky'.")
+    if p is None:
+        p = np.eye(sigma.shape[0])
+
+    if omega.ndim == 1:
+        omega = np.diag(omega)
+    omega = omega + np.eye(omega.shape[0]) * ridge
 
     tau_sigma_inv = np.linalg.pinv(tau * sigma)
     omega_inv = np.linalg.pinv(omega)
@@ -63,3 +154,193 @@ def black_litterman_posterior(
     posterior_covariance = sigma + middle_inv
 
     return posterior_mean, posterior_covariance
+
+
+
+def _black_litterman_posterior_cholesky(
+    pi: np.ndarray,
+    sigma: np.ndarray,
+    p: np.ndarray | None,
+    q: np.ndarray,
+    tau: float,
+    omega: np.ndarray,
+    ridge: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    n_assets = sigma.shape[0]
+    n_views = n_assets if p is None else p.shape[0]
+    tau_sigma = tau * sigma
+    diagonal_omega = omega.ndim == 1
+    omega = omega + ridge if diagonal_omega else omega + np.eye(n_views) * ridge
+
+    if p is None or n_views < n_assets:
+        # View-space form: only the K x K system tau P Sigma P' + Omega is factorized and Sigma
+        # is never inverted. With P = I (p is None) it is tau Sigma + Omega, with no products by P.
+        if p is None:
+            tau_sigma_pt, view_cov, view_gap = tau_sigma, tau_sigma, q - pi
+        else:
+            tau_sigma_pt = tau_sigma @ p.T
+            view_cov, view_gap = p @ tau_sigma_pt, q - p @ pi
+        view_cov = view_cov + np.diag(omega) if diagonal_omega else view_cov + omega
+
+        solved = cholesky_solve(view_cov, np.column_stack([view_gap, tau_sigma_pt.T]))
+
+        posterior_mean = pi + tau_sigma_pt @ solved[:, 0]
+        middle_inv = tau_sigma - tau_sigma_pt @ solved[:, 1:]
+    else:
+        if diagonal_omega:
+            omega_inv_p = p / omega[:, None]
+        else:
+            omega_inv_p = cholesky_solve(omega, p)
+
+        tau_sigma_inv = cholesky_inverse(tau_sigma)
+        middle = tau_sigma_inv + p.T @ omega_inv_p
+        middle_inv = cholesky_inverse(middle)
+        posterior_mean = middle_inv @ (tau_sigma_inv @ pi + omega_inv_p.T @ q)
+
+    posterior_covariance = sigma + 0.5 * (middle_inv + middle_inv.T)
+    return posterior_mean, posterior_covariance
+
+
+
+def _black_litterman_posterior_factor(
+    pi: np.ndarray,
+    covariance: FactorCovariance,
+    p_matrix: np.ndarray | None,
+    q_views: np.ndarray,
+    tau: float,
+    omega: np.ndarray | None,
+    ridge: float,
+) -> tuple[np.ndarray, FactorCovariance]:
+    # With one absolute view per asset (P = I) and a diagonal Omega, every step keeps the
+    # diagonal-plus-low-rank structure, so the posterior costs O(N K^2) instead of O(N^3).
+    n_assets, n_factors = covariance.loadings.shape
+    if p_matrix is not None and (
+        np.shape(p_matrix) != (n_assets, n_assets) or not np.array_equal(p_matrix, np.eye(n_assets))
+    ):
+        raise ValueError("Factor-structured posteriors need one absolute view per asset (P = I).")
+
+    specific = covariance.specific + ridge
+    loadings = covariance.loadings
+    sigma = FactorCovariance(loadings, specific, covariance.index)
+    if omega is None:
+        omega = tau * sigma.diagonal()
+    omega = np.asarray(omega, dtype=float)
+    if omega.ndim == 2:
+        omega = np.diag(omega)
+    omega = omega + ridge
+
+    # Mean, Woodbury form: pi + Sigma (Sigma + Omega / tau)^-1 (q - pi).
+    view_space = FactorCovariance(loadings, specific + omega / tau, covariance.index)
+    posterior_mean = pi + sigma.matvec(view_space.solve(np.asarray(q_views, dtype=float) - pi))
+
+    # Covariance, information form: ((tau Sigma)^-1 + Omega^-1)^-1 = diag(E)^-1 + G H^-1 G'.
+    capacitance = np.eye(n_factors) + loadings.T @ (loadings / specific[:, None])
+    chol_c = np.linalg.cholesky(capacitance)
+    u = np.linalg.solve(chol_c, (loadings / specific[:, None]).T).T / np.sqrt(tau)
+    e_inv = 1.0 / (1.0 / (tau * specific) + 1.0 / omega)
+    g = e_inv[:, None] * u
+    chol_h = np.linalg.cholesky(np.eye(n_factors) - u.T @ g)
+    extra = np.linalg.solve(chol_h, g.T).T
+
+    posterior_covariance = FactorCovariance(
+        loadings=np.column_stack([loadings, extra]),
+        specific=specific + e_inv,
+        index=covariance.index,
+    )
+    return posterior_mean, posterior_covariance
+
+
+
+def black_litterman_batch(
+    covariance: np.ndarray,
+    market_weights: np.ndarray,
+    p_matrix: np.ndarray | None,
+    q_views: np.ndarray,
+    tau: float | np.ndarray,
+    confidence: float | np.ndarray,
+    risk_aversion: float | np.ndarray,
+    ridge: float = 1e-6,
+    return_covariance: bool = True,
+    return_weights: bool = False,
+    omega_ridge: float = 0.0,
+) -> BlackLittermanBatch:
+    # Parameter arrays are broadcast against each other. Omega follows
+    # diagonal_omega_from_confidence, plus omega_ridge on its diagonal; pass
+    # omega_ridge=ridge to match black_litterman_posterior. Without it one
+    # decomposition serves the whole grid, with it one per distinct tau.
+    taus, confidences, deltas = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(tau, dtype=float)),
+        np.atleast_1d(np.asarray(confidence, dtype=float)),
+        np.atleast_1d(np.asarray(risk_aversion, dtype=float)),
+    )
+    confidences = np.clip(confidences, 1e-3, 1.0)
+    scales = (1.0 - confidences) / confidences
+
+    sigma = np.asarray(covariance, dtype=float)
+    p = None if p_matrix is None else np.asarray(p_matrix, dtype=float)
+    q = np.asarray(q_views, dtype=float)
+    w_mkt = np.asarray(market_weights, dtype=float)
+    sigma_reg = sigma + np.eye(sigma.shape[0]) * ridge
+
+    # Omega = scale * D_tau (+ omega_ridge), where D_tau is the view variance times tau,
+    # floored as in diagonal_omega_from_confidence. Grid points sharing D_tau / tau share
+    # the eigenbasis of D^-1/2 P Sigma P' D^-1/2 + (omega_ridge / tau) D^-1.
+    if p is None:
+        view_var, sigma_pt, view_cov = np.diag(sigma).copy(), sigma_reg, sigma_reg
+    else:
+        view_var = np.einsum("ij,jk,ik->i", p, sigma, p)
+        sigma_pt = sigma_reg @ p.T
+        view_cov = p @ sigma_pt
+    view_cov = 0.5 * (view_cov + view_cov.T)
+
+    # Only a non-positive view variance makes D_tau / tau depend on tau; otherwise, without
+    # omega_ridge, one decomposition serves the whole grid.
+    if omega_ridge or (view_var <= 0).any():
+        groups = [np.flatnonzero(taus == t) for t in np.unique(taus)]
+    else:
+        groups = [np.arange(len(taus))]
+
+    # pi = delta * Sigma w is linear in delta, so its view-space projection is too.
+    base = sigma @ w_mkt
+    p_base = base if p is None else p @ base
+    pis = deltas[:, None] * base[None, :]
+    posterior_means = np.empty_like(pis)
+    posterior_covariances = None
+    if return_covariance or return_weights:
+        posterior_covariances = (1.0 + taus)[:, None, None] * sigma_reg
+
+    for rows in groups:
+        tau_g = taus[rows[0]]
+        d = np.where(tau_g * view_var <= 0, 1e-8, tau_g * view_var) / tau_g
+        inv_sqrt_d = 1.0 / np.sqrt(d)
+        scaled_view_cov = view_cov * np.outer(inv_sqrt_d, inv_sqrt_d)
+        if omega_ridge:
+            scaled_view_cov = scaled_view_cov + np.diag(omega_ridge / tau_g * inv_sqrt_d**2)
+        # Pairwise covariances of windows with gaps can be indefinite. The eigenvalues keep
+        # their sign, as in the exact solve of black_litterman_posterior; only a vanishing
+        # eig + scale is dropped, as its pseudo-inverse fallback would.
+        eigvals, eigvecs = np.linalg.eigh(scaled_view_cov)
+
+        projector = eigvecs.T * inv_sqrt_d
+        loadings = sigma_pt @ projector.T
+        spread = eigvals[None, :] + scales[rows, None]
+        shrink = np.divide(1.0, spread, out=np.zeros_like(spread), where=np.abs(spread) > 1e-12)
+
+        view_gap = (projector @ q)[None, :] - deltas[rows, None] * (projector @ p_base)[None, :]
+        posterior_means[rows] = pis[rows] + (view_gap * shrink) @ loadings.T
+
+        if posterior_covariances is not None:
+            correction = np.einsum("nk,gk,mk->gnm", loadings, shrink, loadings)
+            posterior_covariances[rows] -= taus[rows, None, None] * correction
+
+    weights = None
+    if return_weights:
+        weights = long_only_markowitz_weights_batch(posterior_means, posterior_covariances)
+
+    params = pd.DataFrame({"tau": taus, "confidence": confidences, "risk_aversion": deltas})
+    return BlackLittermanBatch(
+        params=params,
+        posterior_means=posterior_means,
+        posterior_covariances=posterior_covariances if return_covariance else None,
+        weights=weights,
+    )
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.models.covariance import FactorCovariance
+from portfolio_bl.models.linalg import cholesky_inverse
+
+
+
+class _SubsetInverse:
+    # Inverse of Q[F, F] for a changing free set F, updated by block bordering
+    # (Schur complements) so that k set changes cost O(k n^2) instead of O(n^3).
+
+    def __init__(self, q: np.ndarray) -> None:
+        self.q = q
+        self.free = np.empty(0, dtype=int)
+        self.inverse = np.empty((0, 0))
+        self.updates = 0
+
+    def reset(self, free: np.ndarray) -> None:
+        self.free = np.asarray(free, dtype=int)
+        self.inverse = cholesky_inverse(self.q[np.ix_(self.free, self.free)]) if len(self.free) else np.empty((0, 0))
+        self.updates = 0
+
+    def update(self, free: np.ndarray) -> None:
+        free = np.asarray(free, dtype=int)
+        removed = np.setdiff1d(self.free, free, assume_unique=True)
+        added = np.setdiff1d(free, self.free, assume_unique=True)
+        n_changes = len(removed) + len(added)
+        if n_changes == 0:
+            return
+        if n_changes > max(8, len(free) // 4) or self.updates > 64:
+            self.reset(free)
+            return
+
+        if len(removed):
+            keep = ~np.isin(self.free, removed)
+            a = self.inverse[np.ix_(keep, keep)]
+            b = self.inverse[np.ix_(keep, ~keep)]
+            d = self.inverse[np.ix_(~keep, ~keep)]
+            self.inverse = a - b @ np.linalg.solve(d, b.T)
+            self.free = self.free[keep]
+
+        if len(added):
+            q_fa = self.q[np.ix_(self.free, added)]
+            h_q = self.inverse @ q_fa
+            schur = self.q[np.ix_(added, added)] - q_fa.T @ h_q
+            schur_inv = cholesky_inverse(schur)
+            top_left = self.inverse + h_q @ schur_inv @ h_q.T
+            off = -h_q @ schur_inv
+            self.inverse = np.block([[top_left, off], [off.T, schur_inv]])
+            self.free = np.concatenate([self.free, added])
+
+        self.updates += 1
+
+
+
+class BoxMarkowitzSolver:
+    """Exact mean-variance weights under a budget and per-asset bounds.
+
+    Maximizes ``mu'w - risk_aversion / 2 * w'Sigma w`` subject to ``sum(w) = 1`` and
+    ``lower <= w <= upper`` with a primal-dual active-set method. Each call
+    warm-starts from the previous call's weights when the tickers match; without
+    a usable warm start, accelerated projected gradient locates the active set
+    and the active-set solve finishes it exactly.
+    """
+
+    def __init__(
+        self,
+        risk_aversion: float = 2.5,
+        lower: float = 0.0,
+        upper: float = 1.0,
+        ridge: float = 1e-6,
+        max_iter: int = 20,
+        max_pg_rounds: int = 40,
+        tol: float = 1e-10,
+    ) -> None:
+        self.risk_aversion = risk_aversion
+        self.lower = lower
+        self.upper = upper
+        self.ridge = ridge
+        self.max_iter = max_iter
+        self.max_pg_rounds = max_pg_rounds
+        self.tol = tol
+        self.previous: pd.Series | None = None
+
+    def __call__(self, expected_returns: pd.Series, covariance: pd.DataFrame | FactorCovariance) -> pd.Series:
+        tickers = list(expected_returns.index)
+        mu = expected_returns.to_numpy(dtype=float)
+        if isinstance(covariance, FactorCovariance):
+            # The active-set updates work on dense blocks of the covariance.
+            cov = covariance.reindex(tickers).to_numpy()
+        else:
+            cov = covariance.loc[tickers, tickers].to_numpy(dtype=float)
+
+        warm_start = None
+        if self.previous is not None and list(self.previous.index) == tickers:
+            warm_start = self.previous.to_numpy(dtype=float)
+
+        weights = self.solve(mu, cov, warm_start)
+        self.previous = pd.Series(weights, index=tickers)
+        return self.previous
+
+    def solve(self, mu: np.ndarray, cov: np.ndarray, warm_start: np.ndarray | None = None) -> np.ndarray:
+        n_assets = len(mu)
+        lower = np.full(n_assets, float(self.lower))
+        upper = np.full(n_assets, float(self.upper))
+        if lower.sum() > 1.0 + 1e-12 or upper.sum() < 1.0 - 1e-12:
+            raise ValueError("Weight bounds cannot satisfy the full-investment constraint.")
+
+        q = self.risk_aversion * (cov + np.eye(n_assets) * self.ridge)
+
+        if warm_start is None:
+            weights = np.full(n_assets, 1.0 / n_assets)
+        else:
+            # A warm start usually pins down the active set, so the exact solve settles at once.
+            weights = _project_capped_simplex(np.asarray(warm_start, dtype=float), lower, upper)
+            exact = self._active_set(q, mu, lower, upper, weights <= lower + 1e-12, weights >= upper - 1e-12)
+            if exact is not None:
+                return exact
+
+        # Otherwise let projected gradient locate the active set and finish with an exact solve.
+        step = 1.0 / _lipschitz_constant(q)
+        for _ in range(self.max_pg_rounds):
+            weights = _projected_gradient(q, mu, lower, upper, weights, step, self.tol, max_iter=250)
+            at_lower = weights <= lower + 1e-9
+            at_upper = (weights >= upper - 1e-9) & ~at_lower
+            exact = self._active_set(q, mu, lower, upper, at_lower, at_upper)
+            if exact is not None:
+                return exact
+
+        return weights
+
+    def _active_set(
+        self,
+        q: np.ndarray,
+        mu: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        at_lower: np.ndarray,
+        at_upper: np.ndarray,
+    ) -> np.ndarray | None:
+        scale = float(np.mean(np.diag(q)))
+        subset = _SubsetInverse(q)
+        subset.reset(np.flatnonzero(~(at_lower | at_upper)))
+        seen: set[bytes] = set()
+
+        for _ in range(self.max_iter):
+            free = ~(at_lower | at_upper)
+            if not free.any():
+                return self._vertex(q, mu, lower, upper, at_lower, at_upper)
+
+            subset.update(np.flatnonzero(free))
+            free_idx = subset.free
+            weights = np.where(at_lower, lower, np.where(at_upper, upper, 0.0))
+
+            bound_idx = np.flatnonzero(~free)
+            rhs = mu[free_idx] - q[np.ix_(free_idx, bound_idx)] @ weights[bound_idx]
+            x_rhs = subset.inverse @ rhs
+            x_ones = subset.inverse.sum(axis=1)
+            nu = (x_rhs.sum() - (1.0 - weights[bound_idx].sum())) / x_ones.sum()
+            weights[free_idx] = x_rhs - nu * x_ones
+
+            multipliers = q @ weights - mu + nu
+            multipliers[free_idx] = 0.0
+
+            new_lower = multipliers + scale * (lower - weights) > self.tol
+            new_upper = (multipliers + scale * (upper - weights) < -self.tol) & ~new_lower
+            if np.array_equal(new_lower, at_lower) and np.array_equal(new_upper, at_upper):
+                return np.clip(weights, lower, upper)
+
+            signature = np.packbits(new_lower).tobytes() + np.packbits(new_upper).tobytes()
+            if signature in seen:
+                return None
+            seen.add(signature)
+            at_lower, at_upper = new_lower, new_upper
+
+        return None
+
+    def _vertex(
+        self,
+        q: np.ndarray,
+        mu: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        at_lower: np.ndarray,
+        at_upper: np.ndarray,
+    ) -> np.ndarray | None:
+        # Every asset sits on a bound; optimal if some budget multiplier makes all bound multipliers valid.
+        weights = np.where(at_lower, lower, upper)
+        if abs(weights.sum() - 1.0) > 1e-9:
+            return None
+
+        gradient = q @ weights - mu
+        nu_low = np.max(-gradient[at_lower], initial=-np.inf)
+        nu_high = np.min(-gradient[at_upper], initial=np.inf)
+        return weights if nu_low <= nu_high + self.tol else None
+
+
+
+def _project_capped_simplex(values: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    # Euclidean projection onto {sum(w) = 1, lower <= w <= upper} by bisection on the shift.
+    lo = float(np.min(values - upper))
+    hi = float(np.max(values - lower))
+    for _ in range(60):
+        shift = 0.5 * (lo + hi)
+        if np.clip(values - shift, lower, upper).sum() > 1.0:
+            lo = shift
+        else:
+            hi = shift
+    return np.clip(values - 0.5 * (lo + hi), lower, upper)
+
+
+
+def _lipschitz_constant(q: np.ndarray, n_iter: int = 50) -> float:
+    # Power iteration for the largest eigenvalue of Q, padded slightly to stay an upper bound.
+    v = np.ones(q.shape[0]) / np.sqrt(q.shape[0])
+    for _ in range(n_iter):
+        v = q @ v
+        v /= np.linalg.norm(v)
+    return max(1.05 * float(v @ q @ v), 1e-12)
+
+
+
+def _projected_gradient(
+    q: np.ndarray,
+    mu: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    start: np.ndarray,
+    step: float,
+    tol: float,
+    max_iter: int,
+) -> np.ndarray:
+    weights = _project_capped_simplex(start, lower, upper)
+    momentum = weights.copy()
+    t = 1.0
+    for _ in range(max_iter):
+        candidate = _project_capped_simplex(momentum - step * (q @ momentum - mu), lower, upper)
+        t_next = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * t * t))
+        momentum = candidate + ((t - 1.0) / t_next) * (candidate - weights)
+        converged = np.max(np.abs(candidate - weights)) < tol
+        weights, t = candidate, t_next
+        if converged:
+            break
+    return weights
+
+
+
+def box_constrained_markowitz_weights(
+    expected_returns: pd.Series,
+    covariance: pd.DataFrame,
+    risk_aversion: float = 2.5,
+    lower: float = 0.0,
+    upper: float = 1.0,
+    warm_start: pd.Series | None = None,
+    ridge: float = 1e-6,
+) -> pd.Series:
+    solver = BoxMarkowitzSolver(risk_aversion=risk_aversion, lower=lower, upper=upper, ridge=ridge)
+    solver.previous = warm_start
+    return solver(expected_returns, covariance)
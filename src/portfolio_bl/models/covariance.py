@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+
+COVARIANCE_ESTIMATORS = ("sample", "ledoit_wolf", "oas", "ewma", "factor")
+
+
+@dataclass
+class FactorCovariance:
+    """Covariance ``diag(specific) + loadings @ loadings.T`` kept in factored form.
+
+    Products and solves cost O(N K^2) and memory stays O(N K), so large universes
+    never materialize the N x N matrix unless ``to_frame`` is called.
+    """
+
+    loadings: np.ndarray
+    specific: np.ndarray
+    index: pd.Index
+
+    @classmethod
+    def from_returns(cls, returns: pd.DataFrame, n_factors: int = 3, min_specific: float = 1e-8) -> FactorCovariance:
+        # Statistical factors: the leading principal components of the demeaned window.
+        centered = _centered_values(returns)
+        n_obs = max(centered.shape[0] - 1, 1)
+        _, singular, vt = np.linalg.svd(centered, full_matrices=False)
+        k = min(n_factors, len(singular))
+        loadings = vt[:k].T * (singular[:k] / np.sqrt(n_obs))
+
+        total = (centered**2).sum(axis=0) / n_obs
+        specific = np.maximum(total - (loadings**2).sum(axis=1), min_specific)
+        return cls(loadings=loadings, specific=specific, index=returns.columns)
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.index
+
+    def diagonal(self) -> np.ndarray:
+        return self.specific + (self.loadings**2).sum(axis=1)
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        scale = self.specific[:, None] if x.ndim == 2 else self.specific
+        return scale * x + self.loadings @ (self.loadings.T @ x)
+
+    def solve(self, rhs: np.ndarray, ridge: float = 0.0) -> np.ndarray:
+        # Woodbury: (D + L L')^-1 = D^-1 - D^-1 L (I + L' D^-1 L)^-1 L' D^-1.
+        rhs = np.asarray(rhs, dtype=float)
+        inv_d = 1.0 / (self.specific + ridge)
+        scaled = inv_d[:, None] * self.loadings
+        capacitance = np.eye(self.loadings.shape[1]) + self.loadings.T @ scaled
+        d_rhs = inv_d[:, None] * rhs if rhs.ndim == 2 else inv_d * rhs
+        return d_rhs - scaled @ np.linalg.solve(capacitance, scaled.T @ rhs)
+
+    def reindex(self, tickers: list[str] | pd.Index) -> FactorCovariance:
+        positions = self.index.get_indexer(tickers)
+        if (positions < 0).any():
+            raise ValueError("FactorCovariance is missing some requested tickers.")
+        return FactorCovariance(self.loadings[positions], self.specific[positions], pd.Index(tickers))
+
+    def to_numpy(self, dtype: type = float) -> np.ndarray:
+        return (np.diag(self.specific) + self.loadings @ self.loadings.T).astype(dtype, copy=False)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.to_numpy(), index=self.index, columns=self.index)
+
+
+
+def _centered_values(returns: pd.DataFrame) -> np.ndarray:
+    # Missing observations are set to the column mean, so they add nothing to the cross-products.
+    values = returns.to_numpy(dtype=np.float64, na_value=np.nan)
+    centered = values - np.nanmean(values, axis=0)
+    return np.nan_to_num(centered, nan=0.0)
+
+
+
+def ledoit_wolf_covariance(returns: pd.DataFrame) -> pd.DataFrame:
+    # Ledoit-Wolf (2004) shrinkage towards a scaled identity, with the usual 1/T sample scaling.
+    x = _centered_values(returns)
+    n_obs, n_assets = x.shape
+    sample = x.T @ x / n_obs
+    mu = np.trace(sample) / n_assets
+
+    x2 = x**2
+    beta = ((x2.T @ x2).sum() / n_obs - (sample**2).sum()) / (n_assets * n_obs)
+    delta = ((sample - mu * np.eye(n_assets)) ** 2).sum() / n_assets
+    shrinkage = 0.0 if delta <= 0 else min(max(beta, 0.0), delta) / delta
+
+    shrunk = (1.0 - shrinkage) * sample + shrinkage * mu * np.eye(n_assets)
+    return pd.DataFrame(shrunk, index=returns.columns, columns=returns.columns)
+
+
+
+def oas_covariance(returns: pd.DataFrame) -> pd.DataFrame:
+    # Oracle approximating shrinkage (Chen et al., 2010) towards a scaled identity.
+    x = _centered_values(returns)
+    n_obs, n_assets = x.shape
+    sample = x.T @ x / n_obs
+    mu = np.trace(sample) / n_assets
+
+    alpha = (sample**2).mean()
+    denominator = (n_obs + 1.0) * (alpha - mu**2 / n_assets)
+    shrinkage = 1.0 if denominator == 0 else min((alpha + mu**2) / denominator, 1.0)
+
+    shrunk = (1.0 - shrinkage) * sample + shrinkage * mu * np.eye(n_assets)
+    return pd.DataFrame(shrunk, index=returns.columns, columns=returns.columns)
+
+
+
+def ewma_covariance(returns: pd.DataFrame, halflife: float = 6.0) -> pd.DataFrame:
+    if halflife <= 0:
+        raise ValueError(f"halflife must be positive, got {halflife}.")
+
+    values = returns.to_numpy(dtype=np.float64, na_value=np.nan)
+    weights = 0.5 ** (np.arange(len(values))[::-1] / halflife)
+    weights /= weights.sum()
+
+    filled = np.where(np.isnan(values), 0.0, values)
+    observed = (~np.isnan(values)).astype(float)
+    mean = (weights @ filled) / np.maximum(weights @ observed, 1e-300)
+    centered = np.where(np.isnan(values), 0.0, values - mean)
+
+    # Bias correction for reliability weights, matching the sample estimator as halflife grows.
+    cov = (centered * weights[:, None]).T @ centered / (1.0 - (weights**2).sum())
+    return pd.DataFrame(cov, index=returns.columns, columns=returns.columns)
+
+
+
+def covariance_estimator(
+    method: str = "sample",
+    halflife: float = 6.0,
+    n_factors: int = 3,
+) -> Callable[[pd.DataFrame], pd.DataFrame | FactorCovariance]:
+    if method == "sample":
+        return lambda returns: returns.cov().fillna(0.0)
+    if method == "ledoit_wolf":
+        return ledoit_wolf_covariance
+    if method == "oas":
+        return oas_covariance
+    if method == "ewma":
+        return lambda returns: ewma_covariance(returns, halflife=halflife)
+    if method == "factor":
+        return lambda returns: FactorCovariance.from_returns(returns, n_factors=n_factors)
+    raise ValueError(f"Unknown covariance estimator '{method}'. Use one of: {', '.join(COVARIANCE_ESTIMATORS)}.")
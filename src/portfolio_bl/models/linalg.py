@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+
+def cholesky_solve(matrix: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+    # Solves A x = b from the Cholesky factor (L y = b, then L' x = y). A matrix that
+    # is not positive-definite falls back to the least-squares pseudo-inverse.
+    try:
+        lower = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        return np.linalg.pinv(matrix) @ rhs
+    return np.linalg.solve(lower.T, np.linalg.solve(lower, rhs))
+
+
+
+def cholesky_inverse(matrix: np.ndarray) -> np.ndarray:
+    # A^-1 = L^-T L^-1, symmetric by construction.
+    try:
+        lower = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        return np.linalg.pinv(matrix)
+    lower_inv = np.linalg.solve(lower, np.eye(matrix.shape[0]))
+    return lower_inv.T @ lower_inv
@@ -3,15 +3,26 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
+from portfolio_bl.models.covariance import FactorCovariance, covariance_estimator
 
 
-def estimate_mean_cov(returns: pd.DataFrame, min_observations: int = 6) -> tuple[pd.Series, pd.DataFrame]:
+
+def estimate_mean_cov(
+    returns: pd.DataFrame,
+    min_observations: int = 6,
+    method: str = "sample",
+    halflife: float = 6.0,
+    n_factors: int = 3,
+) -> tuple[pd.Series, pd.DataFrame | FactorCovariance]:
     if returns.shape[0] < min_observations:
         raise ValueError(
             f"Need at least {min_observations} observations, got {returns.shape[0]}."
         )
 
     mu = returns.mean()
+    if method != "sample":
+        return mu, covariance_estimator(method, halflife=halflife, n_factors=n_factors)(returns)
+
     cov = returns.cov()
 
     if cov.isna().all().all():
@@ -24,15 +35,18 @@ def estimate_mean_cov(returns: pd.DataFrame, min_observations: int = 6) -> tuple
 
 def long_only_markowitz_weights(
     expected_returns: pd.Series,
-    covariance: pd.DataFrame,
+    covariance: pd.DataFrame | FactorCovariance,
     ridge: float = 1e-6,
 ) -> pd.Series:
     tickers = list(expected_returns.index)
     mu = expected_returns.to_numpy(dtype=float)
-    cov = covariance.loc[tickers, tickers].to_numpy(dtype=float)
 
-    cov_reg = cov + np.eye(len(tickers)) * ridge
-    raw = np.linalg.solve(cov_reg, mu)
+    if isinstance(covariance, FactorCovariance):
+        raw = covariance.reindex(tickers).solve(mu, ridge=ridge)
+    else:
+        cov = covariance.loc[tickers, tickers].to_numpy(dtype=float)
+        cov_reg = cov + np.eye(len(tickers)) * ridge
+        raw = np.linalg.solve(cov_reg, mu)
     raw = np.clip(raw, 0.0, None)
 
     if raw.sum() <= 0:
@@ -41,3 +55,22 @@ def long_only_markowitz_weights(
         weights = raw / raw.sum()
 
     return pd.Series(weights, index=tickers)
+
+
+
+def long_only_markowitz_weights_batch(
+    expected_returns: np.ndarray,
+    covariances: np.ndarray,
+    ridge: float = 1e-6,
+) -> np.ndarray:
+    mu = np.asarray(expected_returns, dtype=float)
+    cov = np.asarray(covariances, dtype=float)
+    n_assets = mu.shape[-1]
+
+    cov_reg = cov + np.eye(n_assets) * ridge
+    raw = np.linalg.solve(cov_reg, mu[..., None])[..., 0]
+    raw = np.clip(raw, 0.0, None)
+
+    totals = raw.sum(axis=-1, keepdims=True)
+    equal = np.full_like(raw, 1.0 / n_assets)
+    return np.where(totals > 0, raw / np.where(totals > 0, totals, 1.0), equal)
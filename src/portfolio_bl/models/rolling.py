@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.data.prices import matrix_dtype
+from portfolio_bl.models.mean_variance import estimate_mean_cov
+
+
+class RollingMeanCov:
+    """Incremental mean/covariance over sliding windows of one return matrix.
+
+    Calling an instance with a training window behaves like ``estimate_mean_cov``:
+    windows that are contiguous slices of the source matrix are served by adding
+    and removing the rows that changed since the previous call, anything else
+    falls back to the full estimate. Missing values are handled pairwise, as in
+    ``DataFrame.cov``.
+    """
+
+    def __init__(
+        self,
+        returns: pd.DataFrame,
+        min_observations: int = 6,
+        reanchor_every: int = 64,
+    ) -> None:
+        # Compact float32 matrices are stored as float32; the running sums are always float64.
+        values = returns.to_numpy(dtype=matrix_dtype(returns), na_value=np.nan)
+        self.index = returns.index
+        self.columns = returns.columns
+        self.min_observations = min_observations
+        self.reanchor_every = reanchor_every
+
+        self._mask = ~np.isnan(values)
+        self._values = np.where(self._mask, values, 0.0)
+        self._start = 0
+        self._stop = 0
+        self._updates = 0
+        self._reset_accumulators(np.zeros(values.shape[1]))
+
+    def __call__(self, returns: pd.DataFrame) -> tuple[pd.Series, pd.DataFrame]:
+        bounds = self._locate(returns)
+        if bounds is None:
+            return estimate_mean_cov(returns, min_observations=self.min_observations)
+        return self.window(*bounds)
+
+    def window(self, start: int, stop: int) -> tuple[pd.Series, pd.DataFrame]:
+        if stop - start < self.min_observations:
+            raise ValueError(
+                f"Need at least {self.min_observations} observations, got {stop - start}."
+            )
+
+        overlaps = start < self._stop and self._start < stop
+        if not overlaps or self._updates >= self.reanchor_every:
+            self._reanchor(start, stop)
+        else:
+            self._move(start, stop)
+
+        mu, cov = self._moments()
+        if np.isnan(cov).all():
+            raise ValueError("Covariance matrix is invalid (all NaN).")
+
+        return (
+            pd.Series(mu, index=self.columns),
+            pd.DataFrame(np.nan_to_num(cov, nan=0.0), index=self.columns, columns=self.columns),
+        )
+
+    def _locate(self, returns: pd.DataFrame) -> tuple[int, int] | None:
+        if returns.empty or not returns.columns.equals(self.columns):
+            return None
+
+        try:
+            start = self.index.get_loc(returns.index[0])
+        except KeyError:
+            return None
+        if not isinstance(start, (int, np.integer)):
+            return None
+
+        stop = start + len(returns)
+        if not self.index[start:stop].equals(returns.index):
+            return None
+        return int(start), stop
+
+    def _reset_accumulators(self, anchor: np.ndarray) -> None:
+        n_assets = len(anchor)
+        self._anchor = anchor
+        self._count = np.zeros((n_assets, n_assets))
+        self._sum = np.zeros((n_assets, n_assets))
+        self._cross = np.zeros((n_assets, n_assets))
+
+    def _reanchor(self, start: int, stop: int) -> None:
+        # Shifting by the window mean keeps the running sums small and well conditioned.
+        mask = self._mask[start:stop]
+        counts = mask.sum(axis=0)
+        sums = self._values[start:stop].sum(axis=0, dtype=np.float64)
+        anchor = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+
+        self._reset_accumulators(anchor)
+        self._accumulate(start, stop, sign=1.0)
+        self._start, self._stop = start, stop
+        self._updates = 0
+
+    def _move(self, start: int, stop: int) -> None:
+        if start > self._start:
+            self._accumulate(self._start, start, sign=-1.0)
+        elif start < self._start:
+            self._accumulate(start, self._start, sign=1.0)
+
+        if stop > self._stop:
+            self._accumulate(self._stop, stop, sign=1.0)
+        elif stop < self._stop:
+            self._accumulate(stop, self._stop, sign=-1.0)
+
+        self._start, self._stop = start, stop
+        self._updates += 1
+
+    def _accumulate(self, start: int, stop: int, sign: float) -> None:
+        mask = self._mask[start:stop].astype(np.float64)
+        shifted = (self._values[start:stop] - self._anchor) * mask
+
+        self._count += sign * (mask.T @ mask)
+        self._sum += sign * (shifted.T @ mask)
+        self._cross += sign * (shifted.T @ shifted)
+
+    def _moments(self) -> tuple[np.ndarray, np.ndarray]:
+        count = np.rint(self._count)
+        own_count = np.diag(count)
+        own_sum = np.diag(self._sum)
+        mu = np.divide(own_sum, own_count, out=np.full_like(own_sum, np.nan), where=own_count > 0)
+        mu = mu + self._anchor
+
+        # Pairwise-complete covariance: _sum[i, j] is the sum of asset i over rows where j is observed.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            centered = self._cross - self._sum * self._sum.T / count
+            cov = centered / (count - 1.0)
+        cov[count < 2] = np.nan
+        return mu, cov
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.backtest.engine import BacktestState
+from portfolio_bl.config import AppConfig
+from portfolio_bl.pipeline import CaseStudyData, CaseStudyResult, load_case_study_data, run_case_study
+from portfolio_bl.profiling import NULL_PROFILER, Profiler, merge_reports
+
+
+@dataclass(frozen=True)
+class SharedFrameSpec:
+    name: str
+    shape: tuple[int, int]
+    dtype: str
+    index: pd.Index
+    columns: pd.Index
+
+
+class SharedFrame:
+    """Numeric DataFrame whose values live in a named shared-memory block.
+
+    The owning process creates it and must call ``close``; workers rebuild a
+    read-only, zero-copy view from ``spec`` with ``attach_shared_frame``.
+    """
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        values = frame.to_numpy()
+        self._shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=self._shm.buf)[:] = values
+        self.spec = SharedFrameSpec(
+            name=self._shm.name,
+            shape=values.shape,
+            dtype=values.dtype.str,
+            index=frame.index,
+            columns=frame.columns,
+        )
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> SharedFrame:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+
+def attach_shared_frame(spec: SharedFrameSpec) -> tuple[pd.DataFrame, shared_memory.SharedMemory]:
+    shm = shared_memory.SharedMemory(name=spec.name)
+    values = np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=shm.buf)
+    values.flags.writeable = False
+    frame = pd.DataFrame(values, index=spec.index, columns=spec.columns, copy=False)
+    # The caller keeps the handle alive for as long as the frame is in use.
+    return frame, shm
+
+
+_WORKER_STATE: dict[str, object] = {}
+
+
+
+def _init_worker(app_config: AppConfig, disclosures: pd.DataFrame, returns_spec: SharedFrameSpec) -> None:
+    returns, shm = attach_shared_frame(returns_spec)
+    _WORKER_STATE["app_config"] = app_config
+    _WORKER_STATE["data"] = CaseStudyData(disclosures=disclosures, returns=returns)
+    _WORKER_STATE["shm"] = shm
+
+
+
+def _run_in_worker(
+    person_key: str,
+    view_confidence: float,
+    profile: bool,
+    state: BacktestState | None = None,
+) -> CaseStudyResult:
+    return run_case_study(
+        _WORKER_STATE["app_config"],
+        person_key,
+        view_confidence=view_confidence,
+        data=_WORKER_STATE["data"],
+        profile=profile,
+        state=state,
+    )
+
+
+
+def resolve_person_keys(app_config: AppConfig, persons: list[str] | tuple[str, ...]) -> list[str]:
+    keys: list[str] = []
+    for item in persons:
+        for key in str(item).split(","):
+            key = key.strip()
+            if not key:
+                continue
+            if key == "all":
+                keys.extend(app_config.case_studies)
+            else:
+                keys.append(key)
+
+    unknown = [k for k in keys if k not in app_config.case_studies]
+    if unknown:
+        available = ", ".join(sorted(app_config.case_studies))
+        raise ValueError(f"Unknown person key(s) {', '.join(unknown)}. Available: {available}")
+
+    return list(dict.fromkeys(keys))
+
+
+
+def run_case_studies(
+    app_config: AppConfig,
+    person_keys: list[str],
+    view_confidence: float = 0.65,
+    workers: int = 1,
+    data: CaseStudyData | None = None,
+    profile: bool = False,
+    states: Mapping[str, BacktestState] | None = None,
+) -> dict[str, CaseStudyResult]:
+    # The shared load is profiled once and its report merged into every case study's.
+    load_report = None
+    if data is None:
+        load_profiler = Profiler() if profile else NULL_PROFILER
+        with load_profiler.stage("load_data"):
+            data = load_case_study_data(app_config, person_keys, load_profiler)
+        load_report = load_profiler.report() if profile else None
+    states = states or {}
+
+    if workers <= 1 or len(person_keys) <= 1:
+        results = {
+            key: run_case_study(
+                app_config, key, view_confidence=view_confidence, data=data, profile=profile, state=states.get(key)
+            )
+            for key in person_keys
+        }
+    else:
+        # Workers read the return matrix from shared memory instead of unpickling a copy each.
+        with SharedFrame(data.returns) as shared_returns:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(person_keys)),
+                initializer=_init_worker,
+                initargs=(app_config, data.disclosures, shared_returns.spec),
+            ) as pool:
+                futures = {
+                    key: pool.submit(_run_in_worker, key, view_confidence, profile, states.get(key))
+                    for key in person_keys
+                }
+                results = {key: future.result() for key, future in futures.items()}
+
+    if load_report is not None:
+        for result in results.values():
+            result.profile = merge_reports(load_report, result.profile)
+    return results
+
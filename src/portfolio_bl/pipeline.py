@@ -1,21 +1,47 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from itertools import product
+from typing import Any, Callable, Sequence
 
 import numpy as np
 import pandas as pd
 
-from portfolio_bl.backtest.engine import BacktestResult, rolling_backtest
-from portfolio_bl.backtest.metrics import infer_periods_per_year, summarize_strategy
-from portfolio_bl.config import AppConfig
-from portfolio_bl.data.disclosures import latest_portfolio_for_aliases, load_disclosures_csv
-from portfolio_bl.data.prices import load_prices_csv, monthly_rebalance_dates, to_return_matrix
+from portfolio_bl.backtest.engine import (
+    BacktestResult,
+    BacktestState,
+    StrategyFn,
+    TransactionCosts,
+    multi_strategy_backtest,
+)
+from portfolio_bl.backtest.memo import WeightMemo, memoize_strategy, memoize_window_stats, window_fingerprint
+from portfolio_bl.backtest.metrics import infer_periods_per_year, summarize_strategies
+from portfolio_bl.config import AppConfig, BacktestConfig
+from portfolio_bl.data.cache import PriceCache
+from portfolio_bl.data.disclosures import DisclosureIndex, latest_portfolio_for_aliases, load_disclosures_csv
+from portfolio_bl.data.prices import (
+    close_matrix_to_returns,
+    load_close_matrix_chunked,
+    load_prices_csv,
+    monthly_rebalance_dates,
+    to_return_matrix,
+)
 from portfolio_bl.models.black_litterman import (
+    EquilibriumCache,
+    black_litterman_batch,
     black_litterman_posterior,
     diagonal_omega_from_confidence,
-    implied_equilibrium_returns,
 )
+from portfolio_bl.models.constrained import BoxMarkowitzSolver
+from portfolio_bl.models.covariance import COVARIANCE_ESTIMATORS, FactorCovariance
 from portfolio_bl.models.mean_variance import estimate_mean_cov, long_only_markowitz_weights
+from portfolio_bl.models.rolling import RollingMeanCov
+from portfolio_bl.profiling import NULL_PROFILER, NullProfiler, Profiler
+
+
+WindowStats = tuple[pd.Series, pd.DataFrame | FactorCovariance]
 
 
 @dataclass
@@ -25,31 +51,114 @@ class CaseStudyResult:
     universe: list[str]
     strategy_results: dict[str, BacktestResult]
     summary: pd.DataFrame
+    profile: dict | None = None
 
+    @property
+    def backtest_state(self) -> BacktestState | None:
+        # All strategies of a run share one state; save it to resume the run later.
+        return next(iter(self.strategy_results.values())).state
 
 
-def _constant_weight_fn(weights: pd.Series):
-    def _fn(_train: pd.DataFrame, _date: pd.Timestamp) -> pd.Series:
-        return weights
+@dataclass
+class SweepResult:
+    person_label: str
+    as_of_date: pd.Timestamp
+    universe: list[str]
+    params: pd.DataFrame
+    strategy_results: dict[str, BacktestResult]
+    summary: pd.DataFrame
+    baseline_summary: pd.DataFrame
 
-    return _fn
 
+@dataclass
+class CaseStudyData:
+    disclosures: pd.DataFrame
+    returns: pd.DataFrame
+
+
+@dataclass
+class CaseStudyInputs:
+    person_label: str
+    as_of_date: pd.Timestamp
+    universe: list[str]
+    returns: pd.DataFrame
+    market_weights: pd.Series
+    filing_weights: pd.DataFrame | None = None
+
+
+
+def _disclosed_tickers(disclosures: pd.DataFrame, app_config: AppConfig, person_keys: list[str]) -> np.ndarray:
+    aliases = {a for key in person_keys for a in app_config.case_studies[key].disclosure_aliases}
+    return disclosures.loc[disclosures["person_norm"].isin(aliases), "ticker"].unique()
+
+
+
+def load_case_study_data(
+    app_config: AppConfig,
+    person_keys: list[str] | None = None,
+    profiler: Profiler | NullProfiler = NULL_PROFILER,
+) -> CaseStudyData:
+    # Disclosures load on a background thread while prices parse here, so loading costs
+    # roughly the slower of the two. The ticker filter follows on the same thread once
+    # the disclosures are in.
+    def _load_disclosures() -> pd.DataFrame:
+        with profiler.span("load/disclosures"):
+            return load_disclosures_csv(app_config.disclosures_path)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="load") as pool:
+        disclosures_future = pool.submit(_load_disclosures)
+        tickers_future = None
+        if person_keys is not None:
+            tickers_future = pool.submit(
+                lambda: _disclosed_tickers(disclosures_future.result(), app_config, person_keys)
+            )
+
+        # Compact mode keeps the return matrix (and every weight history built from it) in float32.
+        dtype = np.float32 if app_config.backtest.compact else np.float64
+        if app_config.cache_dir is not None:
+            with profiler.span("load/cached_returns"):
+                returns = PriceCache(app_config.cache_dir).load_return_matrix(app_config.prices_path)
+            if tickers_future is not None:
+                # The cached matrix was built on the full calendar, so selecting columns is exact.
+                returns = returns.loc[:, returns.columns.isin(tickers_future.result())].dropna(how="all")
+            if (returns.dtypes != dtype).any():
+                returns = returns.astype(dtype)
+        elif app_config.price_chunksize is not None:
+            # Stream the price file and keep only tickers the requested case studies ever disclosed.
+            with profiler.span("load/prices_chunked"):
+                close = load_close_matrix_chunked(app_config.prices_path, tickers_future, app_config.price_chunksize)
+            with profiler.span("load/returns"):
+                returns = close_matrix_to_returns(close, dtype=dtype)
+        else:
+            with profiler.span("load/prices_csv"):
+                prices = load_prices_csv(app_config.prices_path)
+            # Other people's tickers never reach a universe, so they are not pivoted.
+            tickers = None if tickers_future is None else tickers_future.result()
+            with profiler.span("load/returns"):
+                returns = to_return_matrix(prices, dtype=dtype, tickers=tickers)
 
+        disclosures = disclosures_future.result()
+    return CaseStudyData(disclosures=disclosures, returns=returns)
 
-def run_case_study(app_config: AppConfig, person_key: str, view_confidence: float = 0.65) -> CaseStudyResult:
+
+
+def prepare_case_study(
+    app_config: AppConfig,
+    person_key: str,
+    data: CaseStudyData | None = None,
+) -> CaseStudyInputs:
     if person_key not in app_config.case_studies:
         keys = ", ".join(sorted(app_config.case_studies))
         raise ValueError(f"Unknown person key '{person_key}'. Available: {keys}")
 
     case_cfg = app_config.case_studies[person_key]
+    if data is None:
+        data = load_case_study_data(app_config, [person_key])
 
-    disclosures = load_disclosures_csv(app_config.disclosures_path)
     latest_disclosed, as_of_date = latest_portfolio_for_aliases(
-        disclosures, case_cfg.disclosure_aliases
+        data.disclosures, case_cfg.disclosure_aliases
     )
-
-    prices = load_prices_csv(app_config.prices_path)
-    returns = to_return_matrix(prices)
+    returns = data.returns
 
     universe = sorted(set(latest_disclosed["ticker"]).intersection(returns.columns))
     if len(universe) < 2:
@@ -59,72 +168,419 @@ def run_case_study(app_config: AppConfig, person_key: str, view_confidence: floa
     market_weights = latest_disclosed.set_index("ticker")["weight"].reindex(universe).fillna(0.0)
     market_weights = market_weights / market_weights.sum()
 
-    rebalance_dates = monthly_rebalance_dates(
-        returns.index, frequency=app_config.backtest.rebalance_frequency
+    # Every filing of this person, aligned to the universe, for point-in-time equilibrium weights.
+    disclosure_index = DisclosureIndex(data.disclosures)
+    filing_dates = disclosure_index.filing_dates(case_cfg.disclosure_aliases)
+    filing_weights, _ = disclosure_index.weight_schedule(case_cfg.disclosure_aliases, filing_dates, universe)
+
+    return CaseStudyInputs(
+        person_label=case_cfg.person_label,
+        as_of_date=as_of_date,
+        universe=universe,
+        returns=returns,
+        market_weights=market_weights,
+        filing_weights=pd.DataFrame(filing_weights, index=filing_dates, columns=universe),
     )
-    lookback = app_config.backtest.lookback_periods
 
-    def mvo_fn(train_returns: pd.DataFrame, _date: pd.Timestamp) -> pd.Series:
-        mu, cov = estimate_mean_cov(train_returns)
-        return long_only_markowitz_weights(mu, cov)
 
-    def bl_fn(train_returns: pd.DataFrame, _date: pd.Timestamp) -> pd.Series:
-        mu, cov = estimate_mean_cov(train_returns)
 
-        pi = implied_equilibrium_returns(
-            covariance=cov,
-            market_weights=market_weights,
-            risk_aversion=app_config.backtest.risk_aversion,
+def transaction_costs(backtest_config: BacktestConfig) -> TransactionCosts | None:
+    # Costs imply drifting holdings; without them the engine keeps its fixed-weight fast path.
+    if backtest_config.track_drift or backtest_config.proportional_cost or backtest_config.fixed_cost:
+        return TransactionCosts(proportional=backtest_config.proportional_cost, fixed=backtest_config.fixed_cost)
+    return None
+
+
+
+def resume_key(backtest_config: BacktestConfig, inputs: CaseStudyInputs, view_confidence: float) -> str:
+    # Everything besides the return rows that shapes a case study's weights; a saved
+    # backtest state is only reused while this is unchanged.
+    digest = hashlib.blake2b(digest_size=16)
+    market_key = tuple(inputs.market_weights.round(12).items())
+    digest.update(repr((backtest_config, float(view_confidence), inputs.universe, market_key)).encode("utf-8"))
+    if inputs.filing_weights is not None:
+        digest.update(window_fingerprint(inputs.filing_weights).encode("utf-8"))
+    return digest.hexdigest()
+
+
+
+def window_stats_function(
+    returns: pd.DataFrame,
+    backtest_config: BacktestConfig,
+    memo: WeightMemo | None = None,
+) -> Callable[[pd.DataFrame], WindowStats]:
+    method = backtest_config.covariance_estimator
+    if method not in COVARIANCE_ESTIMATORS:
+        raise ValueError(f"Unknown covariance_estimator '{method}'. Use one of: {', '.join(COVARIANCE_ESTIMATORS)}.")
+
+    if method == "sample":
+        # The sample estimate is updated incrementally as the window slides.
+        stats_fn: Callable[[pd.DataFrame], WindowStats] = RollingMeanCov(returns)
+        stats_id = "sample_mean_cov"
+    else:
+        def stats_fn(train: pd.DataFrame) -> WindowStats:
+            return estimate_mean_cov(
+                train,
+                method=method,
+                halflife=backtest_config.ewma_halflife,
+                n_factors=backtest_config.n_factors,
+            )
+
+        stats_id = f"{method}_mean_cov:{backtest_config.ewma_halflife}:{backtest_config.n_factors}"
+
+    if memo is not None:
+        return memoize_window_stats(stats_fn, stats_id, memo)
+    return stats_fn
+
+
+
+def _equilibrium_weights_fn(
+    market_weights: pd.Series,
+    backtest_config: BacktestConfig,
+    filing_weights: pd.DataFrame | None,
+) -> Callable[[pd.Timestamp], np.ndarray]:
+    latest = market_weights.to_numpy(dtype=float)
+    if backtest_config.equilibrium_weights == "latest":
+        return lambda _date: latest
+    if backtest_config.equilibrium_weights != "point_in_time":
+        raise ValueError(
+            f"Unknown equilibrium_weights '{backtest_config.equilibrium_weights}'. Use 'latest' or 'point_in_time'."
         )
+    if filing_weights is None:
+        raise ValueError("Point-in-time equilibrium weights need the dated filing weights.")
+
+    dates = filing_weights.index
+    rows = filing_weights.reindex(columns=market_weights.index, fill_value=0.0).to_numpy(dtype=float)
+    equal = np.full(len(latest), 1.0 / len(latest))
 
-        p = np.eye(len(universe), dtype=float)
+    def _fn(date: pd.Timestamp) -> np.ndarray:
+        # The filing known at the rebalance; before the first one, fall back to equal weights.
+        i = int(dates.searchsorted(date, side="right")) - 1
+        if i < 0 or rows[i].sum() <= 0:
+            return equal
+        return rows[i]
+
+    return _fn
+
+
+
+def _constant_weight_fn(weights: pd.Series) -> StrategyFn:
+    def _fn(_train: pd.DataFrame, _date: pd.Timestamp, _stats: WindowStats) -> pd.Series:
+        return weights
+
+    return _fn
+
+
+
+def _markowitz_optimizer(
+    backtest_config: BacktestConfig,
+) -> Callable[[pd.Series, pd.DataFrame | FactorCovariance], pd.Series]:
+    if backtest_config.markowitz_solver == "clip":
+        return long_only_markowitz_weights
+    if backtest_config.markowitz_solver == "active_set":
+        # Stateful: each call warm-starts from the weights of the previous rebalance.
+        return BoxMarkowitzSolver(
+            risk_aversion=backtest_config.risk_aversion,
+            upper=backtest_config.max_weight,
+        )
+    raise ValueError(
+        f"Unknown markowitz_solver '{backtest_config.markowitz_solver}'. Use 'clip' or 'active_set'."
+    )
+
+
+
+def build_strategies(
+    universe: list[str],
+    market_weights: pd.Series,
+    backtest_config: BacktestConfig,
+    view_confidence: float = 0.65,
+    memo: WeightMemo | None = None,
+    filing_weights: pd.DataFrame | None = None,
+    profiler: Profiler | NullProfiler = NULL_PROFILER,
+) -> dict[str, StrategyFn]:
+    mvo_optimizer = _markowitz_optimizer(backtest_config)
+    bl_optimizer = _markowitz_optimizer(backtest_config)
+    equilibrium_weights = _equilibrium_weights_fn(market_weights, backtest_config, filing_weights)
+    equilibrium = EquilibriumCache(backtest_config.risk_aversion)
+
+    def mvo_fn(_train: pd.DataFrame, _date: pd.Timestamp, stats: WindowStats) -> pd.Series:
+        mu, cov = stats
+        profiler.count("solves/markowitz")
+        with profiler.span("solve/markowitz"):
+            return mvo_optimizer(mu, cov)
+
+    def bl_fn(_train: pd.DataFrame, date: pd.Timestamp, stats: WindowStats) -> pd.Series:
+        mu, cov = stats
+
+        pi = equilibrium(cov, equilibrium_weights(date))
+
+        # Absolute views on every asset (P = I); factor covariances stay in factored form.
+        sigma = cov if isinstance(cov, FactorCovariance) else cov.to_numpy(dtype=float)
         q = mu.to_numpy(dtype=float)
         omega = diagonal_omega_from_confidence(
-            covariance=cov.to_numpy(dtype=float),
-            p_matrix=p,
-            tau=app_config.backtest.tau,
+            covariance=sigma,
+            p_matrix=None,
+            tau=backtest_config.tau,
             confidence=view_confidence,
+            as_vector=True,
         )
 
-        posterior_mu, posterior_cov = black_litterman_posterior(
-            pi=pi,
-            covariance=cov.to_numpy(dtype=float),
-            p_matrix=p,
-            q_views=q,
-            tau=app_config.backtest.tau,
-            omega=omega,
-        )
+        profiler.count("solves/black_litterman_posterior")
+        with profiler.span("solve/black_litterman_posterior"):
+            posterior_mu, posterior_cov = black_litterman_posterior(
+                pi=pi,
+                covariance=sigma,
+                p_matrix=None,
+                q_views=q,
+                tau=backtest_config.tau,
+                omega=omega,
+                solver="cholesky",
+            )
 
         posterior_mu_s = pd.Series(posterior_mu, index=universe)
-        posterior_cov_df = pd.DataFrame(posterior_cov, index=universe, columns=universe)
-        return long_only_markowitz_weights(posterior_mu_s, posterior_cov_df)
+        if not isinstance(posterior_cov, FactorCovariance):
+            posterior_cov = pd.DataFrame(posterior_cov, index=universe, columns=universe)
+        profiler.count("solves/markowitz")
+        with profiler.span("solve/markowitz"):
+            return bl_optimizer(posterior_mu_s, posterior_cov)
 
-    disclosed_fn = _constant_weight_fn(market_weights)
+    strategies = {
+        "disclosed": _constant_weight_fn(market_weights),
+        "mean_variance": mvo_fn,
+        "black_litterman": bl_fn,
+    }
+    if memo is None:
+        return strategies
 
-    strategy_results: dict[str, BacktestResult] = {
-        "disclosed": rolling_backtest(returns, rebalance_dates, lookback, disclosed_fn),
-        "mean_variance": rolling_backtest(returns, rebalance_dates, lookback, mvo_fn),
-        "black_litterman": rolling_backtest(returns, rebalance_dates, lookback, bl_fn),
+    # Memo keys carry every input besides the window that changes a strategy's weights.
+    market_key = tuple(market_weights.round(12).items())
+    equilibrium_key: tuple = (backtest_config.equilibrium_weights,)
+    if backtest_config.equilibrium_weights == "point_in_time":
+        equilibrium_key += (window_fingerprint(filing_weights),)
+    solver_key = (
+        backtest_config.markowitz_solver,
+        backtest_config.risk_aversion,
+        backtest_config.max_weight,
+        backtest_config.covariance_estimator,
+        backtest_config.ewma_halflife,
+        backtest_config.n_factors,
+    )
+    params = {
+        "disclosed": market_key,
+        "mean_variance": solver_key,
+        "black_litterman": solver_key + (backtest_config.tau, float(view_confidence), market_key) + equilibrium_key,
     }
+    return {name: memoize_strategy(fn, name, params[name], memo) for name, fn in strategies.items()}
+
+
+
+def sweep_grid(
+    backtest_config: BacktestConfig,
+    view_confidences: Sequence[float],
+    taus: Sequence[float] | None = None,
+    risk_aversions: Sequence[float] | None = None,
+) -> pd.DataFrame:
+    # Every combination of the BL-only parameters; unswept ones keep their configured value.
+    taus = [backtest_config.tau] if taus is None else taus
+    risk_aversions = [backtest_config.risk_aversion] if risk_aversions is None else risk_aversions
+    rows = list(product(taus, view_confidences, risk_aversions))
+    if not rows:
+        raise ValueError("Sweep grid is empty.")
+    return pd.DataFrame(rows, columns=["tau", "confidence", "risk_aversion"], dtype=float)
 
-    periods_per_year = infer_periods_per_year(returns.index)
-    summary = pd.DataFrame(
-        {
-            name: summarize_strategy(
-                result.returns,
-                result.weight_history,
-                periods_per_year=periods_per_year,
+
+
+def _black_litterman_sweep_strategies(
+    universe: list[str],
+    market_weights: pd.Series,
+    backtest_config: BacktestConfig,
+    grid: pd.DataFrame,
+    filing_weights: pd.DataFrame | None = None,
+    profiler: Profiler | NullProfiler = NULL_PROFILER,
+) -> dict[str, StrategyFn]:
+    equilibrium_weights = _equilibrium_weights_fn(market_weights, backtest_config, filing_weights)
+    optimizers = None
+    if backtest_config.markowitz_solver != "clip":
+        # Stateful solvers warm-start per grid point, each with that point's risk aversion.
+        optimizers = [
+            _markowitz_optimizer(replace(backtest_config, risk_aversion=float(delta)))
+            for delta in grid["risk_aversion"]
+        ]
+    taus, confidences, deltas = (grid[c].to_numpy(dtype=float) for c in ("tau", "confidence", "risk_aversion"))
+    current: dict[str, Any] = {"date": None, "weights": None}
+
+    def _grid_weights(date: pd.Timestamp, stats: WindowStats) -> np.ndarray:
+        # The first grid strategy at a rebalance solves the whole grid; the rest read its rows.
+        if current["date"] == date:
+            return current["weights"]
+
+        mu, cov = stats
+        profiler.count("solves/black_litterman_batch")
+        with profiler.span("solve/black_litterman_batch"):
+            # omega_ridge matches the default ridge of black_litterman_posterior in run_case_study.
+            batch = black_litterman_batch(
+                covariance=cov.to_numpy(dtype=float),
+                market_weights=equilibrium_weights(date),
+                p_matrix=None,
+                q_views=mu.to_numpy(dtype=float),
+                tau=taus,
+                confidence=confidences,
+                risk_aversion=deltas,
+                return_weights=optimizers is None,
+                omega_ridge=1e-6,
             )
-            for name, result in strategy_results.items()
-        }
-    ).T
+        weights = batch.weights
+        if optimizers is not None:
+            with profiler.span("solve/markowitz"):
+                weights = np.vstack(
+                    [
+                        optimizer(
+                            pd.Series(batch.posterior_means[g], index=universe),
+                            pd.DataFrame(batch.posterior_covariances[g], index=universe, columns=universe),
+                        ).to_numpy(dtype=float)
+                        for g, optimizer in enumerate(optimizers)
+                    ]
+                )
+        current.update(date=date, weights=weights)
+        return weights
+
+    def _grid_strategy(g: int) -> StrategyFn:
+        def _fn(_train: pd.DataFrame, date: pd.Timestamp, stats: WindowStats) -> pd.Series:
+            return pd.Series(_grid_weights(date, stats)[g], index=universe)
 
-    summary.index.name = "strategy"
+        return _fn
+
+    return {f"black_litterman/{g}": _grid_strategy(g) for g in range(len(grid))}
+
+
+
+def run_confidence_sweep(
+    app_config: AppConfig,
+    person_key: str,
+    view_confidences: Sequence[float],
+    taus: Sequence[float] | None = None,
+    risk_aversions: Sequence[float] | None = None,
+    data: CaseStudyData | None = None,
+    memo: WeightMemo | None = None,
+) -> SweepResult:
+    if data is None and person_key in app_config.case_studies:
+        data = load_case_study_data(app_config, [person_key])
+
+    inputs = prepare_case_study(app_config, person_key, data)
+    returns = inputs.returns
+    backtest_config = app_config.backtest
+    grid = sweep_grid(backtest_config, view_confidences, taus, risk_aversions)
+
+    # Data, window statistics and the non-BL strategies are computed once for the whole grid.
+    baseline = build_strategies(
+        inputs.universe,
+        inputs.market_weights,
+        backtest_config,
+        memo=memo,
+        filing_weights=inputs.filing_weights,
+    )
+    strategies = {
+        "disclosed": baseline["disclosed"],
+        "mean_variance": baseline["mean_variance"],
+        **_black_litterman_sweep_strategies(
+            inputs.universe,
+            inputs.market_weights,
+            backtest_config,
+            grid,
+            filing_weights=inputs.filing_weights,
+        ),
+    }
+    strategy_results = multi_strategy_backtest(
+        returns,
+        monthly_rebalance_dates(returns.index, frequency=backtest_config.rebalance_frequency),
+        backtest_config.lookback_periods,
+        strategies=strategies,
+        window_stats_fn=window_stats_function(returns, backtest_config, memo),
+        costs=transaction_costs(backtest_config),
+    )
+
+    summary = summarize_strategies(
+        pd.DataFrame({name: result.returns for name, result in strategy_results.items()}),
+        {name: result.weight_history for name, result in strategy_results.items()},
+        periods_per_year=infer_periods_per_year(returns.index),
+        turnovers={name: result.turnover for name, result in strategy_results.items()},
+    )
+    grid_names = [f"black_litterman/{g}" for g in range(len(grid))]
+    return SweepResult(
+        person_label=inputs.person_label,
+        as_of_date=inputs.as_of_date,
+        universe=inputs.universe,
+        params=grid,
+        strategy_results=strategy_results,
+        summary=summary.loc[grid_names].set_axis(pd.MultiIndex.from_frame(grid), axis=0),
+        baseline_summary=summary.loc[["disclosed", "mean_variance"]],
+    )
+
+
+
+def run_case_study(
+    app_config: AppConfig,
+    person_key: str,
+    view_confidence: float = 0.65,
+    data: CaseStudyData | None = None,
+    memo: WeightMemo | None = None,
+    profile: bool = False,
+    state: BacktestState | None = None,
+) -> CaseStudyResult:
+    profiler = Profiler() if profile else NULL_PROFILER
+
+    if data is None and person_key in app_config.case_studies:
+        with profiler.stage("load_data"):
+            data = load_case_study_data(app_config, [person_key], profiler)
+
+    with profiler.stage("prepare"):
+        inputs = prepare_case_study(app_config, person_key, data)
+        returns = inputs.returns
+        universe = inputs.universe
+        market_weights = inputs.market_weights
+
+        rebalance_dates = monthly_rebalance_dates(
+            returns.index, frequency=app_config.backtest.rebalance_frequency
+        )
+
+    with profiler.stage("backtest"):
+        # The MVO and BL strategies share one mean/covariance estimate per training window.
+        window_stats_fn = window_stats_function(returns, app_config.backtest, memo)
+
+        strategy_results = multi_strategy_backtest(
+            returns,
+            rebalance_dates,
+            app_config.backtest.lookback_periods,
+            strategies=build_strategies(
+                universe,
+                market_weights,
+                app_config.backtest,
+                view_confidence,
+                memo,
+                filing_weights=inputs.filing_weights,
+                profiler=profiler,
+            ),
+            window_stats_fn=window_stats_fn,
+            costs=transaction_costs(app_config.backtest),
+            profiler=profiler,
+            state=state,
+            state_key=resume_key(app_config.backtest, inputs, view_confidence),
+        )
+
+    with profiler.stage("summary"):
+        periods_per_year = infer_periods_per_year(returns.index)
+        summary = summarize_strategies(
+            pd.DataFrame({name: result.returns for name, result in strategy_results.items()}),
+            {name: result.weight_history for name, result in strategy_results.items()},
+            periods_per_year=periods_per_year,
+            turnovers={name: result.turnover for name, result in strategy_results.items()},
+        )
 
     return CaseStudyResult(
-        person_label=case_cfg.person_label,
-        as_of_date=as_of_date,
+        person_label=inputs.person_label,
+        as_of_date=inputs.as_of_date,
         universe=universe,
         strategy_results=strategy_results,
         summary=summary,
+        profile=profiler.report() if profiler.enabled else None,
     )
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import sys
+import time
+from typing import Any, Callable
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+
+def peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+
+class _Span:
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: Profiler, name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> _Span:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._profiler._record(self._name, time.perf_counter() - self._start)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """Named timing spans, counters and peak-memory samples for one run.
+
+    Spans with the same name are aggregated (calls, total and max seconds). Peak
+    resident memory is sampled when each top-level stage closes.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.spans: dict[str, list[float]] = {}
+        self.counters: dict[str, int] = {}
+        self.memory: dict[str, int | None] = {}
+        self._created = time.perf_counter()
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def wrap(self, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def _timed(*args: Any, **kwargs: Any) -> Any:
+            with self.span(name):
+                return fn(*args, **kwargs)
+
+        return _timed
+
+    def _record(self, name: str, seconds: float) -> None:
+        stats = self.spans.get(name)
+        if stats is None:
+            self.spans[name] = [1, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "wall_seconds": time.perf_counter() - self._created,
+            "spans": {
+                name: {"calls": int(calls), "total_seconds": total, "max_seconds": longest}
+                for name, (calls, total, longest) in sorted(self.spans.items(), key=lambda kv: -kv[1][1])
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "peak_rss_bytes": self.memory,
+        }
+
+
+def merge_reports(*reports: dict[str, Any]) -> dict[str, Any]:
+    # Combines reports of consecutive parts of one run, e.g. a shared data load and a case
+    # study that used it: wall time, span totals and counters add up, stage memory is kept.
+    spans: dict[str, list[float]] = {}
+    counters: dict[str, int] = {}
+    memory: dict[str, int | None] = {}
+    wall_seconds = 0.0
+    for report in reports:
+        wall_seconds += report.get("wall_seconds", 0.0)
+        for name, stats in report.get("spans", {}).items():
+            merged = spans.setdefault(name, [0, 0.0, 0.0])
+            merged[0] += stats["calls"]
+            merged[1] += stats["total_seconds"]
+            merged[2] = max(merged[2], stats["max_seconds"])
+        for name, n in report.get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + n
+        memory.update(report.get("peak_rss_bytes", {}))
+
+    return {
+        "wall_seconds": wall_seconds,
+        "spans": {
+            name: {"calls": int(calls), "total_seconds": total, "max_seconds": longest}
+            for name, (calls, total, longest) in sorted(spans.items(), key=lambda kv: -kv[1][1])
+        },
+        "counters": dict(sorted(counters.items())),
+        "peak_rss_bytes": memory,
+    }
+
+
+
+class _Stage(_Span):
+    __slots__ = ()
+
+    def __exit__(self, *_exc: object) -> None:
+        super().__exit__()
+        self._profiler.memory[self._name] = peak_rss_bytes()
+
+
+class NullProfiler:
+    """Drop-in for ``Profiler`` whose methods do nothing, for runs without profiling."""
+
+    enabled = False
+
+    def span(self, _name: str) -> _NullSpan:
+        return _NULL_SPAN
+
+    def stage(self, _name: str) -> _NullSpan:
+        return _NULL_SPAN
+
+    def count(self, _name: str, _n: int = 1) -> None:
+        return None
+
+    def wrap(self, _name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        return fn
+
+    def report(self) -> dict[str, Any]:
+        return {}
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.backtest.engine import BacktestResult
+from portfolio_bl.pipeline import CaseStudyResult
+
+
+STORE_FORMAT_VERSION = 1
+RESULT_FILE = "result.npz"
+
+_SERIES_FIELDS = ("returns", "nav", "turnover", "costs")
+
+
+
+def _put_index(arrays: dict[str, np.ndarray], key: str, index: pd.Index) -> dict:
+    # Dates stay datetime64; any other labels are stored as text so loading never needs pickle.
+    if isinstance(index, pd.DatetimeIndex):
+        arrays[key] = index.to_numpy()
+        return {"name": index.name, "kind": "datetime"}
+    arrays[key] = np.asarray(index.astype(str), dtype=str)
+    return {"name": index.name, "kind": "text"}
+
+
+
+def _get_index(arrays: Mapping[str, np.ndarray], key: str, layout: dict) -> pd.Index:
+    if layout["kind"] == "datetime":
+        return pd.DatetimeIndex(arrays[key], name=layout["name"])
+    return pd.Index(arrays[key].tolist(), name=layout["name"])
+
+
+
+def _put_series(arrays: dict[str, np.ndarray], key: str, series: pd.Series) -> dict:
+    arrays[f"{key}.values"] = series.to_numpy()
+    return {"name": series.name, "index": _put_index(arrays, f"{key}.index", series.index)}
+
+
+
+def _get_series(arrays: Mapping[str, np.ndarray], key: str, layout: dict) -> pd.Series:
+    index = _get_index(arrays, f"{key}.index", layout["index"])
+    return pd.Series(arrays[f"{key}.values"], index=index, name=layout["name"], copy=False)
+
+
+
+def _put_frame(arrays: dict[str, np.ndarray], key: str, frame: pd.DataFrame) -> dict:
+    # Frames here are homogeneous (weights or summary metrics), so one block keeps its dtype.
+    arrays[f"{key}.values"] = np.ascontiguousarray(frame.to_numpy())
+    return {
+        "index": _put_index(arrays, f"{key}.index", frame.index),
+        "columns": _put_index(arrays, f"{key}.columns", frame.columns),
+    }
+
+
+
+def _get_frame(arrays: Mapping[str, np.ndarray], key: str, layout: dict) -> pd.DataFrame:
+    return pd.DataFrame(
+        arrays[f"{key}.values"],
+        index=_get_index(arrays, f"{key}.index", layout["index"]),
+        columns=_get_index(arrays, f"{key}.columns", layout["columns"]),
+        copy=False,
+    )
+
+
+
+class LazyStrategyResults(Mapping[str, BacktestResult]):
+    """Strategy results read from a result store on first access."""
+
+    def __init__(self, arrays: Mapping[str, np.ndarray], layouts: dict[str, dict]) -> None:
+        self._arrays = arrays
+        self._layouts = layouts
+        self._loaded: dict[str, BacktestResult] = {}
+
+    def __getitem__(self, name: str) -> BacktestResult:
+        if name not in self._loaded:
+            layout = self._layouts[name]
+            key = layout["key"]
+            series = {
+                field: _get_series(self._arrays, f"{key}.{field}", layout[field]) if field in layout else None
+                for field in _SERIES_FIELDS
+            }
+            self._loaded[name] = BacktestResult(
+                weight_history=_get_frame(self._arrays, f"{key}.weights", layout["weights"]),
+                **series,
+            )
+        return self._loaded[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layouts)
+
+    def __len__(self) -> int:
+        return len(self._layouts)
+
+
+
+def save_case_study(result: CaseStudyResult, path: str | Path, compress: bool = True) -> Path:
+    path = Path(path)
+    arrays: dict[str, np.ndarray] = {}
+    strategies = {}
+    for j, (name, strategy) in enumerate(result.strategy_results.items()):
+        key = f"s{j}"
+        layout = {"key": key, "weights": _put_frame(arrays, f"{key}.weights", strategy.weight_history)}
+        for field in _SERIES_FIELDS:
+            series = getattr(strategy, field)
+            if series is not None:
+                layout[field] = _put_series(arrays, f"{key}.{field}", series)
+        strategies[name] = layout
+
+    # Resume state is saved separately (backtest_state.pkl); only what the outputs need goes here.
+    metadata = {
+        "version": STORE_FORMAT_VERSION,
+        "person_label": result.person_label,
+        "as_of_date": result.as_of_date.isoformat(),
+        "universe": list(result.universe),
+        "summary": _put_frame(arrays, "summary", result.summary),
+        "strategies": strategies,
+        "profile": result.profile,
+    }
+    arrays["metadata"] = np.array(json.dumps(metadata))
+
+    # Write beside the target and swap it in, so readers never see a half-written file.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("wb") as f:
+        (np.savez_compressed if compress else np.savez)(f, **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+
+
+def load_case_study(path: str | Path) -> CaseStudyResult:
+    # Arrays are decompressed on access, so reading the summary never touches the weight histories.
+    arrays = np.load(Path(path), allow_pickle=False)
+    metadata = json.loads(arrays["metadata"].item())
+    if metadata.get("version") != STORE_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported result store version {metadata.get('version')} in {path}; "
+            f"expected {STORE_FORMAT_VERSION}."
+        )
+
+    return CaseStudyResult(
+        person_label=metadata["person_label"],
+        as_of_date=pd.Timestamp(metadata["as_of_date"]),
+        universe=metadata["universe"],
+        strategy_results=LazyStrategyResults(arrays, metadata["strategies"]),
+        summary=_get_frame(arrays, "summary", metadata["summary"]),
+        profile=metadata["profile"],
+    )
@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import Any, Callable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.backtest.engine import BacktestResult, multi_strategy_backtest
+from portfolio_bl.backtest.memo import WeightMemo
+from portfolio_bl.backtest.metrics import infer_periods_per_year, summarize_strategies
+from portfolio_bl.config import AppConfig, BacktestConfig
+from portfolio_bl.data.prices import monthly_rebalance_dates
+from portfolio_bl.parallel import SharedFrame, SharedFrameSpec, attach_shared_frame
+from portfolio_bl.pipeline import (
+    CaseStudyData,
+    CaseStudyInputs,
+    WindowStats,
+    build_strategies,
+    prepare_case_study,
+    transaction_costs,
+    window_stats_function,
+)
+
+
+@dataclass
+class TuningResult:
+    results: pd.DataFrame
+    best: pd.DataFrame
+
+
+
+def _check_space(space: Mapping[str, Sequence[Any]]) -> None:
+    known = {f.name for f in fields(BacktestConfig)}
+    unknown = sorted(set(space) - known)
+    if unknown:
+        raise ValueError(f"Unknown BacktestConfig field(s): {', '.join(unknown)}")
+
+
+
+def _parse_bool(text: str) -> bool:
+    value = text.strip().lower()
+    if value in {"1", "true", "yes"}:
+        return True
+    if value in {"0", "false", "no"}:
+        return False
+    raise ValueError(f"Expected a boolean (true/false, yes/no, 1/0), got '{text}'.")
+
+
+
+def parse_search_space(items: Sequence[str]) -> dict[str, list]:
+    # FIELD=v1,v2,... strings, each value cast to the type of the BacktestConfig default.
+    types = {f.name: type(getattr(BacktestConfig(), f.name)) for f in fields(BacktestConfig)}
+    space = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        if name not in types or not values:
+            raise ValueError(f"Expected FIELD=v1,v2,... with a BacktestConfig field, got '{item}'.")
+        # bool("False") is True, so booleans are parsed from their spelling.
+        cast = _parse_bool if types[name] is bool else types[name]
+        space[name] = [cast(v) for v in values.split(",")]
+    return space
+
+
+
+def config_grid(base: BacktestConfig, space: Mapping[str, Sequence[Any]]) -> list[BacktestConfig]:
+    _check_space(space)
+    names = list(space)
+    return [replace(base, **dict(zip(names, combo))) for combo in itertools.product(*space.values())]
+
+
+
+def sample_configs(
+    base: BacktestConfig,
+    space: Mapping[str, Sequence[Any]],
+    n_samples: int,
+    seed: int = 0,
+) -> list[BacktestConfig]:
+    grid = config_grid(base, space)
+    if n_samples >= len(grid):
+        return grid
+    picks = np.random.default_rng(seed).choice(len(grid), size=n_samples, replace=False)
+    return [grid[i] for i in sorted(picks)]
+
+
+
+def walk_forward_folds(
+    index: pd.DatetimeIndex,
+    start: int,
+    n_folds: int,
+) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+    # Fold k scores the returns dated in (bounds[k], bounds[k + 1]].
+    if n_folds < 1:
+        raise ValueError(f"n_folds must be at least 1, got {n_folds}.")
+    last = len(index) - 1
+    if last - start < n_folds:
+        raise ValueError(f"Not enough out-of-sample periods for {n_folds} folds.")
+    cuts = np.linspace(start, last, n_folds + 1).round().astype(int)
+    return [(index[a], index[b]) for a, b in zip(cuts[:-1], cuts[1:])]
+
+
+
+class _FoldEvaluator:
+    # Runs groups of configurations that share a lookback, rebalance schedule, cost model and
+    # covariance estimator in one backtest, so every training window is summarized once.
+
+    def __init__(self, inputs: CaseStudyInputs, view_confidence: float, memo: WeightMemo) -> None:
+        self.inputs = inputs
+        self.view_confidence = view_confidence
+        self.memo = memo
+        self.periods_per_year = infer_periods_per_year(inputs.returns.index)
+        self._stats_fns: dict[tuple, Callable[[pd.DataFrame], WindowStats]] = {}
+
+    def window_stats_fn(self, config: BacktestConfig) -> Callable[[pd.DataFrame], WindowStats]:
+        key = _estimator_key(config)
+        if key not in self._stats_fns:
+            self._stats_fns[key] = window_stats_function(self.inputs.returns, config, self.memo)
+        return self._stats_fns[key]
+
+    def evaluate(
+        self,
+        configs: list[tuple[int, BacktestConfig]],
+        fold_start: pd.Timestamp,
+        fold_end: pd.Timestamp,
+    ) -> pd.DataFrame:
+        lookback = configs[0][1].lookback_periods
+        index = self.inputs.returns.index
+        returns = self.inputs.returns.loc[:fold_end]
+        # The full-sample schedule, cut at the fold end: scheduling on the truncated index would
+        # add a rebalance at a fold end that falls mid-period, which a full run never makes.
+        schedule = monthly_rebalance_dates(index, frequency=configs[0][1].rebalance_frequency)
+        eligible = schedule[[index.get_loc(d) >= lookback for d in schedule]]
+        eligible = eligible[eligible <= fold_end]
+        # Start from the last rebalance at or before the fold so its opening holdings match a full run.
+        schedule = eligible[eligible >= eligible[eligible <= fold_start][-1]]
+
+        strategies = {}
+        for config_id, config in configs:
+            built = build_strategies(
+                self.inputs.universe,
+                self.inputs.market_weights,
+                config,
+                self.view_confidence,
+                self.memo,
+                filing_weights=self.inputs.filing_weights,
+            )
+            strategies.update({f"{config_id}/{name}": fn for name, fn in built.items()})
+
+        results = multi_strategy_backtest(
+            returns,
+            schedule,
+            lookback,
+            strategies=strategies,
+            window_stats_fn=self.window_stats_fn(configs[0][1]),
+            costs=transaction_costs(configs[0][1]),
+        )
+        # Returns, weights and turnover are all scored on the dates inside (fold_start, fold_end];
+        # the opening rebalance only sets the holdings the fold starts from.
+        summary = summarize_strategies(
+            pd.DataFrame({key: result.returns[result.returns.index > fold_start] for key, result in results.items()}),
+            {key: result.weight_history[result.weight_history.index > fold_start] for key, result in results.items()},
+            periods_per_year=self.periods_per_year,
+            turnovers={key: _fold_turnover(result, fold_start) for key, result in results.items()},
+        )
+        keys = summary.index.str.split("/", n=1)
+        summary.insert(0, "config_id", [int(key[0]) for key in keys])
+        summary.index = pd.Index([key[1] for key in keys], name="strategy")
+        return summary.reset_index()
+
+
+
+def _fold_turnover(result: BacktestResult, fold_start: pd.Timestamp) -> pd.Series:
+    # Trades at the rebalances inside the fold, each measured against the holdings before it,
+    # so the first one in the fold still counts. Target weights stand in without a cost model.
+    turnover = result.turnover
+    if turnover is None:
+        turnover = result.weight_history.diff().abs().sum(axis=1).iloc[1:] / 2.0
+    return turnover[turnover.index > fold_start]
+
+
+_WORKER_STATE: dict[str, Any] = {}
+
+
+
+def _init_worker(
+    inputs: CaseStudyInputs,
+    returns_spec: SharedFrameSpec,
+    view_confidence: float,
+    memo_dir: Path | None,
+) -> None:
+    returns, shm = attach_shared_frame(returns_spec)
+    inputs = replace(inputs, returns=returns)
+    _WORKER_STATE["evaluator"] = _FoldEvaluator(inputs, view_confidence, WeightMemo(disk_dir=memo_dir))
+    _WORKER_STATE["shm"] = shm
+
+
+
+def _evaluate_in_worker(
+    configs: list[tuple[int, BacktestConfig]],
+    fold_start: pd.Timestamp,
+    fold_end: pd.Timestamp,
+) -> pd.DataFrame:
+    return _WORKER_STATE["evaluator"].evaluate(configs, fold_start, fold_end)
+
+
+
+def _estimator_key(config: BacktestConfig) -> tuple:
+    return (config.covariance_estimator, config.ewma_halflife, config.n_factors)
+
+
+
+def _first_rebalance_position(index: pd.DatetimeIndex, config: BacktestConfig) -> int:
+    for date in monthly_rebalance_dates(index, frequency=config.rebalance_frequency):
+        position = index.get_loc(date)
+        if position >= config.lookback_periods:
+            return position
+    raise ValueError(f"No rebalance date has enough lookback observations for {config}.")
+
+
+
+def _fold_tasks(configs: Mapping[int, BacktestConfig], workers: int) -> list[list[tuple[int, BacktestConfig]]]:
+    groups: dict[tuple, list[tuple[int, BacktestConfig]]] = {}
+    for config_id, config in configs.items():
+        key = (
+            config.lookback_periods,
+            config.rebalance_frequency,
+            transaction_costs(config),
+            _estimator_key(config),
+        )
+        groups.setdefault(key, []).append((config_id, config))
+
+    # Enough chunks to keep every worker busy; each chunk still shares its window statistics.
+    chunk = max(1, math.ceil(len(configs) / max(workers, 1)))
+    return [members[i : i + chunk] for members in groups.values() for i in range(0, len(members), chunk)]
+
+
+
+def walk_forward_search(
+    app_config: AppConfig,
+    person_key: str,
+    configs: Sequence[BacktestConfig],
+    n_folds: int = 4,
+    objective: str = "sharpe",
+    objective_strategy: str = "black_litterman",
+    view_confidence: float = 0.65,
+    prune_margin: float | None = None,
+    workers: int = 1,
+    data: CaseStudyData | None = None,
+    memo_dir: str | Path | None = None,
+) -> TuningResult:
+    if not configs:
+        raise ValueError("At least one configuration is required.")
+
+    inputs = prepare_case_study(app_config, person_key, data)
+    index = inputs.returns.index
+    # Folds begin once every configuration has a full first training window.
+    start = max(_first_rebalance_position(index, config) for config in configs)
+    folds = walk_forward_folds(index, start, n_folds)
+
+    alive = dict(enumerate(configs))
+    memo_dir = Path(memo_dir) if memo_dir is not None else None
+    frames = []
+    scores: dict[int, list[float]] = {config_id: [] for config_id in alive}
+
+    shared = SharedFrame(inputs.returns) if workers > 1 else None
+    pool = None
+    if shared is not None:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(replace(inputs, returns=inputs.returns.iloc[:0]), shared.spec, view_confidence, memo_dir),
+        )
+    evaluator = None if pool is not None else _FoldEvaluator(inputs, view_confidence, WeightMemo(disk_dir=memo_dir))
+
+    try:
+        for fold, (fold_start, fold_end) in enumerate(folds):
+            tasks = _fold_tasks(alive, workers)
+            if pool is not None:
+                futures = [pool.submit(_evaluate_in_worker, task, fold_start, fold_end) for task in tasks]
+                fold_frames = [future.result() for future in futures]
+            else:
+                fold_frames = [evaluator.evaluate(task, fold_start, fold_end) for task in tasks]
+
+            fold_frame = pd.concat(fold_frames, ignore_index=True)
+            fold_frame.insert(0, "fold", fold)
+            fold_frame.insert(1, "fold_start", fold_start)
+            fold_frame.insert(2, "fold_end", fold_end)
+            frames.append(fold_frame)
+
+            target = fold_frame[fold_frame["strategy"] == objective_strategy].set_index("config_id")[objective]
+            for config_id, value in target.items():
+                scores[config_id].append(float(value))
+
+            if prune_margin is not None and fold + 1 < len(folds):
+                alive = _prune(alive, scores, prune_margin)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if shared is not None:
+            shared.close()
+
+    results = pd.concat(frames, ignore_index=True)
+    params = pd.DataFrame([asdict(c) for c in configs]).rename_axis("config_id").reset_index()
+    results = params.merge(results, on="config_id")
+    results = results.sort_values(["fold", "config_id", "strategy"], kind="stable").reset_index(drop=True)
+    return TuningResult(results=results, best=_best_per_fold(results, objective, objective_strategy))
+
+
+
+def _prune(
+    alive: dict[int, BacktestConfig],
+    scores: Mapping[int, Sequence[float]],
+    margin: float,
+) -> dict[int, BacktestConfig]:
+    # Drop configurations whose mean objective so far trails the leader by more than the margin.
+    # Folds without a score are skipped; with no scored configuration at all, nothing is pruned.
+    means = {}
+    for config_id in alive:
+        values = np.asarray(scores[config_id], dtype=np.float64)
+        values = values[~np.isnan(values)]
+        means[config_id] = values.mean() if len(values) else np.nan
+    if np.isnan(list(means.values())).all():
+        return alive
+    leader = np.nanmax(list(means.values()))
+    # The leader always survives, so at least one configuration is left.
+    return {k: c for k, c in alive.items() if means[k] >= leader - margin}
+
+
+
+def _best_per_fold(results: pd.DataFrame, objective: str, objective_strategy: str) -> pd.DataFrame:
+    scored = results[results["strategy"] == objective_strategy]
+    best = scored.loc[scored.groupby("fold")[objective].idxmax().dropna().astype(int)].set_index("fold")
+
+    # Walk-forward check: how the configuration picked on fold k scores on fold k + 1.
+    lookup = scored.set_index(["fold", "config_id"])[objective]
+    best[f"next_fold_{objective}"] = [
+        lookup.get((fold + 1, config_id), np.nan) for fold, config_id in best["config_id"].items()
+    ]
+    return best
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.backtest.attribution import attribution_summary, ols_attribution, rolling_alpha_beta
+
+
+
+def _strategy_and_benchmarks(n_days: int = 300) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2022-01-03", periods=n_days)
+    benchmarks = pd.DataFrame(rng.normal(0.0004, 0.01, size=(n_days, 3)), index=dates, columns=["SPY", "XLK", "XLE"])
+    noise = rng.normal(0.0, 0.004, size=(n_days, 2))
+    strategies = pd.DataFrame(
+        {
+            "black_litterman": 0.0002 + benchmarks.to_numpy() @ [0.8, 0.3, -0.1] + noise[:, 0],
+            "disclosed": -0.0001 + benchmarks.to_numpy() @ [1.1, 0.0, 0.2] + noise[:, 1],
+        },
+        index=dates,
+    )
+    return strategies, benchmarks
+
+
+
+def test_ols_attribution_decomposes_mean_return() -> None:
+    strategies, benchmarks = _strategy_and_benchmarks()
+    result = ols_attribution(strategies["black_litterman"], benchmarks, periods_per_year=252)
+
+    assert abs(result.betas["SPY"] - 0.8) < 0.05
+    summary = result.summary
+    total = summary["alpha_annual_arithmetic"] + summary["explained_annual_arithmetic"]
+    assert np.isclose(total, summary["strategy_mean_annual_arithmetic"])
+    assert abs(summary["residual_annual_arithmetic"]) < 1e-12
+
+    batch = attribution_summary(strategies, benchmarks, periods_per_year=252)
+    assert np.isclose(batch.loc["black_litterman", "r2"], summary["r2"])
+    assert np.isclose(batch.loc["black_litterman", "beta_XLK"], result.betas["XLK"])
+
+
+
+def test_rolling_alpha_beta_matches_per_window_fits() -> None:
+    strategies, benchmarks = _strategy_and_benchmarks(n_days=120)
+    window = 40
+
+    rolling = rolling_alpha_beta(strategies, benchmarks, window=window)
+    assert rolling.shape == (120 - window + 1, 2 * 4)
+
+    y = strategies["disclosed"].to_numpy()
+    x = np.column_stack([np.ones(len(benchmarks)), benchmarks.to_numpy()])
+    for end in (window, 77, len(y)):
+        coef = np.linalg.lstsq(x[end - window : end], y[end - window : end], rcond=None)[0]
+        np.testing.assert_allclose(rolling["disclosed"].iloc[end - window].to_numpy(), coef, atol=1e-10)
+
+    single = rolling_alpha_beta(strategies["disclosed"], benchmarks[["SPY"]], window=window)
+    assert list(single.columns) == ["alpha", "SPY"]
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.backtest.engine import TransactionCosts, multi_strategy_backtest, rolling_backtest
+from portfolio_bl.data.prices import monthly_rebalance_dates
+
+
+
+def _random_returns(n_days: int = 260, tickers: tuple[str, ...] = ("AAPL", "MSFT", "XOM", "JPM")) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2023-01-02", periods=n_days)
+    values = rng.normal(0.0005, 0.01, size=(n_days, len(tickers)))
+    values[rng.random(values.shape) < 0.05] = np.nan
+    return pd.DataFrame(values, index=dates, columns=list(tickers))
+
+
+
+def _momentum_weights(train: pd.DataFrame, _date: pd.Timestamp) -> pd.Series:
+    return train.mean().clip(lower=0.0)
+
+
+
+def test_vectorized_backtest_matches_loop() -> None:
+    returns = _random_returns()
+    rebalance_dates = monthly_rebalance_dates(returns.index)
+
+    fast = rolling_backtest(returns, rebalance_dates, 20, _momentum_weights)
+    slow = rolling_backtest(returns, rebalance_dates, 20, _momentum_weights, vectorized=False)
+
+    pd.testing.assert_series_equal(fast.returns, slow.returns, rtol=1e-12)
+    pd.testing.assert_series_equal(fast.nav, slow.nav, rtol=1e-12)
+    pd.testing.assert_frame_equal(fast.weight_history, slow.weight_history)
+
+
+
+def test_multi_strategy_backtest_shares_window_stats() -> None:
+    returns = _random_returns()
+    rebalance_dates = monthly_rebalance_dates(returns.index)
+    stats_calls: list[pd.Timestamp] = []
+
+    def window_stats(train: pd.DataFrame) -> pd.Series:
+        stats_calls.append(train.index[-1])
+        return train.mean()
+
+    results = multi_strategy_backtest(
+        returns,
+        rebalance_dates,
+        20,
+        strategies={
+            "momentum": lambda _train, _date, mu: mu.clip(lower=0.0),
+            "equal": lambda train, _date, _mu: pd.Series(1.0, index=train.columns),
+        },
+        window_stats_fn=window_stats,
+    )
+
+    single = rolling_backtest(returns, rebalance_dates, 20, _momentum_weights)
+    assert set(results) == {"momentum", "equal"}
+    assert len(stats_calls) == len(single.weight_history)
+    pd.testing.assert_series_equal(results["momentum"].nav, single.nav)
+    pd.testing.assert_frame_equal(results["momentum"].weight_history, single.weight_history)
+
+
+
+def test_cost_aware_backtest_matches_per_row_drift() -> None:
+    returns = _random_returns()
+    rebalance_dates = monthly_rebalance_dates(returns.index)
+    costs = TransactionCosts(proportional=0.001, fixed=0.0005)
+
+    result = rolling_backtest(returns, rebalance_dates, 20, _momentum_weights, costs=costs)
+
+    # Per-row reference: drift the holdings, trade back to target and pay on the next period.
+    values = returns.fillna(0.0)
+    history = result.weight_history
+    holdings = None
+    expected = []
+    for i, date in enumerate(history.index):
+        target = history.iloc[i].to_numpy()
+        cost = 0.0
+        if holdings is not None:
+            traded = np.abs(target - holdings).sum()
+            cost = 0.001 * traded + 0.0005 * (traded > 1e-12)
+        holdings = target.copy()
+        stop = history.index[i + 1] if i + 1 < len(history) else values.index[-1]
+        for row in values.loc[date:stop].iloc[1:].to_numpy():
+            step = float(holdings @ row)
+            holdings = holdings * (1.0 + row) / (1.0 + step)
+            expected.append((1.0 - cost) * (1.0 + step) - 1.0)
+            cost = 0.0
+
+    np.testing.assert_allclose(result.returns.to_numpy(), expected, rtol=1e-10, atol=1e-14)
+    assert result.costs.iloc[0] == 0.0 and result.costs.sum() > 0.0
+    assert len(result.turnover) == len(history) - 1
+
+    free = rolling_backtest(returns, rebalance_dates, 20, _momentum_weights, costs=TransactionCosts())
+    assert result.nav.iloc[-1] < free.nav.iloc[-1]
+
+
+
+def test_compact_float32_backtest_tracks_float64() -> None:
+    returns = _random_returns()
+    rebalance_dates = monthly_rebalance_dates(returns.index)
+    costs = TransactionCosts(proportional=0.001)
+
+    full = rolling_backtest(returns, rebalance_dates, 20, _momentum_weights, costs=costs)
+    compact = rolling_backtest(returns.astype(np.float32), rebalance_dates, 20, _momentum_weights, costs=costs)
+
+    assert compact.weight_history.dtypes.eq(np.float32).all()
+    assert compact.returns.dtype == np.float64
+    np.testing.assert_allclose(compact.weight_history, full.weight_history, atol=1e-6)
+    np.testing.assert_allclose(compact.returns, full.returns, atol=1e-7)
+    np.testing.assert_allclose(compact.nav, full.nav, rtol=1e-5)
+
+
+
+def test_resumed_backtest_matches_full_run() -> None:
+    returns = _random_returns(n_days=300)
+    calls: list[pd.Timestamp] = []
+
+    def _counting_weights(train: pd.DataFrame, date: pd.Timestamp) -> pd.Series:
+        calls.append(date)
+        return _momentum_weights(train, date)
+
+    costs = TransactionCosts(proportional=0.002, fixed=0.0005)
+    for n_rows in (250, 290):
+        head = returns.iloc[:n_rows]
+        saved = rolling_backtest(head, monthly_rebalance_dates(head.index), 20, _counting_weights, costs=costs)
+
+        calls.clear()
+        resumed = rolling_backtest(
+            returns, monthly_rebalance_dates(returns.index), 20, _counting_weights, costs=costs, state=saved.state
+        )
+        full = rolling_backtest(returns, monthly_rebalance_dates(returns.index), 20, _momentum_weights, costs=costs)
+
+        # Only the moved month-end rebalance and the new ones are recomputed.
+        assert 0 < len(calls) <= 3
+        pd.testing.assert_series_equal(resumed.returns, full.returns, rtol=1e-12)
+        pd.testing.assert_frame_equal(resumed.weight_history, full.weight_history)
+        pd.testing.assert_series_equal(resumed.costs, full.costs)
+
+    revised = returns.copy()
+    revised.iloc[5, 0] += 0.01
+    calls.clear()
+    rolling_backtest(
+        revised, monthly_rebalance_dates(revised.index), 20, _counting_weights, costs=costs, state=saved.state
+    )
+    assert len(calls) == len(full.weight_history)
@@ -4,6 +4,8 @@ import numpy as np
 import pandas as pd
 
 from portfolio_bl.models.black_litterman import (
+    EquilibriumCache,
+    black_litterman_batch,
     black_litterman_posterior,
     diagonal_omega_from_confidence,
     implied_equilibrium_returns,
@@ -55,3 +57,147 @@ def test_long_only_markowitz_weights_are_valid() -> None:
 
     assert np.isclose(w.sum(), 1.0)
     assert (w >= 0).all()
+
+
+
+def test_cholesky_posterior_matches_pinv_for_few_and_many_views() -> None:
+    rng = np.random.default_rng(3)
+    n_assets = 8
+    factors = rng.normal(0.0, 0.1, size=(40, n_assets))
+    cov = np.cov(factors, rowvar=False)
+    pi = rng.normal(0.01, 0.005, size=n_assets)
+
+    for n_views in (2, n_assets, n_assets + 3):
+        p = rng.normal(size=(n_views, n_assets))
+        q = rng.normal(0.02, 0.01, size=n_views)
+        omega = diagonal_omega_from_confidence(cov, p, tau=0.05, confidence=0.6, as_vector=True)
+
+        mu_ref, cov_ref = black_litterman_posterior(pi, cov, p, q, tau=0.05, omega=np.diag(omega))
+        mu_fast, cov_fast = black_litterman_posterior(pi, cov, p, q, tau=0.05, omega=omega, solver="cholesky")
+
+        assert np.allclose(mu_fast, mu_ref, rtol=1e-6, atol=1e-10)
+        assert np.allclose(cov_fast, cov_ref, rtol=1e-6, atol=1e-10)
+
+    # p_matrix=None (one absolute view per asset) skips every product with P.
+    q = rng.normal(0.02, 0.01, size=n_assets)
+    mu_ref, cov_ref = black_litterman_posterior(pi, cov, np.eye(n_assets), q, tau=0.05)
+    mu_fast, cov_fast = black_litterman_posterior(pi, cov, None, q, tau=0.05, solver="cholesky")
+    assert np.allclose(mu_fast, mu_ref, rtol=1e-6, atol=1e-10)
+    assert np.allclose(cov_fast, cov_ref, rtol=1e-6, atol=1e-10)
+
+
+
+def test_black_litterman_batch_matches_single_posteriors() -> None:
+    rng = np.random.default_rng(5)
+    tickers = [f"T{i}" for i in range(6)]
+    samples = rng.normal(0.01, 0.05, size=(30, len(tickers)))
+    cov = pd.DataFrame(np.cov(samples, rowvar=False), index=tickers, columns=tickers)
+    w_mkt = pd.Series(rng.dirichlet(np.ones(len(tickers))), index=tickers)
+    p = np.eye(len(tickers))
+    q = samples.mean(axis=0)
+    ridge = 1e-6
+
+    taus = np.array([0.025, 0.05, 0.1])
+    confidences = np.array([0.3, 0.65, 0.9])
+    deltas = np.array([1.5, 2.5, 3.5])
+    batch = black_litterman_batch(
+        cov.to_numpy(), w_mkt.to_numpy(), p, q, taus, confidences, deltas, ridge=ridge, return_weights=True
+    )
+
+    sigma_reg = cov.to_numpy() + np.eye(len(tickers)) * ridge
+    for g, (tau, confidence, delta) in enumerate(zip(taus, confidences, deltas)):
+        pi = implied_equilibrium_returns(covariance=cov, market_weights=w_mkt, risk_aversion=delta)
+        omega = diagonal_omega_from_confidence(cov.to_numpy(), p, tau=tau, confidence=confidence, as_vector=True)
+        mu_ref, cov_ref = black_litterman_posterior(pi, sigma_reg, p, q, tau=tau, omega=omega, ridge=0.0)
+        w_ref = long_only_markowitz_weights(pd.Series(mu_ref, index=tickers), pd.DataFrame(cov_ref, index=tickers, columns=tickers))
+
+        assert np.allclose(batch.posterior_means[g], mu_ref, rtol=1e-6, atol=1e-10)
+        assert np.allclose(batch.posterior_covariances[g], cov_ref, rtol=1e-6, atol=1e-10)
+        assert np.allclose(batch.weights[g], w_ref.to_numpy(), atol=1e-8)
+
+
+
+def test_equilibrium_cache_updates_incrementally() -> None:
+    rng = np.random.default_rng(4)
+    a = rng.normal(size=(8, 8))
+    cov = pd.DataFrame(a @ a.T + np.eye(8), index=list("ABCDEFGH"), columns=list("ABCDEFGH"))
+    weights = rng.dirichlet(np.ones(8))
+    cache = EquilibriumCache(risk_aversion=2.5)
+
+    first = cache(cov, weights)
+    moved = weights.copy()
+    moved[[1, 5]] = moved[[5, 1]]
+    second = cache(cov, moved)
+    third = cache(cov.copy(), moved)
+
+    np.testing.assert_allclose(first, 2.5 * cov.to_numpy() @ weights)
+    np.testing.assert_allclose(second, 2.5 * cov.to_numpy() @ moved)
+    np.testing.assert_allclose(third, second)
+    assert (cache.full_updates, cache.partial_updates) == (2, 1)
+
+
+
+def test_black_litterman_batch_omega_ridge_matches_cholesky_posterior() -> None:
+    rng = np.random.default_rng(9)
+    tickers = [f"T{i}" for i in range(5)]
+    samples = rng.normal(0.001, 0.01, size=(40, len(tickers)))
+    cov = np.cov(samples, rowvar=False)
+    w_mkt = rng.dirichlet(np.ones(len(tickers)))
+    q = samples.mean(axis=0)
+
+    taus = np.array([0.025, 0.05, 0.05])
+    confidences = np.array([0.4, 0.4, 0.8])
+    batch = black_litterman_batch(cov, w_mkt, None, q, taus, confidences, 2.5, omega_ridge=1e-6)
+
+    for g, (tau, confidence) in enumerate(zip(taus, confidences)):
+        omega = diagonal_omega_from_confidence(cov, None, tau=tau, confidence=confidence, as_vector=True)
+        mu_ref, cov_ref = black_litterman_posterior(2.5 * cov @ w_mkt, cov, None, q, tau=tau, omega=omega, solver="cholesky")
+        assert np.allclose(batch.posterior_means[g], mu_ref, rtol=1e-8, atol=1e-12)
+        assert np.allclose(batch.posterior_covariances[g], cov_ref, rtol=1e-8, atol=1e-12)
+
+
+
+def test_black_litterman_batch_floors_omega_like_single_posteriors() -> None:
+    # The last asset's price never moves, so its view variance is zero and Omega is floored.
+    rng = np.random.default_rng(12)
+    samples = np.column_stack([rng.normal(0.001, 0.01, size=(40, 4)), np.zeros(40)])
+    cov = np.cov(samples, rowvar=False)
+    w_mkt = rng.dirichlet(np.ones(5))
+    q = samples.mean(axis=0) + 0.001
+    ridge = 1e-6
+
+    taus = np.array([0.025, 0.05, 0.1])
+    confidences = np.array([0.3, 0.65, 0.9])
+    for p in (None, np.eye(5)):
+        batch = black_litterman_batch(cov, w_mkt, p, q, taus, confidences, 2.5, ridge=ridge)
+        for g, (tau, confidence) in enumerate(zip(taus, confidences)):
+            omega = diagonal_omega_from_confidence(cov, p, tau=tau, confidence=confidence, as_vector=True)
+            mu_ref, cov_ref = black_litterman_posterior(
+                2.5 * cov @ w_mkt, cov + np.eye(5) * ridge, p, q, tau=tau, omega=omega, ridge=0.0, solver="cholesky"
+            )
+            assert np.allclose(batch.posterior_means[g], mu_ref, rtol=1e-6, atol=1e-10)
+            assert np.allclose(batch.posterior_covariances[g], cov_ref, rtol=1e-6, atol=1e-10)
+
+
+
+def test_black_litterman_batch_matches_single_posteriors_on_indefinite_covariance() -> None:
+    # Pairwise estimates over gappy windows can give inconsistent correlations like these.
+    corr = np.array([[1.0, 0.9, 0.9, 0.2], [0.9, 1.0, -0.9, 0.1], [0.9, -0.9, 1.0, 0.0], [0.2, 0.1, 0.0, 1.0]])
+    vols = np.array([0.04, 0.05, 0.06, 0.03])
+    cov = corr * np.outer(vols, vols)
+    assert np.linalg.eigvalsh(cov).min() < 0
+    w_mkt = np.array([0.4, 0.3, 0.2, 0.1])
+    q = np.array([0.01, 0.02, -0.01, 0.005])
+
+    taus = np.array([0.025, 0.05, 0.1])
+    confidences = np.array([0.3, 0.65, 0.9])
+    for p in (None, np.eye(4)):
+        batch = black_litterman_batch(cov, w_mkt, p, q, taus, confidences, 2.5, omega_ridge=1e-6)
+        for g, (tau, confidence) in enumerate(zip(taus, confidences)):
+            omega = diagonal_omega_from_confidence(cov, p, tau=tau, confidence=confidence, as_vector=True)
+            for solver in ("pinv", "cholesky"):
+                mu_ref, cov_ref = black_litterman_posterior(
+                    2.5 * cov @ w_mkt, cov, p, q, tau=tau, omega=omega, solver=solver
+                )
+                assert np.allclose(batch.posterior_means[g], mu_ref, rtol=1e-8, atol=1e-12)
+                assert np.allclose(batch.posterior_covariances[g], cov_ref, rtol=1e-8, atol=1e-12)
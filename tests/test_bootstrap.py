@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.backtest.bootstrap import bootstrap_summary, stationary_bootstrap_indices
+
+
+
+def test_stationary_bootstrap_indices_follow_blocks() -> None:
+    indices = stationary_bootstrap_indices(50, 200, mean_block_length=5.0, rng=np.random.default_rng(0))
+
+    assert indices.shape == (200, 50)
+    assert indices.min() >= 0 and indices.max() < 50
+    # Most steps continue the current block, wrapping at the end of the sample.
+    continues = np.diff(indices, axis=1) % 50 == 1
+    assert 0.7 < continues.mean() < 0.9
+
+
+
+def test_bootstrap_summary_intervals_and_paired_differences() -> None:
+    rng = np.random.default_rng(1)
+    base = rng.normal(0.01, 0.04, size=96)
+    returns = pd.DataFrame(
+        {"disclosed": base, "copy": base, "levered": 2.0 * base},
+        index=pd.date_range("2015-01-31", periods=96, freq="ME"),
+    )
+
+    table = bootstrap_summary(returns, 12, n_resamples=1_000, baseline="disclosed", batch_size=300, seed=7)
+
+    assert list(table.index.get_level_values("strategy").unique()) == ["disclosed", "copy", "levered"]
+    assert (table["lower"] <= table["estimate"]).all()
+    assert (table["estimate"] <= table["upper"]).all()
+
+    # Paired resampling: an identical strategy differs from the baseline by exactly zero.
+    copy = table.loc["copy"]
+    assert np.allclose(copy[["diff_lower", "diff_upper"]].to_numpy(), 0.0)
+    assert table.loc[("levered", "annual_volatility"), "diff_lower"] > 0
+
+    again = bootstrap_summary(returns, 12, n_resamples=1_000, baseline="disclosed", batch_size=300, seed=7)
+    pd.testing.assert_frame_equal(table, again)
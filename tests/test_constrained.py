@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.models.constrained import BoxMarkowitzSolver, box_constrained_markowitz_weights
+
+
+
+def _objective(weights: np.ndarray, mu: np.ndarray, cov: np.ndarray, risk_aversion: float) -> float:
+    return float(mu @ weights - 0.5 * risk_aversion * weights @ cov @ weights)
+
+
+
+def test_box_markowitz_is_feasible_and_beats_random_feasible_portfolios() -> None:
+    rng = np.random.default_rng(2)
+    tickers = [f"T{i}" for i in range(12)]
+    samples = rng.normal(0.01, 0.04, size=(40, len(tickers)))
+    mu = pd.Series(samples.mean(axis=0), index=tickers)
+    cov = pd.DataFrame(np.cov(samples, rowvar=False), index=tickers, columns=tickers)
+
+    w = box_constrained_markowitz_weights(mu, cov, risk_aversion=2.5, upper=0.3)
+
+    assert np.isclose(w.sum(), 1.0)
+    assert (w >= 0).all() and (w <= 0.3 + 1e-12).all()
+
+    best = _objective(w.to_numpy(), mu.to_numpy(), cov.to_numpy(), 2.5)
+    for _ in range(500):
+        candidate = rng.dirichlet(np.ones(len(tickers)) * 0.5)
+        if candidate.max() <= 0.3:
+            assert _objective(candidate, mu.to_numpy(), cov.to_numpy(), 2.5) <= best + 1e-12
+
+
+
+def test_box_markowitz_warm_start_reaches_cold_solution() -> None:
+    rng = np.random.default_rng(4)
+    tickers = [f"T{i}" for i in range(30)]
+    samples = rng.normal(0.01, 0.05, size=(60, len(tickers)))
+    solver = BoxMarkowitzSolver(upper=0.2)
+
+    first = solver(
+        pd.Series(samples[:50].mean(axis=0), index=tickers),
+        pd.DataFrame(np.cov(samples[:50], rowvar=False), index=tickers, columns=tickers),
+    )
+    mu = pd.Series(samples[10:].mean(axis=0), index=tickers)
+    cov = pd.DataFrame(np.cov(samples[10:], rowvar=False), index=tickers, columns=tickers)
+    warm = solver(mu, cov)
+    cold = BoxMarkowitzSolver(upper=0.2)(mu, cov)
+
+    assert solver.previous is warm
+    assert not first.equals(warm)
+    assert np.allclose(warm.to_numpy(), cold.to_numpy(), atol=1e-9)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.models.black_litterman import black_litterman_posterior, diagonal_omega_from_confidence
+from portfolio_bl.models.covariance import (
+    FactorCovariance,
+    ewma_covariance,
+    ledoit_wolf_covariance,
+    oas_covariance,
+)
+
+
+
+def _short_window(n_obs: int = 8, n_assets: int = 30) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    market = rng.normal(0.0, 0.03, size=(n_obs, 1))
+    values = market + rng.normal(0.0, 0.02, size=(n_obs, n_assets))
+    return pd.DataFrame(values, columns=[f"A{i}" for i in range(n_assets)])
+
+
+
+def test_shrinkage_estimators_are_positive_definite_with_short_windows() -> None:
+    window = _short_window()
+    assert np.linalg.matrix_rank(window.cov().to_numpy()) < window.shape[1]
+
+    for estimator in (ledoit_wolf_covariance, oas_covariance):
+        cov = estimator(window).to_numpy()
+        assert np.allclose(cov, cov.T)
+        assert np.linalg.eigvalsh(cov).min() > 0
+
+
+
+def test_ewma_covariance_approaches_sample_covariance_for_long_halflife() -> None:
+    window = _short_window(n_obs=40, n_assets=4)
+    cov = ewma_covariance(window, halflife=1e12)
+    pd.testing.assert_frame_equal(cov, window.cov(), rtol=1e-8)
+
+
+
+def test_factor_covariance_solves_and_posterior_match_dense() -> None:
+    window = _short_window()
+    factor = FactorCovariance.from_returns(window, n_factors=3)
+    dense = factor.to_numpy()
+    rng = np.random.default_rng(2)
+    rhs = rng.normal(size=dense.shape[0])
+
+    np.testing.assert_allclose(factor.solve(rhs, ridge=1e-4), np.linalg.solve(dense + 1e-4 * np.eye(len(rhs)), rhs))
+    np.testing.assert_allclose(factor.matvec(rhs), dense @ rhs)
+
+    pi = rng.normal(0.0, 0.01, size=len(rhs))
+    q = rng.normal(0.0, 0.01, size=len(rhs))
+    omega = diagonal_omega_from_confidence(factor, None, tau=0.05, confidence=0.65, as_vector=True)
+    mean, cov = black_litterman_posterior(pi, factor, None, q, tau=0.05, omega=omega)
+    dense_mean, dense_cov = black_litterman_posterior(
+        pi, dense, np.eye(len(rhs)), q, tau=0.05, omega=omega, solver="cholesky"
+    )
+
+    assert isinstance(cov, FactorCovariance)
+    np.testing.assert_allclose(mean, dense_mean, rtol=1e-8, atol=1e-12)
+    np.testing.assert_allclose(cov.to_numpy(), dense_cov, rtol=1e-8, atol=1e-12)
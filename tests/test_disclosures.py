@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.data.disclosures import DisclosureIndex, latest_portfolio_for_aliases, load_disclosures_csv
+
+
+
+def _disclosures(tmp_path: Path) -> pd.DataFrame:
+    frame = pd.DataFrame(
+        {
+            "person": ["Warren Buffett"] * 3 + ["Berkshire Hathaway"] * 2 + ["Nancy Pelosi"] * 2,
+            "as_of_date": ["2024-03-31"] * 3 + ["2024-09-30"] * 2 + ["2024-06-30", "2024-12-31"],
+            "ticker": ["AAPL", "MSFT", "KO", "AAPL", "OXY", "NVDA", "AAPL"],
+            "value_usd": [100.0, 80.0, 20.0, 60.0, 40.0, 10.0, 30.0],
+        }
+    )
+    frame.to_csv(tmp_path / "disclosures.csv", index=False)
+    return load_disclosures_csv(tmp_path / "disclosures.csv")
+
+
+
+def test_point_in_time_lookup_matches_latest_filing(tmp_path: Path) -> None:
+    disclosures = _disclosures(tmp_path)
+    index = DisclosureIndex(disclosures)
+    aliases = ("warren buffett", "berkshire hathaway")
+
+    holdings, as_of = index.portfolio_as_of(aliases, "2025-01-15")
+    expected, expected_date = latest_portfolio_for_aliases(disclosures, aliases)
+    pd.testing.assert_frame_equal(holdings, expected, check_dtype=False)
+    assert as_of == expected_date
+
+    earlier, earlier_date = index.portfolio_as_of(aliases, "2024-08-31")
+    assert earlier_date == pd.Timestamp("2024-03-31")
+    assert list(earlier["ticker"]) == ["AAPL", "KO", "MSFT"]
+    assert index.portfolio_as_of(aliases, "2024-01-31") is None
+
+
+
+def test_weight_schedule_aligns_to_columns(tmp_path: Path) -> None:
+    index = DisclosureIndex(_disclosures(tmp_path))
+    dates = pd.date_range("2024-01-31", periods=12, freq="ME")
+    columns = pd.Index(["AAPL", "MSFT", "OXY", "SPY"])
+
+    weights, as_of = index.weight_schedule(["Warren Buffett", "berkshire hathaway"], dates, columns)
+
+    assert weights.shape == (12, 4)
+    assert np.all(weights[:2] == 0.0) and as_of[:2].isna().all()
+    # March filing: KO is outside the columns, so AAPL and MSFT are renormalized.
+    np.testing.assert_allclose(weights[2], [100 / 180, 80 / 180, 0.0, 0.0])
+    np.testing.assert_allclose(weights[8], [0.6, 0.0, 0.4, 0.0])
+    assert as_of[-1] == pd.Timestamp("2024-09-30")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import numpy as np
+
+from portfolio_bl.models.linalg import cholesky_inverse, cholesky_solve
+
+
+
+def test_cholesky_helpers_match_dense_solves() -> None:
+    rng = np.random.default_rng(2)
+    a = rng.normal(size=(150, 150))
+    spd = a @ a.T + 150 * np.eye(150)
+    rhs = rng.normal(size=(150, 3))
+
+    np.testing.assert_allclose(cholesky_solve(spd, rhs), np.linalg.solve(spd, rhs), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(cholesky_solve(spd, rhs[:, 0]), np.linalg.solve(spd, rhs[:, 0]), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(cholesky_inverse(spd), np.linalg.inv(spd), rtol=1e-9, atol=1e-12)
+
+    # Not positive-definite: the pseudo-inverse is used instead.
+    singular = np.outer(rhs[:4, 0], rhs[:4, 0])
+    np.testing.assert_allclose(cholesky_inverse(singular), np.linalg.pinv(singular))
+    np.testing.assert_allclose(cholesky_solve(singular, rhs[:4]), np.linalg.pinv(singular) @ rhs[:4])
@@ -3,7 +3,13 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
-from portfolio_bl.backtest.metrics import max_drawdown, summarize_strategy
+from portfolio_bl.backtest.metrics import (
+    average_turnover,
+    concentration_hhi,
+    max_drawdown,
+    summarize_strategies,
+    summarize_strategy,
+)
 
 
 
@@ -37,3 +43,48 @@ def test_summarize_strategy_contains_expected_keys() -> None:
     }
     assert expected_keys.issubset(summary)
     assert np.isfinite(summary["hhi"])
+
+
+
+def test_summarize_strategies_matches_single_series_summary() -> None:
+    rng = np.random.default_rng(3)
+    index = pd.date_range("2020-01-31", periods=40, freq="ME")
+    returns = pd.DataFrame(rng.normal(0.005, 0.04, size=(40, 3)), index=index, columns=["a", "b", "c"])
+    returns["c"] = returns["c"].abs()
+    returns.iloc[:5, 1] = np.nan
+    weights = pd.DataFrame(
+        rng.dirichlet(np.ones(4), size=6),
+        index=index[::7][:6],
+        columns=["AAPL", "MSFT", "NVDA", "AMZN"],
+    )
+    histories = {name: weights for name in returns.columns}
+
+    summary = summarize_strategies(returns, histories, periods_per_year=12)
+
+    for name in returns.columns:
+        expected = pd.Series(summarize_strategy(returns[name].dropna(), weights, periods_per_year=12))
+        pd.testing.assert_series_equal(summary.loc[name], expected, check_names=False, rtol=1e-10)
+
+
+
+def test_summarize_strategies_weight_metrics_match_per_strategy() -> None:
+    rng = np.random.default_rng(8)
+    index = pd.date_range("2020-01-31", periods=24, freq="ME")
+    returns = pd.DataFrame(rng.normal(0.005, 0.04, size=(24, 4)), index=index, columns=["a", "b", "c", "d"])
+    columns = ["AAPL", "MSFT", "NVDA"]
+    histories = {
+        name: pd.DataFrame(rng.dirichlet(np.ones(3), size=8), index=index[::3], columns=columns)
+        for name in ["a", "b", "c"]
+    }
+    histories["b"].iloc[2, 1] = np.nan
+    histories["c"].iloc[4] = 0.0
+    # A history on other rebalance dates is reduced in its own stack.
+    histories["d"] = pd.DataFrame(rng.dirichlet(np.ones(3), size=5), index=index[::5], columns=columns)
+    turnover = pd.Series(rng.uniform(0.0, 0.3, size=4), index=index[5::5])
+
+    summary = summarize_strategies(returns, histories, periods_per_year=12, turnovers={"d": turnover})
+
+    for name, history in histories.items():
+        assert np.isclose(summary.loc[name, "hhi"], concentration_hhi(history))
+        expected = turnover.mean() if name == "d" else average_turnover(history)
+        assert np.isclose(summary.loc[name, "avg_turnover"], expected)
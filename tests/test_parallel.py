@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from portfolio_bl.backtest.memo import WeightMemo
+from portfolio_bl.config import load_config
+from portfolio_bl.parallel import resolve_person_keys, run_case_studies
+from portfolio_bl.pipeline import run_case_study
+
+
+
+def _write_two_person_config(tmp_path: Path) -> Path:
+    disclosures = pd.DataFrame(
+        {
+            "person": ["Warren Buffett"] * 3 + ["Nancy Pelosi"] * 2,
+            "as_of_date": ["2025-03-31"] * 5,
+            "ticker": ["AAPL", "MSFT", "XOM", "AAPL", "NVDA"],
+            "value_usd": [100.0, 80.0, 20.0, 50.0, 70.0],
+        }
+    )
+
+    rng = np.random.default_rng(1)
+    dates = pd.date_range("2023-01-31", periods=30, freq="ME")
+    tickers = ["AAPL", "MSFT", "XOM", "NVDA"]
+    closes = 100.0 * np.cumprod(1.0 + rng.normal(0.01, 0.05, size=(len(dates), len(tickers))), axis=0)
+    prices = pd.DataFrame(closes, index=dates, columns=tickers).stack().rename("close").reset_index()
+    prices.columns = ["date", "ticker", "close"]
+
+    disclosures.to_csv(tmp_path / "disclosures.csv", index=False)
+    prices.to_csv(tmp_path / "prices.csv", index=False)
+
+    config = {
+        "data": {
+            "disclosures_path": str(tmp_path / "disclosures.csv"),
+            "prices_path": str(tmp_path / "prices.csv"),
+        },
+        "backtest": {"lookback_periods": 6},
+        "case_studies": {
+            "buffett": {"person_label": "Warren Buffett", "disclosure_aliases": ["warren buffett"]},
+            "pelosi": {"person_label": "Nancy Pelosi", "disclosure_aliases": ["nancy pelosi"]},
+        },
+    }
+    config_path = tmp_path / "config.yaml"
+    with config_path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+    return config_path
+
+
+
+def test_parallel_runner_matches_serial_runs(tmp_path: Path) -> None:
+    app_config = load_config(_write_two_person_config(tmp_path))
+    keys = resolve_person_keys(app_config, ["all"])
+
+    results = run_case_studies(app_config, keys, workers=2)
+
+    assert list(results) == ["buffett", "pelosi"]
+    for key in keys:
+        expected = run_case_study(app_config, key)
+        pd.testing.assert_frame_equal(results[key].summary, expected.summary)
+
+
+
+def test_memoized_runs_only_recompute_changed_strategies(tmp_path: Path) -> None:
+    app_config = load_config(_write_two_person_config(tmp_path))
+    memo = WeightMemo(disk_dir=tmp_path / "memo")
+
+    first = run_case_study(app_config, "buffett", view_confidence=0.5, memo=memo)
+    misses_after_first = memo.misses
+    second = run_case_study(app_config, "buffett", view_confidence=0.8, memo=memo)
+    n_rebalances = len(first.strategy_results["black_litterman"].weight_history)
+
+    # Only the BL weights depend on the confidence; everything else is served from the memo.
+    assert memo.misses - misses_after_first == n_rebalances
+    pd.testing.assert_frame_equal(second.summary, run_case_study(app_config, "buffett", view_confidence=0.8).summary)
+
+    from_disk = WeightMemo(disk_dir=tmp_path / "memo")
+    run_case_study(app_config, "buffett", view_confidence=0.8, memo=from_disk)
+    assert from_disk.misses == 0
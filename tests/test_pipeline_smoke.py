@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import yaml
 
 from portfolio_bl.config import load_config
-from portfolio_bl.pipeline import run_case_study
+from portfolio_bl.data.synthetic import write_synthetic_dataset
+from portfolio_bl.pipeline import (
+    load_case_study_data,
+    prepare_case_study,
+    resume_key,
+    run_case_study,
+    run_confidence_sweep,
+)
 
 
 
@@ -67,3 +76,210 @@ def test_pipeline_smoke(tmp_path: Path) -> None:
     assert len(result.universe) == 3
     assert "black_litterman" in result.summary.index
     assert not result.summary.empty
+
+
+
+def test_point_in_time_equilibrium_follows_filings(tmp_path: Path) -> None:
+    disclosures = pd.DataFrame(
+        {
+            "person": ["Warren Buffett"] * 6,
+            "as_of_date": ["2023-03-31"] * 3 + ["2024-06-30"] * 3,
+            "ticker": ["AAPL", "MSFT", "XOM"] * 2,
+            "value_usd": [10.0, 10.0, 180.0, 150.0, 40.0, 10.0],
+        }
+    )
+    rng = np.random.default_rng(8)
+    dates = pd.date_range("2023-01-31", periods=30, freq="ME")
+    closes = 100.0 * np.cumprod(1.0 + rng.normal(0.01, 0.05, size=(30, 3)), axis=0)
+    prices = pd.DataFrame(closes, index=dates, columns=["AAPL", "MSFT", "XOM"]).stack().rename("close").reset_index()
+    prices.columns = ["date", "ticker", "close"]
+    disclosures.to_csv(tmp_path / "disclosures.csv", index=False)
+    prices.to_csv(tmp_path / "prices.csv", index=False)
+
+    def _run(mode: str) -> pd.DataFrame:
+        config = {
+            "data": {
+                "disclosures_path": str(tmp_path / "disclosures.csv"),
+                "prices_path": str(tmp_path / "prices.csv"),
+            },
+            "backtest": {"lookback_periods": 6, "equilibrium_weights": mode},
+            "case_studies": {"buffett": {"person_label": "Warren Buffett", "disclosure_aliases": ["warren buffett"]}},
+        }
+        config_path = tmp_path / f"{mode}.yaml"
+        with config_path.open("w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f)
+        result = run_case_study(load_config(config_path), "buffett")
+        return result.strategy_results["black_litterman"].weight_history
+
+    latest = _run("latest")
+    point_in_time = _run("point_in_time")
+
+    after = latest.index >= pd.Timestamp("2024-06-30")
+    pd.testing.assert_frame_equal(point_in_time[after], latest[after])
+    assert not np.allclose(point_in_time[~after].to_numpy(), latest[~after].to_numpy())
+
+
+
+def test_load_case_study_data_filters_prices_to_disclosed_tickers(tmp_path: Path) -> None:
+    disclosures_path, prices_path = write_synthetic_dataset(
+        tmp_path, n_tickers=30, n_days=200, n_people=2, holdings_per_filing=5
+    )
+    loaded = {}
+    for name, chunksize in (("csv", None), ("chunked", 500)):
+        config = {
+            "data": {
+                "disclosures_path": str(disclosures_path),
+                "prices_path": str(prices_path),
+                "price_chunksize": chunksize,
+            },
+            "case_studies": {"p0": {"person_label": "Person 0", "disclosure_aliases": ["person 0"]}},
+        }
+        config_path = tmp_path / f"config_{name}.yaml"
+        with config_path.open("w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f)
+        loaded[name] = load_case_study_data(load_config(config_path), ["p0"])
+
+    disclosures = loaded["csv"].disclosures
+    disclosed = set(disclosures.loc[disclosures["person_norm"] == "person 0", "ticker"])
+    assert set(loaded["csv"].returns.columns) == disclosed
+    pd.testing.assert_frame_equal(loaded["chunked"].returns, loaded["csv"].returns, check_names=False)
+
+
+
+def test_ticker_filter_keeps_gap_dates(tmp_path: Path) -> None:
+    # p0's tickers skip one day that only p1's XOM traded.
+    disclosures = pd.DataFrame(
+        {
+            "person": ["P Zero", "P Zero", "P One"],
+            "as_of_date": ["2024-01-31"] * 3,
+            "ticker": ["AAPL", "MSFT", "XOM"],
+            "value_usd": [60.0, 40.0, 10.0],
+        }
+    )
+    rng = np.random.default_rng(5)
+    rows = []
+    for date in pd.bdate_range("2024-01-01", periods=60):
+        for ticker in ("AAPL", "MSFT", "XOM"):
+            if ticker != "XOM" and date == pd.Timestamp("2024-01-17"):
+                continue
+            rows.append({"date": date.strftime("%Y-%m-%d"), "ticker": ticker, "close": 100.0 + rng.normal()})
+    disclosures_path = tmp_path / "disclosures.csv"
+    prices_path = tmp_path / "prices.csv"
+    disclosures.to_csv(disclosures_path, index=False)
+    pd.DataFrame(rows).to_csv(prices_path, index=False)
+
+    expected = None
+    loaders = {"csv": {}, "chunked": {"price_chunksize": 40}, "cached": {"cache_dir": str(tmp_path / "cache")}}
+    for name, loader in loaders.items():
+        config = {
+            "data": {"disclosures_path": str(disclosures_path), "prices_path": str(prices_path), **loader},
+            "backtest": {"lookback_periods": 10},
+            "case_studies": {
+                "p0": {"person_label": "P Zero", "disclosure_aliases": ["p zero"]},
+                "p1": {"person_label": "P One", "disclosure_aliases": ["p one"]},
+            },
+        }
+        config_path = tmp_path / f"config_{name}.yaml"
+        with config_path.open("w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f)
+        app_config = load_config(config_path)
+
+        for person_keys in (None, ["p0"], ["p0", "p1"]):
+            inputs = prepare_case_study(app_config, "p0", load_case_study_data(app_config, person_keys))
+            assert pd.Timestamp("2024-01-18") not in inputs.returns.index
+            key = resume_key(app_config.backtest, inputs, 0.65)
+            if expected is None:
+                expected = (inputs.returns, key)
+            pd.testing.assert_frame_equal(inputs.returns, expected[0], check_names=False)
+            assert key == expected[1]
+
+
+
+def test_confidence_sweep_matches_individual_runs(tmp_path: Path) -> None:
+    disclosures_path, prices_path = write_synthetic_dataset(tmp_path, n_tickers=20, n_days=400, holdings_per_filing=6)
+    config = {
+        "data": {"disclosures_path": str(disclosures_path), "prices_path": str(prices_path)},
+        "backtest": {"lookback_periods": 60, "rebalance_frequency": "ME"},
+        "case_studies": {"p0": {"person_label": "Person 0", "disclosure_aliases": ["person 0"]}},
+    }
+    config_path = tmp_path / "config.yaml"
+    with config_path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+    app_config = load_config(config_path)
+    data = load_case_study_data(app_config, ["p0"])
+
+    sweep = run_confidence_sweep(app_config, "p0", view_confidences=[0.3, 0.9], taus=[0.025, 0.05], data=data)
+    assert sweep.summary.index.names == ["tau", "confidence", "risk_aversion"]
+    assert len(sweep.summary) == 4
+
+    single = run_case_study(app_config, "p0", view_confidence=0.3, data=data)
+    pd.testing.assert_series_equal(
+        sweep.summary.loc[(0.05, 0.3, 2.5)],
+        single.summary.loc["black_litterman"],
+        check_names=False,
+        rtol=1e-6,
+    )
+    pd.testing.assert_frame_equal(sweep.baseline_summary, single.summary.loc[["disclosed", "mean_variance"]])
+
+
+
+def test_confidence_sweep_matches_individual_runs_on_windows_with_gaps(tmp_path: Path) -> None:
+    disclosures_path, prices_path = write_synthetic_dataset(tmp_path, n_tickers=20, n_days=400, holdings_per_filing=6)
+    # Dropping price rows leaves NaN returns, so the pairwise sample covariance can be indefinite.
+    prices = pd.read_csv(prices_path)
+    prices[np.random.default_rng(3).random(len(prices)) > 0.3].to_csv(prices_path, index=False)
+    config = {
+        "data": {"disclosures_path": str(disclosures_path), "prices_path": str(prices_path)},
+        "backtest": {"lookback_periods": 60, "rebalance_frequency": "ME"},
+        "case_studies": {"p0": {"person_label": "Person 0", "disclosure_aliases": ["person 0"]}},
+    }
+    config_path = tmp_path / "config.yaml"
+    with config_path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+    app_config = load_config(config_path)
+    data = load_case_study_data(app_config, ["p0"])
+    assert data.returns.isna().any().any()
+
+    sweep = run_confidence_sweep(app_config, "p0", view_confidences=[0.3, 0.9], taus=[0.025, 0.05], data=data)
+    for g, (tau, confidence, _delta) in enumerate(sweep.params.itertuples(index=False)):
+        single_config = replace(app_config, backtest=replace(app_config.backtest, tau=tau))
+        single = run_case_study(single_config, "p0", view_confidence=confidence, data=data)
+        pd.testing.assert_frame_equal(
+            sweep.strategy_results[f"black_litterman/{g}"].weight_history,
+            single.strategy_results["black_litterman"].weight_history,
+            rtol=1e-6,
+        )
+        pd.testing.assert_series_equal(
+            sweep.summary.iloc[g], single.summary.loc["black_litterman"], check_names=False, rtol=1e-6
+        )
+
+
+
+def test_run_case_study_resumes_from_saved_state(tmp_path: Path) -> None:
+    disclosures_path, prices_path = write_synthetic_dataset(tmp_path, n_tickers=15, n_days=300, holdings_per_filing=5)
+    # The saved run sees the same price file minus its last days, as before a nightly append.
+    lines = prices_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    head_path = tmp_path / "prices_head.csv"
+    head_path.write_text(lines[0] + "".join(line for line in lines[1:] if line[:10] < "2016-01-20"), encoding="utf-8")
+
+    def _config(path: Path) -> Path:
+        config = {
+            "data": {"disclosures_path": str(disclosures_path), "prices_path": str(path)},
+            "backtest": {"lookback_periods": 40, "proportional_cost": 0.001},
+            "case_studies": {"p0": {"person_label": "Person 0", "disclosure_aliases": ["person 0"]}},
+        }
+        config_path = tmp_path / f"{path.stem}.yaml"
+        with config_path.open("w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f)
+        return config_path
+
+    saved = run_case_study(load_config(_config(head_path)), "p0")
+    full_config = load_config(_config(prices_path))
+    resumed = run_case_study(full_config, "p0", profile=True, state=saved.backtest_state)
+    fresh = run_case_study(full_config, "p0", profile=True)
+
+    assert resumed.profile["counters"]["rebalances"] < fresh.profile["counters"]["rebalances"]
+    pd.testing.assert_frame_equal(resumed.summary, fresh.summary, rtol=1e-9)
+
+    other = run_case_study(full_config, "p0", view_confidence=0.3, profile=True, state=saved.backtest_state)
+    assert other.profile["counters"]["rebalances"] == fresh.profile["counters"]["rebalances"]
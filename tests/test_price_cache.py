@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import Future
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+
+from portfolio_bl.config import load_config
+from portfolio_bl.data.cache import PriceCache
+from portfolio_bl.data.prices import (
+    close_matrix_to_returns,
+    load_close_matrix_chunked,
+    load_prices_csv,
+    to_return_matrix,
+)
+
+
+
+def _write_prices(path: Path, n_days: int) -> None:
+    dates = pd.date_range("2024-01-01", periods=n_days, freq="B")
+    rows = []
+    for i, date in enumerate(dates):
+        rows.append({"date": date.strftime("%Y-%m-%d"), "ticker": " aapl", "close": 100.0 + i})
+        rows.append({"date": date.strftime("%Y-%m-%d"), "ticker": "MSFT", "close": 200.0 - 0.5 * i})
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+
+def test_price_cache_round_trip_and_invalidation(tmp_path: Path) -> None:
+    prices_path = tmp_path / "prices.csv"
+    _write_prices(prices_path, 30)
+    cache = PriceCache(tmp_path / "cache")
+
+    first = cache.load_return_matrix(prices_path)
+    cached_prices = cache.load_prices(prices_path)
+    cached_returns = cache.load_return_matrix(prices_path)
+
+    pd.testing.assert_frame_equal(cached_prices, load_prices_csv(prices_path))
+    pd.testing.assert_frame_equal(cached_returns, first)
+    assert not cached_returns.to_numpy().flags.writeable
+
+    # Touching the file without changing its content keeps the entry.
+    stat = prices_path.stat()
+    os.utime(prices_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+    pd.testing.assert_frame_equal(cache.load_return_matrix(prices_path), first)
+
+    _write_prices(prices_path, 40)
+    refreshed = cache.load_return_matrix(prices_path)
+    pd.testing.assert_frame_equal(refreshed, to_return_matrix(load_prices_csv(prices_path)))
+    assert len(refreshed) == 39
+
+
+
+def test_chunked_close_matrix_matches_full_pivot(tmp_path: Path) -> None:
+    prices_path = tmp_path / "prices.csv"
+    _write_prices(prices_path, 25)
+
+    full = to_return_matrix(load_prices_csv(prices_path))
+    streamed = close_matrix_to_returns(load_close_matrix_chunked(prices_path, tickers=["aapl"], chunksize=7))
+
+    pd.testing.assert_frame_equal(streamed, full[["AAPL"]], check_names=False)
+
+
+
+def _write_prices_with_gap(path: Path) -> None:
+    # AAPL and MSFT skip 2024-01-03, which only XOM traded.
+    dates = pd.date_range("2024-01-01", periods=12, freq="B").strftime("%Y-%m-%d")
+    rows = []
+    for i, date in enumerate(dates):
+        if date != "2024-01-03":
+            rows.append({"date": date, "ticker": "AAPL", "close": 100.0 + i})
+            rows.append({"date": date, "ticker": "MSFT", "close": 200.0 - 0.5 * i})
+        rows.append({"date": date, "ticker": "XOM", "close": 50.0 + 0.1 * i})
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+
+def test_chunked_filter_does_not_bridge_gap_dates(tmp_path: Path) -> None:
+    prices_path = tmp_path / "prices.csv"
+    _write_prices_with_gap(prices_path)
+
+    full = to_return_matrix(load_prices_csv(prices_path))[["AAPL", "MSFT"]].dropna(how="all")
+    assert pd.Timestamp("2024-01-04") not in full.index
+    for chunksize in (5, 1000):
+        streamed = close_matrix_to_returns(
+            load_close_matrix_chunked(prices_path, tickers=["aapl", "msft"], chunksize=chunksize)
+        )
+        pd.testing.assert_frame_equal(streamed.dropna(how="all"), full, check_names=False)
+
+    late: Future = Future()
+    late.set_result(["aapl", "msft"])
+    late.done = lambda: False
+    streamed = close_matrix_to_returns(load_close_matrix_chunked(prices_path, tickers=late, chunksize=5))
+    pd.testing.assert_frame_equal(streamed.dropna(how="all"), full, check_names=False)
+
+
+
+def test_chunked_close_matrix_accepts_pending_ticker_filter(tmp_path: Path) -> None:
+    prices_path = tmp_path / "prices.csv"
+    _write_prices(prices_path, 25)
+    expected = load_close_matrix_chunked(prices_path, tickers=["aapl"], chunksize=7)
+
+    ready: Future = Future()
+    ready.set_result(["aapl"])
+    pd.testing.assert_frame_equal(load_close_matrix_chunked(prices_path, tickers=ready, chunksize=7), expected)
+
+    # A filter that only resolves after the last chunk trims the pivots already built.
+    late: Future = Future()
+    late.set_result(["aapl"])
+    late.done = lambda: False
+    pd.testing.assert_frame_equal(load_close_matrix_chunked(prices_path, tickers=late, chunksize=7), expected)
+
+
+
+def test_config_rejects_cache_with_chunked_loading(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.yaml"
+    config = {
+        "data": {"cache_dir": "cache", "price_chunksize": 1000},
+        "case_studies": {"p0": {"person_label": "Person 0"}},
+    }
+    with config_path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+
+    with pytest.raises(ValueError, match="price_chunksize"):
+        load_config(config_path)
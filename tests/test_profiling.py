@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from portfolio_bl.config import load_config
+from portfolio_bl.parallel import run_case_studies
+from portfolio_bl.pipeline import run_case_study
+from portfolio_bl.profiling import NULL_PROFILER, Profiler, merge_reports
+
+
+
+def test_profiler_aggregates_spans_and_counters() -> None:
+    profiler = Profiler()
+    for _ in range(3):
+        with profiler.span("work"):
+            profiler.count("items", 2)
+    with profiler.stage("stage"):
+        pass
+
+    report = profiler.report()
+    assert report["spans"]["work"]["calls"] == 3
+    assert report["counters"] == {"items": 6}
+    assert "stage" in report["peak_rss_bytes"]
+    json.dumps(report)
+
+    with NULL_PROFILER.span("ignored"):
+        NULL_PROFILER.count("ignored")
+    assert NULL_PROFILER.report() == {}
+
+
+
+def _write_config(tmp_path: Path) -> Path:
+    disclosures = pd.DataFrame(
+        {
+            "person": ["Warren Buffett"] * 3,
+            "as_of_date": ["2025-03-31"] * 3,
+            "ticker": ["AAPL", "MSFT", "XOM"],
+            "value_usd": [100.0, 80.0, 20.0],
+        }
+    )
+    rng = np.random.default_rng(2)
+    dates = pd.date_range("2023-01-31", periods=24, freq="ME")
+    closes = 100.0 * np.cumprod(1.0 + rng.normal(0.01, 0.05, size=(24, 3)), axis=0)
+    prices = pd.DataFrame(closes, index=dates, columns=["AAPL", "MSFT", "XOM"]).stack().rename("close").reset_index()
+    prices.columns = ["date", "ticker", "close"]
+    disclosures.to_csv(tmp_path / "disclosures.csv", index=False)
+    prices.to_csv(tmp_path / "prices.csv", index=False)
+
+    config = {
+        "data": {
+            "disclosures_path": str(tmp_path / "disclosures.csv"),
+            "prices_path": str(tmp_path / "prices.csv"),
+        },
+        "backtest": {"lookback_periods": 6},
+        "case_studies": {"buffett": {"person_label": "Warren Buffett", "disclosure_aliases": ["warren buffett"]}},
+    }
+    config_path = tmp_path / "config.yaml"
+    with config_path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+    return config_path
+
+
+
+def test_run_case_study_profile_report(tmp_path: Path) -> None:
+    app_config = load_config(_write_config(tmp_path))
+
+    plain = run_case_study(app_config, "buffett")
+    profiled = run_case_study(app_config, "buffett", profile=True)
+
+    assert plain.profile is None
+    pd.testing.assert_frame_equal(plain.summary, profiled.summary)
+
+    report = profiled.profile
+    n_rebalances = report["counters"]["rebalances"]
+    assert n_rebalances == len(plain.strategy_results["disclosed"].weight_history)
+    assert report["spans"]["strategy/black_litterman"]["calls"] == n_rebalances
+    assert report["counters"]["solves/markowitz"] == 2 * n_rebalances
+    assert {"load/prices_csv", "load/returns", "backtest/window_stats"} <= set(report["spans"])
+    assert set(report["peak_rss_bytes"]) == {"load_data", "prepare", "backtest", "summary"}
+
+
+
+def test_run_case_studies_profile_includes_shared_load(tmp_path: Path) -> None:
+    # The CLI loads data once for all case studies; that load must still show in profile.json.
+    app_config = load_config(_write_config(tmp_path))
+    report = run_case_studies(app_config, ["buffett"], profile=True)["buffett"].profile
+
+    assert {"load/disclosures", "load/prices_csv", "load/returns", "backtest/window_stats"} <= set(report["spans"])
+    assert set(report["peak_rss_bytes"]) == {"load_data", "prepare", "backtest", "summary"}
+    assert report["wall_seconds"] >= report["spans"]["load/prices_csv"]["total_seconds"]
+    assert run_case_studies(app_config, ["buffett"])["buffett"].profile is None
+
+
+
+def test_merge_reports_adds_spans_and_counters() -> None:
+    first, second = Profiler(), Profiler()
+    for profiler, seconds in ((first, 0.5), (second, 0.25)):
+        profiler._record("work", seconds)
+        profiler.count("items", 2)
+    with second.stage("stage"):
+        pass
+
+    merged = merge_reports(first.report(), second.report())
+    assert merged["spans"]["work"] == {"calls": 2, "total_seconds": 0.75, "max_seconds": 0.5}
+    assert merged["counters"] == {"items": 4}
+    assert set(merged["peak_rss_bytes"]) == {"stage"}
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from portfolio_bl.models.mean_variance import estimate_mean_cov
+from portfolio_bl.models.rolling import RollingMeanCov
+
+
+
+def test_rolling_mean_cov_matches_full_estimate_with_missing_values() -> None:
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2024-01-01", periods=120)
+    values = rng.normal(0.001, 0.02, size=(len(dates), 5))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    values[:30, 4] = np.nan
+    returns = pd.DataFrame(values, index=dates, columns=list("ABCDE"))
+
+    estimator = RollingMeanCov(returns, reanchor_every=4)
+    for stop in range(25, len(dates), 3):
+        window = returns.iloc[stop - 20 : stop]
+        mu, cov = estimator(window)
+        expected_mu, expected_cov = estimate_mean_cov(window)
+
+        pd.testing.assert_series_equal(mu, expected_mu, rtol=1e-9, atol=1e-14)
+        pd.testing.assert_frame_equal(cov, expected_cov, rtol=1e-9, atol=1e-14)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from portfolio_bl.config import load_config
+from portfolio_bl.data.synthetic import write_synthetic_dataset
+from portfolio_bl.pipeline import run_case_study
+from portfolio_bl.store import load_case_study, save_case_study
+
+
+
+def test_result_store_round_trip(tmp_path: Path) -> None:
+    disclosures_path, prices_path = write_synthetic_dataset(tmp_path, n_tickers=20, n_days=300, holdings_per_filing=6)
+    config_path = tmp_path / "config.yaml"
+    config = {
+        "data": {"disclosures_path": str(disclosures_path), "prices_path": str(prices_path)},
+        "backtest": {
+            "lookback_periods": 60,
+            "rebalance_frequency": "ME",
+            "proportional_cost": 0.001,
+            "compact": True,
+        },
+        "case_studies": {"p0": {"person_label": "Person 0", "disclosure_aliases": ["person 0"]}},
+    }
+    with config_path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+    result = run_case_study(load_config(config_path), person_key="p0")
+    result.profile = {"spans": {"backtest": 0.5}}
+
+    path = save_case_study(result, tmp_path / "out" / "result.npz")
+    loaded = load_case_study(path)
+
+    assert loaded.person_label == result.person_label
+    assert loaded.as_of_date == result.as_of_date
+    assert loaded.universe == result.universe
+    assert loaded.profile == result.profile
+    pd.testing.assert_frame_equal(loaded.summary, result.summary)
+
+    assert list(loaded.strategy_results) == list(result.strategy_results)
+    for name, expected in result.strategy_results.items():
+        actual = loaded.strategy_results[name]
+        pd.testing.assert_series_equal(actual.returns, expected.returns)
+        pd.testing.assert_series_equal(actual.nav, expected.nav)
+        pd.testing.assert_frame_equal(actual.weight_history, expected.weight_history)
+        pd.testing.assert_series_equal(actual.turnover, expected.turnover)
+        pd.testing.assert_series_equal(actual.costs, expected.costs)
+        assert actual.weight_history.dtypes.eq(np.float32).all()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from portfolio_bl.config import load_config
+from portfolio_bl.data.disclosures import load_disclosures_csv
+from portfolio_bl.data.prices import load_prices_csv, to_return_matrix
+from portfolio_bl.data.synthetic import synthetic_prices, write_synthetic_dataset
+from portfolio_bl.pipeline import run_case_study
+
+
+
+def test_synthetic_prices_are_seeded() -> None:
+    first = synthetic_prices(n_tickers=5, n_days=30, seed=3)
+    second = synthetic_prices(n_tickers=5, n_days=30, seed=3)
+    other = synthetic_prices(n_tickers=5, n_days=30, seed=4)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert not first["close"].equals(other["close"])
+    assert len(first) == 150
+
+
+
+def test_synthetic_dataset_runs_through_pipeline(tmp_path: Path) -> None:
+    disclosures_path, prices_path = write_synthetic_dataset(
+        tmp_path, n_tickers=30, n_days=400, n_people=2, holdings_per_filing=8, seed=1
+    )
+
+    disclosures = load_disclosures_csv(disclosures_path)
+    returns = to_return_matrix(load_prices_csv(prices_path))
+    assert set(disclosures["person"]) == {"Person 0", "Person 1"}
+    assert returns.shape == (399, 30)
+
+    config_path = tmp_path / "config.yaml"
+    config = {
+        "data": {"disclosures_path": str(disclosures_path), "prices_path": str(prices_path)},
+        "backtest": {"lookback_periods": 6, "rebalance_frequency": "ME"},
+        "case_studies": {"p0": {"person_label": "Person 0", "disclosure_aliases": ["person 0"]}},
+    }
+    with config_path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+
+    result = run_case_study(load_config(config_path), person_key="p0")
+    assert len(result.universe) == 8
+    assert "black_litterman" in result.summary.index
+
+
+
+def test_compact_mode_matches_float64_pipeline(tmp_path: Path) -> None:
+    disclosures_path, prices_path = write_synthetic_dataset(tmp_path, n_tickers=40, n_days=500, holdings_per_filing=12)
+
+    summaries = {}
+    for compact in (False, True):
+        config_path = tmp_path / f"config_{compact}.yaml"
+        config = {
+            "data": {"disclosures_path": str(disclosures_path), "prices_path": str(prices_path)},
+            "backtest": {"lookback_periods": 60, "rebalance_frequency": "ME", "compact": compact},
+            "case_studies": {"p0": {"person_label": "Person 0", "disclosure_aliases": ["person 0"]}},
+        }
+        with config_path.open("w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f)
+        result = run_case_study(load_config(config_path), person_key="p0")
+        summaries[compact] = result.summary
+
+    assert result.strategy_results["black_litterman"].weight_history.dtypes.eq(np.float32).all()
+    pd.testing.assert_frame_equal(summaries[True], summaries[False], rtol=1e-4)
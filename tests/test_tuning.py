@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from portfolio_bl.backtest.metrics import concentration_hhi, infer_periods_per_year, summarize_strategy
+from portfolio_bl.config import BacktestConfig, load_config
+from portfolio_bl.data.prices import monthly_rebalance_dates
+from portfolio_bl.data.synthetic import write_synthetic_dataset
+from portfolio_bl.pipeline import run_case_study
+from portfolio_bl.tuning import _prune, config_grid, parse_search_space, walk_forward_search
+
+
+
+def _write_config(tmp_path: Path) -> Path:
+    disclosures = pd.DataFrame(
+        {
+            "person": ["Warren Buffett"] * 4,
+            "as_of_date": ["2025-03-31"] * 4,
+            "ticker": ["AAPL", "MSFT", "XOM", "NVDA"],
+            "value_usd": [100.0, 80.0, 20.0, 40.0],
+        }
+    )
+
+    rng = np.random.default_rng(5)
+    dates = pd.date_range("2020-01-31", periods=48, freq="ME")
+    tickers = ["AAPL", "MSFT", "XOM", "NVDA"]
+    closes = 100.0 * np.cumprod(1.0 + rng.normal(0.01, 0.05, size=(len(dates), len(tickers))), axis=0)
+    prices = pd.DataFrame(closes, index=dates, columns=tickers).stack().rename("close").reset_index()
+    prices.columns = ["date", "ticker", "close"]
+
+    disclosures.to_csv(tmp_path / "disclosures.csv", index=False)
+    prices.to_csv(tmp_path / "prices.csv", index=False)
+
+    config = {
+        "data": {
+            "disclosures_path": str(tmp_path / "disclosures.csv"),
+            "prices_path": str(tmp_path / "prices.csv"),
+        },
+        "backtest": {"lookback_periods": 6},
+        "case_studies": {
+            "buffett": {"person_label": "Warren Buffett", "disclosure_aliases": ["warren buffett"]},
+        },
+    }
+    config_path = tmp_path / "config.yaml"
+    with config_path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+    return config_path
+
+
+
+def test_fold_scores_match_slices_of_a_full_run(tmp_path: Path) -> None:
+    app_config = load_config(_write_config(tmp_path))
+    configs = config_grid(app_config.backtest, {"lookback_periods": [6, 12], "tau": [0.025, 0.05]})
+
+    tuned = walk_forward_search(app_config, "buffett", configs, n_folds=3)
+
+    assert len(tuned.results) == 3 * len(configs) * 3
+    assert list(tuned.best.index) == [0, 1, 2]
+
+    config_id = 3
+    full = run_case_study(replace(app_config, backtest=configs[config_id]), "buffett")
+    row = tuned.results.query("fold == 1 and config_id == @config_id and strategy == 'black_litterman'").iloc[0]
+    returns = full.strategy_results["black_litterman"].returns
+    fold_returns = returns[(returns.index > row["fold_start"]) & (returns.index <= row["fold_end"])]
+    expected = summarize_strategy(fold_returns, pd.DataFrame([[1.0]]), infer_periods_per_year(returns.index))
+    assert np.isclose(row["sharpe"], expected["sharpe"])
+    assert np.isclose(row["annual_return"], expected["annual_return"])
+
+
+
+def test_fold_weight_metrics_match_slices_of_a_full_daily_run(tmp_path: Path) -> None:
+    # Daily prices put fold ends mid-month, where a schedule built on the truncated index
+    # would add a rebalance that the full run never makes.
+    disclosures_path, prices_path = write_synthetic_dataset(tmp_path, n_tickers=12, n_days=320, holdings_per_filing=5)
+    config = {
+        "data": {"disclosures_path": str(disclosures_path), "prices_path": str(prices_path)},
+        "backtest": {"lookback_periods": 60},
+        "case_studies": {"p0": {"person_label": "Person 0", "disclosure_aliases": ["person 0"]}},
+    }
+    config_path = tmp_path / "config.yaml"
+    with config_path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+    app_config = load_config(config_path)
+    configs = config_grid(app_config.backtest, {"proportional_cost": [0.0, 0.001]})
+
+    tuned = walk_forward_search(app_config, "p0", configs, n_folds=3)
+    schedule = monthly_rebalance_dates(pd.DatetimeIndex(pd.read_csv(prices_path)["date"].unique()))
+    assert not tuned.results["fold_end"].isin(schedule).all()
+
+    for config_id, config in enumerate(configs):
+        full = run_case_study(replace(app_config, backtest=config), "p0")
+        for name, strategy in full.strategy_results.items():
+            rows = tuned.results.query("config_id == @config_id and strategy == @name")
+            for row in rows.itertuples():
+                inside = (strategy.weight_history.index > row.fold_start) & (strategy.weight_history.index <= row.fold_end)
+                trades = strategy.turnover
+                if trades is None:
+                    trades = strategy.weight_history.diff().abs().sum(axis=1).iloc[1:] / 2.0
+                trades = trades[(trades.index > row.fold_start) & (trades.index <= row.fold_end)]
+                assert np.isclose(row.hhi, concentration_hhi(strategy.weight_history[inside]))
+                assert np.isclose(row.avg_turnover, trades.mean())
+
+
+
+def test_pruning_and_workers(tmp_path: Path) -> None:
+    app_config = load_config(_write_config(tmp_path))
+    configs = config_grid(app_config.backtest, {"lookback_periods": [6, 12], "risk_aversion": [1.0, 2.5, 5.0]})
+
+    serial = walk_forward_search(app_config, "buffett", configs, n_folds=3, prune_margin=0.0)
+    parallel = walk_forward_search(app_config, "buffett", configs, n_folds=3, prune_margin=0.0, workers=2)
+
+    pd.testing.assert_frame_equal(serial.results, parallel.results)
+    per_fold = serial.results.groupby("fold")["config_id"].nunique()
+    assert per_fold.iloc[0] == len(configs)
+    assert per_fold.iloc[-1] < len(configs)
+
+
+
+def test_parse_search_space_reads_booleans_and_numbers() -> None:
+    space = parse_search_space(["track_drift=False,True", "compact=no", "tau=0.025,0.05", "lookback_periods=6"])
+    assert space == {"track_drift": [False, True], "compact": [False], "tau": [0.025, 0.05], "lookback_periods": [6]}
+
+    with pytest.raises(ValueError, match="boolean"):
+        parse_search_space(["compact=maybe"])
+
+
+
+def test_prune_ignores_unscored_configs() -> None:
+    alive = {0: BacktestConfig(), 1: BacktestConfig(tau=0.1), 2: BacktestConfig(tau=0.2)}
+    nan = float("nan")
+
+    # The first config has no valid fold yet; the leader is taken over the scored ones.
+    pruned = _prune(alive, {0: [nan], 1: [1.0, nan], 2: [0.2]}, margin=0.5)
+    assert list(pruned) == [1]
+    assert _prune(alive, {0: [nan], 1: [nan], 2: []}, margin=0.0) == alive